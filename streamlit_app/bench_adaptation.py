@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark platform adaptation modes
+Compares one-call-per-platform adaptation with the single JSON-mode call
+
+Usage:
+    python bench_adaptation.py [--profile data/brand_voice_X.json] [--rounds 3]
+                               [--platforms twitter,mastodon,reddit]
+
+Makes real OpenAI calls, so OPENAI_API_KEY must be set. Without --profile
+the most recent saved brand voice profile in data/ is used, or a small
+built-in one if there is none. Token counts come from the API's usage
+figures as recorded by llm_gateway.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(__file__))
+
+from modules import brand_voice_analyzer, llm_gateway
+from modules.log_capture import capture_output
+
+
+SAMPLE_BRAND_VOICE = {
+    'tone': 'Friendly, technical, and direct',
+    'personality_traits': ['curious', 'pragmatic', 'helpful'],
+    'vocabulary_level': 'Technical but accessible',
+    'main_topics': ['developer tools', 'open source', 'APIs'],
+    'writing_guidelines': ['Lead with the takeaway', 'Prefer concrete examples', 'No hype']
+}
+
+SAMPLE_MASTER_MESSAGE = (
+    "Most API outages we see aren't caused by bad code but by retry storms: "
+    "every client retries at the same moment and the service never recovers. "
+    "Adding jitter to exponential backoff spreads retries out and lets the "
+    "backend catch its breath. If your SDK retries for you, check whether it "
+    "adds jitter, and what it does when the server sends Retry-After. What's "
+    "the worst retry storm you've had to debug?"
+)
+
+
+def load_profile(path):
+    """Return (company, brand_voice) from a saved profile, or the built-in sample"""
+    if not path:
+        data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        saved = sorted(glob.glob(os.path.join(data_dir, 'brand_voice_*.json')), key=os.path.getmtime)
+        path = saved[-1] if saved else None
+
+    if not path:
+        return 'Example Co', SAMPLE_BRAND_VOICE
+
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    return profile.get('company', 'Example Co'), profile.get('brand_voice', profile)
+
+
+def run_mode(company, brand_voice, master_message, platforms, single_call, rounds):
+    """Adapt the message `rounds` times; returns (wall times, call stats, failures)"""
+    llm_gateway.reset_stats()
+    times = []
+    failures = 0
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        with capture_output():
+            result = brand_voice_analyzer.adapt_master_to_platforms(
+                company=company,
+                brand_voice=brand_voice,
+                master_message=master_message,
+                platforms=platforms,
+                single_call=single_call
+            )
+        times.append(time.perf_counter() - start)
+
+        if not result.get('success') or result.get('errors'):
+            failures += 1
+
+    return times, llm_gateway.call_stats(), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark platform adaptation modes")
+    parser.add_argument('--profile', help="Saved brand voice profile JSON")
+    parser.add_argument('--message', default=SAMPLE_MASTER_MESSAGE, help="Master message to adapt")
+    parser.add_argument('--platforms', default='twitter,mastodon,reddit', help="Comma-separated platforms")
+    parser.add_argument('--rounds', type=int, default=3, help="Adaptations per mode")
+    args = parser.parse_args()
+
+    if not os.environ.get('OPENAI_API_KEY'):
+        print("❌ OPENAI_API_KEY is not set")
+        sys.exit(1)
+
+    company, brand_voice = load_profile(args.profile)
+    platforms = [p.strip() for p in args.platforms.split(',') if p.strip()]
+
+    print(f"Company: {company}, platforms: {', '.join(platforms)}, {args.rounds} rounds per mode")
+    print()
+    print(f"{'mode':<14}{'calls':>6}{'prompt tok':>12}{'compl tok':>11}{'tok/round':>11}"
+          f"{'median s':>10}{'max s':>8}{'failed':>8}")
+
+    for label, single_call in (('per_platform', False), ('single_call', True)):
+        times, stats, failures = run_mode(
+            company, brand_voice, args.message, platforms, single_call, args.rounds
+        )
+        print(f"{label:<14}"
+              f"{stats['calls']:>6}"
+              f"{stats['prompt_tokens']:>12}"
+              f"{stats['completion_tokens']:>11}"
+              f"{stats['total_tokens'] / args.rounds:>11.0f}"
+              f"{statistics.median(times):>10.2f}"
+              f"{max(times):>8.2f}"
+              f"{failures:>8}")
+
+    print("\nper_platform sends the brand voice and master message once per platform;"
+          "\nsingle_call sends them once but waits for every platform's text in one completion.")
+
+
+if __name__ == '__main__':
+    main()
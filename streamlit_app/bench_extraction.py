@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark article extraction backends
+Compares extraction time and output length over a corpus of saved pages
+
+Usage:
+    python bench_extraction.py [corpus_dir] [--repeat N]
+
+The corpus is a directory of *.html files. If it is missing or empty, pages
+from the local content store (data/cache/content_store.sqlite) are used.
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(__file__))
+
+from modules import content_store
+from modules.html_extract import BACKENDS, PARSER
+
+
+def load_corpus(corpus_dir, limit):
+    """Return a list of (name, html bytes) pages"""
+    pages = []
+
+    if corpus_dir and os.path.isdir(corpus_dir):
+        for path in sorted(glob.glob(os.path.join(corpus_dir, '*.html')))[:limit]:
+            with open(path, 'rb') as f:
+                pages.append((os.path.basename(path), f.read()))
+
+    if not pages:
+        pages = list(content_store.iter_pages(limit=limit))
+
+    return pages
+
+
+def bench_backend(extract, pages, repeat):
+    """Time one backend over the corpus; returns per-page timings and output lengths"""
+    timings = []
+    lengths = []
+
+    for _, html in pages:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            text = extract(html)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best)
+        lengths.append(len(text or ''))
+
+    return timings, lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article extraction backends")
+    parser.add_argument('corpus_dir', nargs='?', default=os.path.join(os.path.dirname(__file__), 'data', 'html_corpus'))
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per page (best time is kept)")
+    parser.add_argument('--limit', type=int, default=200, help="Maximum pages to load")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus_dir, args.limit)
+    if not pages:
+        print("❌ No pages found. Save some *.html files to the corpus directory")
+        print("   or run a blog scrape first to populate the content store.")
+        sys.exit(1)
+
+    print(f"Corpus: {len(pages)} pages, {sum(len(h) for _, h in pages) / 1024:.0f} KiB")
+    print(f"Parser: {PARSER}")
+    print()
+
+    results = {}
+    for name, extract in BACKENDS.items():
+        results[name] = bench_backend(extract, pages, args.repeat)
+
+    print(f"{'backend':<12}{'total ms':>10}{'median ms':>11}{'p95 ms':>9}{'avg chars':>11}{'empty':>7}")
+    for name, (timings, lengths) in results.items():
+        ordered = sorted(timings)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"{name:<12}"
+              f"{sum(timings) * 1000:>10.1f}"
+              f"{statistics.median(timings) * 1000:>11.2f}"
+              f"{p95 * 1000:>9.2f}"
+              f"{statistics.mean(lengths):>11.0f}"
+              f"{sum(1 for n in lengths if n == 0):>7}")
+
+    if 'fast' in results and 'selectors' in results:
+        fast_total = sum(results['fast'][0])
+        slow_total = sum(results['selectors'][0])
+        if fast_total:
+            print(f"\nSpeedup (selectors / fast): {slow_total / fast_total:.2f}x")
+
+        # Pages where the two backends disagree noticeably on output length
+        print("\nLargest output length differences:")
+        diffs = []
+        for (page_name, _), fast_len, slow_len in zip(pages, results['fast'][1], results['selectors'][1]):
+            diffs.append((abs(fast_len - slow_len), page_name, fast_len, slow_len))
+        for _, page_name, fast_len, slow_len in sorted(diffs, reverse=True)[:5]:
+            print(f"  {page_name[:60]:<60} fast={fast_len} selectors={slow_len}")
+
+
+if __name__ == '__main__':
+    main()
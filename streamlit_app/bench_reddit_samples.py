@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark Reddit sample collection
+Compares the old list + any() duplicate scan with the keyed SampleStore
+
+Usage:
+    python bench_reddit_samples.py [--sizes 250,500,1000,2000,4000] [--overlap 0.3]
+
+Samples are synthetic, so no Reddit credentials are needed. Each run
+simulates the scrape_reddit merge: official user posts, then subreddit
+hot/new/top listings, then fallback search results, where `overlap` is
+the share of candidates that were already collected by an earlier step.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(__file__))
+
+from modules.sample_store import SampleStore
+
+
+def make_candidates(n, overlap, seed=0):
+    """Build n candidate samples split across the three collection steps"""
+    rng = random.Random(seed)
+    source_types = ['official_user', 'official_subreddit', 'fallback']
+    candidates = []
+    unique = 0
+
+    for i in range(n):
+        if candidates and rng.random() < overlap:
+            permalink = rng.choice(candidates)['url']
+        else:
+            permalink = f"https://reddit.com/r/bench/comments/{unique:x}/post_{unique}/"
+            unique += 1
+
+        candidates.append({
+            'text': f"Post {i}",
+            'source': 'reddit',
+            'date': f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}",
+            'url': permalink,
+            'metadata': {'source_type': source_types[i * 3 // n]}
+        })
+
+    return candidates
+
+
+def collect_with_list(candidates):
+    """Previous approach: scan the collected list for every candidate"""
+    samples = []
+    for sample in candidates:
+        if not any(s['url'] == sample['url'] for s in samples):
+            samples.append(sample)
+    return samples
+
+
+def collect_with_store(candidates):
+    """Keyed approach: dict lookup per candidate"""
+    store = SampleStore()
+    store.extend(candidates)
+    return store.samples()
+
+
+def best_time(fn, candidates, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(candidates)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Reddit sample dedup")
+    parser.add_argument('--sizes', default='250,500,1000,2000,4000', help="Comma-separated candidate counts")
+    parser.add_argument('--overlap', type=float, default=0.3, help="Share of duplicate candidates")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per size (best time is kept)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print(f"Overlap: {args.overlap:.0%}, best of {args.repeat}")
+    print()
+    print(f"{'candidates':>10}{'unique':>8}{'list ms':>10}{'store ms':>10}{'speedup':>9}{'list us/item':>14}{'store us/item':>15}")
+
+    for n in sizes:
+        candidates = make_candidates(n, args.overlap)
+        list_time, list_result = best_time(collect_with_list, candidates, args.repeat)
+        store_time, store_result = best_time(collect_with_store, candidates, args.repeat)
+
+        if [s['url'] for s in list_result] != [s['url'] for s in store_result]:
+            print(f"❌ Results differ for {n} candidates")
+            sys.exit(1)
+
+        print(f"{n:>10}"
+              f"{len(store_result):>8}"
+              f"{list_time * 1000:>10.2f}"
+              f"{store_time * 1000:>10.2f}"
+              f"{list_time / store_time if store_time else 0:>8.1f}x"
+              f"{list_time / n * 1e6:>14.2f}"
+              f"{store_time / n * 1e6:>15.2f}")
+
+    print("\nPer-item cost stays flat for the store and grows with n for the list scan.")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,9 @@ AI-Powered Blog Finder
 Uses OpenAI to intelligently find company blog URLs and RSS feeds
 """
 
-import requests
-from openai import OpenAI
+import json
+
+from modules import http_client, llm_gateway
 
 
 def find_blog_with_ai(company, openai_api_key):
@@ -23,8 +24,6 @@ def find_blog_with_ai(company, openai_api_key):
     print(f"AI Blog Finder: {company}")
     print(f"{'='*60}\n")
 
-    client = OpenAI(api_key=openai_api_key)
-
     prompt = f"""Given the company name "{company}", suggest the most likely blog URLs and RSS feed URLs.
 
 Consider:
@@ -56,20 +55,18 @@ Provide 5-10 of the MOST LIKELY URLs, not every possible variation.
     try:
         print("Asking AI to suggest blog URLs...")
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = llm_gateway.chat(
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that finds company blog URLs and RSS feeds. Return valid JSON only."},
                 {"role": "user", "content": prompt}
             ],
             response_format={"type": "json_object"},
-            temperature=0.3
+            temperature=0.3,
+            api_key=openai_api_key,
+            label='find_blog_with_ai'
         )
 
-        result = response.choices[0].message.content
-
-        import json
-        suggestions = json.loads(result)
+        suggestions = json.loads(response.text)
 
         print("\nAI Suggestions:")
         print(f"Reasoning: {suggestions.get('reasoning', 'N/A')}")
@@ -109,10 +106,7 @@ def test_url_exists(url):
         bool: True if URL is accessible
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; Paracket/1.0)'
-        }
-        response = requests.head(url, timeout=5, headers=headers, allow_redirects=True)
+        response = http_client.head(url, timeout=5, allow_redirects=True)
         return response.status_code < 400
     except:
         return False
@@ -5,9 +5,30 @@ Refactored from blog_scraper_api.py for Streamlit integration
 import feedparser
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import time
-import re
+from urllib.parse import urlparse
+import threading
+
+from modules import content_store, feed_cache, http_client
+from modules.html_extract import DEFAULT_BACKEND, extract_article_text
+from modules.fetch_pool import HostRateLimiter, fetch_ordered
+from modules.log_capture import propagate
+
+
+# Number of feed candidates probed in parallel during discovery
+DISCOVERY_WORKERS = 12
+
+# Probe outcomes that say the URL is not a feed, as opposed to the server
+# being unavailable right now; only these are remembered as failed candidates
+FEED_NOT_FOUND = 'not_found'
+FEED_INVALID = 'not_a_feed'
+DEFINITIVE_FEED_FAILURES = (FEED_NOT_FOUND, FEED_INVALID)
+
+# Article downloads: overall worker count, plus per-domain politeness
+# (at most 4 requests in flight and 4 request starts per second per domain)
+ARTICLE_WORKERS = 8
+_article_limiter = HostRateLimiter(min_interval=0.25, max_per_host=4)
 
 
 def find_blog_feeds(company, blog_url=None):
@@ -68,78 +89,228 @@ def find_blog_feeds(company, blog_url=None):
     return potential_feeds
 
 
-def validate_feed(feed_url):
+def _fetch_feed(feed_url, conditional=False):
+    """
+    Fetch and parse a feed URL; connection errors are raised to the caller
+
+    With conditional, the stored ETag/Last-Modified validators are sent and a
+    304 response reuses the stored copy of the feed instead of downloading it.
+
+    Returns:
+        (feed, failure) tuple: the parsed feed and None, or None and why it
+        failed: FEED_NOT_FOUND (404/410), FEED_INVALID (200 but not a feed)
+        or a transient reason such as "HTTP 503"
+    """
+    state = feed_cache.get_feed_state(feed_url) if conditional else None
+
+    headers = {}
+    if state and state['body']:
+        if state['etag']:
+            headers['If-None-Match'] = state['etag']
+        if state['last_modified']:
+            headers['If-Modified-Since'] = state['last_modified']
+
+    response = http_client.get(feed_url, headers=headers)
+
+    if response.status_code == 304 and headers:
+        feed = feedparser.parse(state['body'])
+        if feed.entries:
+            feed_cache.touch_feed_state(feed_url)
+            print(f"  ✓ Feed not modified: {feed_url} ({len(feed.entries)} cached entries)")
+            return feed, None
+        return None, "stored copy has no entries"
+
+    if response.status_code == 200:
+        feed = feedparser.parse(response.content)
+
+        if feed.entries and len(feed.entries) > 0:
+            feed_cache.save_feed_state(
+                feed_url,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                response.content
+            )
+            print(f"  ✓ Valid feed: {feed_url} ({len(feed.entries)} entries)")
+            return feed, None
+
+        return None, FEED_INVALID
+
+    if response.status_code in (404, 410):
+        return None, FEED_NOT_FOUND
+
+    return None, f"HTTP {response.status_code}"
+
+
+def validate_feed(feed_url, conditional=False):
     """Check if a feed URL is valid and return parsed feed"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; BlogScraper/1.0)'
-        }
+        return _fetch_feed(feed_url, conditional=conditional)[0]
+    except Exception as e:
+        return None
 
-        response = requests.get(feed_url, timeout=10, headers=headers)
 
-        if response.status_code == 200:
-            feed = feedparser.parse(response.content)
+def discover_feed(potential_feeds, max_workers=DISCOVERY_WORKERS, use_cache=True):
+    """
+    Probe candidate feed URLs concurrently and return the best valid feed
 
-            if feed.entries and len(feed.entries) > 0:
-                print(f"  ✓ Valid feed: {feed_url} ({len(feed.entries)} entries)")
-                return feed
-            else:
+    Candidates are listed in priority order. A valid feed is only accepted
+    once every higher-priority candidate has failed, and as soon as one
+    succeeds all lower-priority probes still queued are cancelled.
+
+    The first candidate of each host is probed before any other candidate of
+    that host; if it fails with a DNS or connection error the host is marked
+    dead and its remaining candidates are skipped without a request.
+
+    With use_cache, candidates that failed recently are skipped, and
+    candidates that definitely are not feeds (404/410, or a page that does
+    not parse as a feed) are recorded for the next run. Timeouts, connection
+    errors, 429s and 5xx responses are not recorded, so a temporary outage
+    doesn't hide a real feed.
+
+    Args:
+        potential_feeds: Candidate feed URLs, highest priority first
+        max_workers: Number of concurrent probes
+        use_cache: Apply and update the negative candidate cache
+
+    Returns:
+        (feed_url, feed) tuple, or (None, None) if no candidate is a valid feed
+    """
+    # Base URL and path combinations can repeat (e.g. blog_url + /rss and
+    # base_domain + /blog/rss); probe each URL once
+    potential_feeds = list(dict.fromkeys(potential_feeds))
+
+    if use_cache:
+        known_failures = feed_cache.get_failed_candidates(potential_feeds)
+        if known_failures:
+            print(f"  Skipping {len(known_failures)} candidates that failed recently")
+            potential_feeds = [url for url in potential_feeds if url not in known_failures]
+
+    if not potential_feeds:
+        return None, None
+
+    failed_urls = []
+
+    hosts = {}
+    for index, url in enumerate(potential_feeds):
+        host = urlparse(url).netloc.lower()
+        if host not in hosts:
+            hosts[host] = {'first': index, 'checked': threading.Event(), 'dead': False}
+
+    def probe(index):
+        url = potential_feeds[index]
+        state = hosts[urlparse(url).netloc.lower()]
+
+        if index != state['first']:
+            state['checked'].wait()
+            if state['dead']:
                 return None
-        else:
-            return None
 
-    except Exception as e:
-        return None
+        try:
+            feed, failure = _fetch_feed(url, conditional=use_cache)
+        except requests.exceptions.ConnectionError:
+            if index == state['first']:
+                state['dead'] = True
+                print(f"  ✗ Host unreachable, skipping: {urlparse(url).netloc}")
+            feed, failure = None, None
+        except Exception:
+            feed, failure = None, None
+        finally:
+            if index == state['first']:
+                state['checked'].set()
+
+        if failure in DEFINITIVE_FEED_FAILURES:
+            failed_urls.append(url)
+        return feed
+
+    # Submit each host's first candidate ahead of everything else so a dead
+    # host is detected before its other candidates start waiting on it
+    first_indexes = [state['first'] for state in hosts.values()]
+    first_set = set(first_indexes)
+    submit_order = first_indexes + [i for i in range(len(potential_feeds)) if i not in first_set]
+
+    probe = propagate(probe)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(probe, index): index for index in submit_order}
+    futures_by_index = {index: future for future, index in futures.items()}
+
+    outcomes = {}
+    best_index = len(potential_feeds)
+    next_index = 0
+
+    try:
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+
+            index = futures[future]
+            outcomes[index] = future.result()
+
+            if outcomes[index] and index < best_index:
+                best_index = index
+                # Nothing below this candidate can win any more
+                for lower in range(index + 1, len(potential_feeds)):
+                    futures_by_index[lower].cancel()
+
+            # Walk forward through finished candidates in priority order
+            while next_index < best_index and next_index in outcomes:
+                next_index += 1
+
+            if next_index >= best_index:
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
+    if use_cache:
+        feed_cache.mark_failed_candidates(list(failed_urls))
+
+    if best_index < len(potential_feeds):
+        return potential_feeds[best_index], outcomes[best_index]
+
+    return None, None
+
+
+def scrape_blog_article(url, use_cache=True, backend=None):
+    """
+    Scrape full text content from a blog article URL
+
+    With use_cache, a URL fetched recently is answered from the content store
+    without a download, and a downloaded page whose content hash is already
+    stored is not parsed again. Pages stored by a different extraction
+    backend are re-extracted from the stored HTML.
+    """
+    backend = backend or DEFAULT_BACKEND
 
-def scrape_blog_article(url):
-    """Scrape full text content from a blog article URL"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; BlogScraper/1.0)'
-        }
+        if use_cache:
+            stored = content_store.get_by_url(url)
+            if stored:
+                if stored['extractor'] == backend:
+                    return stored['text']
+
+                page = content_store.get_by_hash(stored['content_hash'])
+                content = extract_article_text(page['html'], backend)
+                content_store.update_text(stored['content_hash'], content, backend)
+                return content
 
-        response = requests.get(url, timeout=10, headers=headers)
+        response = http_client.get(url)
 
         if response.status_code != 200:
             return None
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Remove script, style, nav, footer elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-            element.decompose()
-
-        # Try common article content selectors
-        content_selectors = [
-            'article',
-            '.post-content',
-            '.entry-content',
-            '.article-content',
-            '.blog-post-content',
-            '.content',
-            'main',
-            '#content',
-            '.post-body'
-        ]
+        html = response.content
 
-        content = None
-        for selector in content_selectors:
-            element = soup.select_one(selector)
-            if element:
-                content = element.get_text(separator='\n', strip=True)
-                if len(content) > 200:
-                    break
+        if use_cache:
+            page_hash = content_store.content_hash(html)
+            stored = content_store.get_by_hash(page_hash)
+            if stored and stored['extractor'] == backend:
+                content_store.link_url(url, page_hash)
+                return stored['text']
 
-        # Fallback: get all paragraphs
-        if not content or len(content) < 200:
-            paragraphs = soup.find_all('p')
-            content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50])
+        content = extract_article_text(html, backend)
 
-        # Clean up excessive whitespace
-        if content:
-            content = re.sub(r'\n{3,}', '\n\n', content)
-            content = re.sub(r' {2,}', ' ', content)
+        if use_cache:
+            content_store.put(url, html, content, backend)
 
         return content
 
@@ -148,37 +319,101 @@ def scrape_blog_article(url):
         return None
 
 
-def scrape_blog_from_feed(feed, limit):
-    """Extract blog posts from a parsed RSS feed"""
+def _entry_key(entry):
+    """Stable identity of a feed entry: its guid, falling back to the link"""
+    return entry.get('id') or entry.get('link') or entry.get('title', '')
+
+
+def _load_feed_entry(entry):
+    """Download and parse one feed entry (runs in a fetch worker)"""
+    # Get basic info from feed
+    title = entry.get('title', 'Untitled')
+    link = entry.get('link', '')
+
+    # Get published date
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        date = datetime(*entry.published_parsed[:6]).isoformat()
+    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        date = datetime(*entry.updated_parsed[:6]).isoformat()
+    else:
+        date = datetime.now().isoformat()
+
+    # Get summary/description from feed
+    summary = entry.get('summary', entry.get('description', ''))
+
+    # Clean HTML from summary
+    if summary:
+        summary_soup = BeautifulSoup(summary, 'html.parser')
+        summary = summary_soup.get_text(strip=True)
+
+    # Try to get full article content, politely per domain
+    full_content = None
+    if link:
+        with _article_limiter.slot(link):
+            full_content = scrape_blog_article(link)
+
+    return {
+        'title': title,
+        'link': link,
+        'date': date,
+        'summary': summary,
+        'full_content': full_content
+    }
+
+
+def scrape_blog_from_feed(feed, limit, max_workers=ARTICLE_WORKERS, feed_url=None):
+    """
+    Extract blog posts from a parsed RSS feed
+
+    Articles are downloaded and parsed by a bounded worker pool, with a
+    per-domain limiter in place of a global sleep. Samples keep feed order.
+
+    When feed_url is given, entries already ingested from that feed (matched
+    by guid/link) are reused from the feed cache and only new entries are
+    downloaded. Entries whose full article could not be fetched are retried
+    on the next run.
+    """
     samples = []
 
-    for entry in feed.entries[:limit]:
-        try:
-            # Get basic info from feed
-            title = entry.get('title', 'Untitled')
-            link = entry.get('link', '')
-
-            # Get published date
-            published = entry.get('published', entry.get('updated', ''))
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                date = datetime(*entry.published_parsed[:6]).isoformat()
-            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                date = datetime(*entry.updated_parsed[:6]).isoformat()
-            else:
-                date = datetime.now().isoformat()
+    entries = feed.entries[:limit]
+
+    stored = {}
+    if feed_url:
+        stored = feed_cache.get_entries(feed_url, [_entry_key(entry) for entry in entries])
 
-            # Get summary/description from feed
-            summary = entry.get('summary', entry.get('description', ''))
+    def load(entry):
+        key = _entry_key(entry)
+        if key in stored:
+            return stored[key]
+        return _load_feed_entry(entry)
 
-            # Clean HTML from summary
-            if summary:
-                summary_soup = BeautifulSoup(summary, 'html.parser')
-                summary = summary_soup.get_text(strip=True)
+    new_entries = []
+    reused = 0
+    fetched = 0
+
+    loaded_entries = fetch_ordered(load, entries, max_workers=max_workers)
+
+    for entry, loaded in loaded_entries:
+        if isinstance(loaded, Exception):
+            print(f"    Error processing entry: {loaded}")
+            continue
+
+        try:
+            title = loaded['title']
+            link = loaded['link']
+            summary = loaded['summary']
+            full_content = loaded['full_content']
 
             print(f"  [{len(samples) + 1}] {title[:60]}...")
 
-            # Try to get full article content
-            full_content = scrape_blog_article(link)
+            key = _entry_key(entry)
+            if key in stored:
+                reused += 1
+                print(f"      ✓ Already ingested")
+            else:
+                fetched += 1
+                if full_content:
+                    new_entries.append((key, loaded))
 
             if full_content and len(full_content) > 300:
                 text = f"Title: {title}\n\nContent: {full_content}"
@@ -195,7 +430,7 @@ def scrape_blog_from_feed(feed, limit):
                 sample = {
                     'text': text,
                     'source': 'blog',
-                    'date': date,
+                    'date': loaded['date'],
                     'url': link,
                     'metadata': {
                         'platform_type': 'blog',
@@ -212,16 +447,21 @@ def scrape_blog_from_feed(feed, limit):
             if len(samples) >= limit:
                 break
 
-            time.sleep(0.5)
-
         except Exception as e:
             print(f"    Error processing entry: {e}")
             continue
 
+    loaded_entries.close()
+
+    if feed_url:
+        feed_cache.save_entries(feed_url, new_entries)
+        feed_cache.prune_entries(feed_url, [_entry_key(entry) for entry in feed.entries])
+        print(f"\n  Reused {reused} stored entries, fetched {fetched} new")
+
     return samples
 
 
-def scrape_blog(company, limit=150, blog_url=None):
+def scrape_blog(company, limit=150, blog_url=None, use_cache=True):
     """
     Main function to scrape blog posts from a company blog
 
@@ -229,6 +469,8 @@ def scrape_blog(company, limit=150, blog_url=None):
         company: Company name
         limit: Number of samples to collect
         blog_url: Optional blog URL (will attempt to find RSS feed from this URL)
+        use_cache: Reuse the feed found on a previous run (revalidated with a
+            conditional request) and skip candidates known to fail
 
     Returns:
         Dict with source, company, samples, etc.
@@ -242,23 +484,39 @@ def scrape_blog(company, limit=150, blog_url=None):
 
         samples = []
         feed_url = None
+        feed = None
+        feed_from_cache = False
+
+        # Reuse the feed resolved on a previous run if it still validates
+        if use_cache:
+            cached_feed_url = feed_cache.get_resolved_feed(company, blog_url)
+            if cached_feed_url:
+                print(f"Revalidating cached feed: {cached_feed_url}")
+                feed = validate_feed(cached_feed_url, conditional=True)
+                if feed:
+                    feed_url = cached_feed_url
+                    feed_from_cache = True
+                else:
+                    print("  Cached feed no longer valid, rediscovering...")
+                    feed_cache.forget_resolved_feed(company, blog_url)
 
         # Try to find RSS feed
-        if blog_url:
-            print(f"Searching for RSS feed from provided blog URL: {blog_url}")
-        else:
-            print("No blog URL provided, trying to guess from company name...")
+        if not feed:
+            if blog_url:
+                print(f"Searching for RSS feed from provided blog URL: {blog_url}")
+            else:
+                print("No blog URL provided, trying to guess from company name...")
 
-        potential_feeds = find_blog_feeds(company, blog_url)
+            potential_feeds = find_blog_feeds(company, blog_url)
 
-        for url in potential_feeds:
-            feed = validate_feed(url)
+            feed_url, feed = discover_feed(potential_feeds, use_cache=use_cache)
 
-            if feed:
-                feed_url = url
-                print(f"\n✓ Found feed: {feed_url}\n")
-                samples = scrape_blog_from_feed(feed, limit)
-                break
+            if feed and use_cache:
+                feed_cache.set_resolved_feed(company, blog_url, feed_url)
+
+        if feed:
+            print(f"\n✓ Found feed: {feed_url}\n")
+            samples = scrape_blog_from_feed(feed, limit, feed_url=feed_url if use_cache else None)
 
         # If no feed found
         if not feed_url:
@@ -289,6 +547,7 @@ def scrape_blog(company, limit=150, blog_url=None):
             'total_samples': len(final_samples),
             'samples': final_samples,
             'feed_url': feed_url,
+            'feed_from_cache': feed_from_cache,
             'blog_url': blog_url,
             'target': limit,
             'success': len(final_samples) > 0
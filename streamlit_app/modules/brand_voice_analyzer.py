@@ -2,11 +2,28 @@
 Brand Voice Analyzer Module
 Refactored from brand_voice_ml_openai.py for Streamlit integration
 """
-from openai import OpenAI
 import os
 import json
 from datetime import datetime
 
+from modules import llm_gateway
+from modules.fetch_pool import fetch_ordered
+
+
+def _clean_content(content, max_length):
+    """Strip wrapping quotes from generated text and trim it to max_length"""
+    content = content.strip()
+
+    # Remove quotes if GPT wrapped the content
+    if content.startswith('"') and content.endswith('"'):
+        content = content[1:-1]
+
+    # Trim if too long
+    if len(content) > max_length:
+        content = content[:max_length-3] + "..."
+
+    return content
+
 
 def analyze_brand_voice(training_data, openai_api_key=None):
     """
@@ -21,14 +38,7 @@ def analyze_brand_voice(training_data, openai_api_key=None):
         Dict with brand voice characteristics
     """
 
-    if not openai_api_key:
-        openai_api_key = os.environ.get('OPENAI_API_KEY')
-
-    if not openai_api_key:
-        raise ValueError("Missing OPENAI_API_KEY")
-
-    # Create OpenAI client
-    client = OpenAI(api_key=openai_api_key)
+    openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
 
     # Prepare sample texts for analysis
     sample_texts = []
@@ -112,9 +122,8 @@ Provide your analysis in valid JSON format with these keys:
 Return ONLY valid JSON, no additional text.
 """
 
-    # Call OpenAI API using client
-    response = client.chat.completions.create(
-        model="gpt-4o",
+    # Call OpenAI API
+    response = llm_gateway.chat(
         messages=[
             {
                 "role": "system",
@@ -126,36 +135,12 @@ Return ONLY valid JSON, no additional text.
             }
         ],
         temperature=0.7,
-        max_tokens=4096
+        max_tokens=4096,
+        api_key=openai_api_key,
+        label='analyze_brand_voice'
     )
 
-    # Parse response
-    response_text = response.choices[0].message.content
-
-    # Extract JSON from response
-    try:
-        # Remove markdown code blocks if present
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0]
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0]
-
-        # Try to find JSON in the response
-        response_text = response_text.strip()
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-
-        if start_idx != -1 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            brand_voice = json.loads(json_str)
-        else:
-            raise ValueError("No JSON found in response")
-    except Exception as e:
-        print(f"Warning: Could not parse JSON: {e}")
-        brand_voice = {
-            "raw_analysis": response_text,
-            "error": f"Could not parse structured JSON: {str(e)}"
-        }
+    brand_voice = llm_gateway.parse_json_response(response.text)
 
     return brand_voice
 
@@ -251,47 +236,26 @@ def analyze_brand_voice_endpoint(company, training_data, openai_api_key=None):
         }
 
 
-def generate_post_ideas(company, brand_voice, trending_topics, num_ideas=3, openai_api_key=None):
+def _post_ideas_request(company, brand_voice, trending_topics, num_ideas):
     """
-    Generate complete post draft ideas from trending topics
-
-    Args:
-        company: Company name
-        brand_voice: Brand voice profile dict
-        trending_topics: List of trending topic dicts
-        num_ideas: Number of post ideas to generate (default 3)
-        openai_api_key: OpenAI API key
+    Build the generate_post_ideas chat request
 
     Returns:
-        Dict with post ideas
+        (chat kwargs dict, topics summary list)
     """
-    try:
-        print(f"\n{'='*50}")
-        print(f"POST IDEA GENERATOR: {company}")
-        print(f"{'='*50}\n")
-
-        if not openai_api_key:
-            openai_api_key = os.environ.get('OPENAI_API_KEY')
-
-        if not openai_api_key:
-            raise ValueError("Missing OPENAI_API_KEY")
-
-        # Create OpenAI client
-        client = OpenAI(api_key=openai_api_key)
-
-        # Prepare trending topics summary
-        topics_summary = []
-        for i, topic in enumerate(trending_topics[:20], 1):  # Limit to 20 topics
-            topics_summary.append({
-                'id': i,
-                'title': topic.get('text', '')[:300],
-                'type': topic.get('metadata', {}).get('topic_type', 'discussion'),
-                'engagement': topic.get('metadata', {}).get('engagement', 0),
-                'subreddit': topic.get('metadata', {}).get('subreddit', 'unknown')
-            })
-
-        # Create generation prompt
-        generation_prompt = f"""You are a content strategist for {company}. Analyze these {len(topics_summary)} trending topics and generate {num_ideas} complete, ready-to-use social media post drafts.
+    # Prepare trending topics summary
+    topics_summary = []
+    for i, topic in enumerate(trending_topics[:20], 1):  # Limit to 20 topics
+        topics_summary.append({
+            'id': i,
+            'title': topic.get('text', '')[:300],
+            'type': topic.get('metadata', {}).get('topic_type', 'discussion'),
+            'engagement': topic.get('metadata', {}).get('engagement', 0),
+            'subreddit': topic.get('metadata', {}).get('subreddit', 'unknown')
+        })
+
+    # Create generation prompt
+    generation_prompt = f"""You are a content strategist for {company}. Analyze these {len(topics_summary)} trending topics and generate {num_ideas} complete, ready-to-use social media post drafts.
 
 COMPANY CONTEXT:
 Brand Voice: {json.dumps(brand_voice, indent=2)[:1500]}...
@@ -351,62 +315,74 @@ Return ONLY valid JSON in this format:
 Return ONLY valid JSON, no additional text.
 """
 
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a content strategist for {company}. Write in their exact brand voice. NEVER announce fake products or features. Only provide commentary, insights, and thought leadership on existing topics and trends. Return only valid JSON with no additional text or markdown formatting."
-                },
-                {
-                    "role": "user",
-                    "content": generation_prompt
-                }
-            ],
-            temperature=0.75,
-            max_tokens=3000
-        )
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a content strategist for {company}. Write in their exact brand voice. NEVER announce fake products or features. Only provide commentary, insights, and thought leadership on existing topics and trends. Return only valid JSON with no additional text or markdown formatting."
+        },
+        {
+            "role": "user",
+            "content": generation_prompt
+        }
+    ]
 
-        # Parse response
-        response_text = response.choices[0].message.content
-
-        # Extract JSON from response
-        try:
-            # Remove markdown code blocks if present
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0]
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0]
-
-            # Try to find JSON in the response
-            response_text = response_text.strip()
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response_text[start_idx:end_idx]
-                post_ideas = json.loads(json_str)
-            else:
-                raise ValueError("No JSON found in response")
-        except Exception as e:
-            print(f"Warning: Could not parse JSON: {e}")
-            post_ideas = {
-                "raw_analysis": response_text,
-                "error": f"Could not parse structured JSON: {str(e)}"
-            }
+    request = {
+        'messages': messages,
+        'temperature': 0.75,
+        'max_tokens': 3000,
+        'label': 'generate_post_ideas'
+    }
+    return request, topics_summary
 
-        print(f"\n✓ Generated {len(post_ideas.get('post_ideas', []))} post ideas")
 
-        result = {
-            'company': company,
-            'post_ideas': post_ideas,
-            'total_topics_analyzed': len(topics_summary),
-            'generated_at': datetime.now().isoformat(),
-            'success': True
-        }
+def _post_ideas_result(company, response_text, topics_summary, cached):
+    """Parse a post ideas response into the generate_post_ideas result dict"""
+    post_ideas = llm_gateway.parse_json_response(response_text)
 
-        return result
+    print(f"\n✓ Generated {len(post_ideas.get('post_ideas', []))} post ideas")
+
+    return {
+        'company': company,
+        'post_ideas': post_ideas,
+        'total_topics_analyzed': len(topics_summary),
+        'cached': cached,
+        'generated_at': datetime.now().isoformat(),
+        'success': True
+    }
+
+
+def generate_post_ideas(company, brand_voice, trending_topics, num_ideas=3, openai_api_key=None, allow_cached=False):
+    """
+    Generate complete post draft ideas from trending topics
+
+    Args:
+        company: Company name
+        brand_voice: Brand voice profile dict
+        trending_topics: List of trending topic dicts
+        num_ideas: Number of post ideas to generate (default 3)
+        openai_api_key: OpenAI API key
+        allow_cached: Reuse a cached response to an identical request
+
+    Returns:
+        Dict with post ideas
+    """
+    try:
+        print(f"\n{'='*50}")
+        print(f"POST IDEA GENERATOR: {company}")
+        print(f"{'='*50}\n")
+
+        openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
+
+        request, topics_summary = _post_ideas_request(company, brand_voice, trending_topics, num_ideas)
+
+        # Call OpenAI API
+        response = llm_gateway.chat(
+            **request,
+            api_key=openai_api_key,
+            allow_cached=allow_cached
+        )
+
+        return _post_ideas_result(company, response.text, topics_summary, response.cached)
 
     except Exception as e:
         print(f"✗ Error: {e}")
@@ -418,7 +394,52 @@ Return ONLY valid JSON, no additional text.
         }
 
 
-def recommend_topic_combinations(company, brand_voice, trending_topics, num_combinations=5, openai_api_key=None):
+def generate_post_ideas_stream(company, brand_voice, trending_topics, num_ideas=3, openai_api_key=None, allow_cached=False):
+    """
+    Streaming variant of generate_post_ideas
+
+    Same request as generate_post_ideas, but the JSON arrives chunk by chunk
+    as the model writes it.
+
+    Args:
+        company: Company name
+        brand_voice: Brand voice profile dict
+        trending_topics: List of trending topic dicts
+        num_ideas: Number of post ideas to generate (default 3)
+        openai_api_key: OpenAI API key
+        allow_cached: Reuse a cached response to an identical request
+
+    Returns:
+        llm_gateway.LLMStream yielding the raw JSON text; once consumed its
+        .result is the generate_post_ideas result dict, plus 'ttft' and
+        'latency' in seconds
+    """
+    print(f"\n{'='*50}")
+    print(f"POST IDEA GENERATOR: {company}")
+    print(f"{'='*50}\n")
+
+    openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
+
+    request, topics_summary = _post_ideas_request(company, brand_voice, trending_topics, num_ideas)
+
+    def finish(text):
+        result = _post_ideas_result(company, text, topics_summary, stream.cached)
+        result['ttft'] = stream.ttft
+        result['latency'] = stream.latency
+        if stream.ttft is not None:
+            print(f"  First token after {stream.ttft:.1f}s, complete after {stream.latency:.1f}s")
+        return result
+
+    stream = llm_gateway.chat_stream(
+        **request,
+        api_key=openai_api_key,
+        allow_cached=allow_cached,
+        on_complete=finish
+    )
+    return stream
+
+
+def recommend_topic_combinations(company, brand_voice, trending_topics, num_combinations=5, openai_api_key=None, allow_cached=False):
     """
     Analyze trending topics and recommend combinations that work well together
 
@@ -428,6 +449,7 @@ def recommend_topic_combinations(company, brand_voice, trending_topics, num_comb
         trending_topics: List of trending topic dicts
         num_combinations: Number of combinations to recommend (default 5)
         openai_api_key: OpenAI API key
+        allow_cached: Reuse a cached response to an identical request
 
     Returns:
         Dict with recommended combinations
@@ -437,14 +459,7 @@ def recommend_topic_combinations(company, brand_voice, trending_topics, num_comb
         print(f"TOPIC COMBINATION ANALYZER: {company}")
         print(f"{'='*50}\n")
 
-        if not openai_api_key:
-            openai_api_key = os.environ.get('OPENAI_API_KEY')
-
-        if not openai_api_key:
-            raise ValueError("Missing OPENAI_API_KEY")
-
-        # Create OpenAI client
-        client = OpenAI(api_key=openai_api_key)
+        openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
 
         # Prepare trending topics summary
         topics_summary = []
@@ -498,8 +513,7 @@ Return ONLY valid JSON, no additional text.
 """
 
         # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = llm_gateway.chat(
             messages=[
                 {
                     "role": "system",
@@ -511,36 +525,13 @@ Return ONLY valid JSON, no additional text.
                 }
             ],
             temperature=0.8,
-            max_tokens=2048
+            max_tokens=2048,
+            api_key=openai_api_key,
+            label='recommend_topic_combinations',
+            allow_cached=allow_cached
         )
 
-        # Parse response
-        response_text = response.choices[0].message.content
-
-        # Extract JSON from response
-        try:
-            # Remove markdown code blocks if present
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0]
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0]
-
-            # Try to find JSON in the response
-            response_text = response_text.strip()
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response_text[start_idx:end_idx]
-                recommendations = json.loads(json_str)
-            else:
-                raise ValueError("No JSON found in response")
-        except Exception as e:
-            print(f"Warning: Could not parse JSON: {e}")
-            recommendations = {
-                "raw_analysis": response_text,
-                "error": f"Could not parse structured JSON: {str(e)}"
-            }
+        recommendations = llm_gateway.parse_json_response(response.text)
 
         print(f"\n✓ Generated {len(recommendations.get('combinations', []))} topic combinations")
 
@@ -548,6 +539,7 @@ Return ONLY valid JSON, no additional text.
             'company': company,
             'recommendations': recommendations,
             'total_topics_analyzed': len(topics_summary),
+            'cached': response.cached,
             'analyzed_at': datetime.now().isoformat(),
             'success': True
         }
@@ -564,64 +556,25 @@ Return ONLY valid JSON, no additional text.
         }
 
 
-def adapt_master_to_platforms(company, brand_voice, master_message, platforms=['twitter', 'reddit', 'mastodon'], openai_api_key=None):
-    """
-    Adapt a master message to different social media platforms
-
-    Args:
-        company: Company name
-        brand_voice: Brand voice profile dict
-        master_message: The master message to adapt
-        platforms: List of platforms to adapt for
-        openai_api_key: OpenAI API key
-
-    Returns:
-        Dict with platform-specific adaptations
-    """
-    try:
-        print(f"\n{'='*50}")
-        print(f"PLATFORM ADAPTER: {company}")
-        print(f"{'='*50}\n")
-
-        if not openai_api_key:
-            openai_api_key = os.environ.get('OPENAI_API_KEY')
-
-        if not openai_api_key:
-            raise ValueError("Missing OPENAI_API_KEY")
-
-        # Create OpenAI client
-        client = OpenAI(api_key=openai_api_key)
-
-        platform_specs = {
-            'twitter': {
-                'max_length': 280,
-                'style': 'Concise, punchy, engaging. Use line breaks for readability. May include 1-2 relevant hashtags.',
-                'format': 'Short-form microblog'
-            },
-            'mastodon': {
-                'max_length': 500,
-                'style': 'Conversational, community-focused. Include 3-5 relevant hashtags. More detailed than Twitter.',
-                'format': 'Medium-form social post'
-            },
-            'reddit': {
-                'max_length': 2000,
-                'style': 'Detailed, conversational, authentic. The FIRST LINE is the post title (no markdown, no "Title:" prefix). The rest is the body (2-4 paragraphs). No hashtags.',
-                'format': 'Long-form discussion post with title on first line'
-            }
-        }
-
-        adaptations = {}
-
-        for platform in platforms:
-            if platform not in platform_specs:
-                print(f"  Skipping unknown platform: {platform}")
-                continue
-
-            spec = platform_specs[platform]
-            print(f"  Adapting for {platform}...")
+PLATFORM_SPECS = {
+    'twitter': {
+        'max_length': 280,
+        'style': 'Concise, punchy, engaging. Use line breaks for readability. May include 1-2 relevant hashtags.',
+        'format': 'Short-form microblog'
+    },
+    'mastodon': {
+        'max_length': 500,
+        'style': 'Conversational, community-focused. Include 3-5 relevant hashtags. More detailed than Twitter.',
+        'format': 'Medium-form social post'
+    },
+    'reddit': {
+        'max_length': 2000,
+        'style': 'Detailed, conversational, authentic. The FIRST LINE is the post title (no markdown, no "Title:" prefix). The rest is the body (2-4 paragraphs). No hashtags.',
+        'format': 'Long-form discussion post with title on first line'
+    }
+}
 
-            # Build platform-specific instructions
-            reddit_instructions = """For Reddit:
+REDDIT_INSTRUCTIONS = """For Reddit:
 FIRST LINE = Title only (plain text, no markdown, no 'Title:' prefix)
 REMAINING LINES = Body paragraphs
 
@@ -632,9 +585,20 @@ First paragraph of your post...
 
 Second paragraph continues..."""
 
-            platform_specific = reddit_instructions if platform == 'reddit' else ""
 
-            adaptation_prompt = f"""You are adapting content for {company} to be posted on {platform}.
+def _adapt_platform(company, brand_voice, master_message, platform, openai_api_key, allow_cached=False):
+    """
+    Adapt the master message for one platform (one LLM call)
+
+    Returns:
+        Dict with content, length, max_length and latency
+    """
+    spec = PLATFORM_SPECS[platform]
+
+    # Build platform-specific instructions
+    platform_specific = REDDIT_INSTRUCTIONS if platform == 'reddit' else ""
+
+    adaptation_prompt = f"""You are adapting content for {company} to be posted on {platform}.
 
 BRAND VOICE PROFILE:
 {json.dumps(brand_voice, indent=2)[:1000]}...
@@ -660,46 +624,214 @@ Adapt the master message for {platform} while:
 Return ONLY the adapted content, no explanations or meta-commentary.
 """
 
-            # Call OpenAI API
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are a social media expert for {company}. Adapt content to different platforms while maintaining brand voice. Return only the adapted content."
-                    },
-                    {
-                        "role": "user",
-                        "content": adaptation_prompt
-                    }
-                ],
-                temperature=0.75,
-                max_tokens=1500
-            )
+    # Call OpenAI API
+    response = llm_gateway.chat(
+        messages=[
+            {
+                "role": "system",
+                "content": f"You are a social media expert for {company}. Adapt content to different platforms while maintaining brand voice. Return only the adapted content."
+            },
+            {
+                "role": "user",
+                "content": adaptation_prompt
+            }
+        ],
+        temperature=0.75,
+        max_tokens=1500,
+        api_key=openai_api_key,
+        label='adapt_master_to_platforms',
+        allow_cached=allow_cached,
+        cache_scope=platform
+    )
 
-            adapted_content = response.choices[0].message.content.strip()
+    adapted_content = _clean_content(response.text, spec['max_length'])
 
-            # Remove quotes if GPT wrapped the content
-            if adapted_content.startswith('"') and adapted_content.endswith('"'):
-                adapted_content = adapted_content[1:-1]
+    return {
+        'content': adapted_content,
+        'length': len(adapted_content),
+        'max_length': spec['max_length'],
+        'latency': round(response.latency, 2),
+        'cached': response.cached
+    }
 
-            # Trim if too long
-            if len(adapted_content) > spec['max_length']:
-                adapted_content = adapted_content[:spec['max_length']-3] + "..."
 
-            adaptations[platform] = {
-                'content': adapted_content,
-                'length': len(adapted_content),
-                'max_length': spec['max_length']
+def _adapt_platforms_single_call(company, brand_voice, master_message, platforms, openai_api_key, allow_cached=False):
+    """
+    Adapt the master message for several platforms in one JSON-mode LLM call
+
+    The brand voice and master message are sent once instead of once per
+    platform, and the model returns every adaptation in one JSON object.
+
+    Returns:
+        (adaptations, errors) dicts keyed by platform
+    """
+    platform_blocks = []
+    for platform in platforms:
+        spec = PLATFORM_SPECS[platform]
+        block = f"""{platform}:
+STYLE: {spec['style']}
+FORMAT: {spec['format']}
+MAX LENGTH: {spec['max_length']} characters"""
+        if platform == 'reddit':
+            block += "\n" + REDDIT_INSTRUCTIONS
+        platform_blocks.append(block)
+
+    output_format = ',\n'.join(f'  "{platform}": {{"content": "..."}}' for platform in platforms)
+    platform_sections = '\n\n'.join(platform_blocks)
+
+    adaptation_prompt = f"""You are adapting content for {company} to be posted on {', '.join(platforms)}.
+
+BRAND VOICE PROFILE:
+{json.dumps(brand_voice, indent=2)[:1000]}...
+
+MASTER MESSAGE:
+{master_message}
+
+PLATFORMS:
+{platform_sections}
+
+TASK:
+Adapt the master message for each platform above while:
+1. Maintaining {company}'s exact brand voice
+2. Following each platform's culture and best practices
+3. Staying within each platform's max length
+4. Keeping the core message and value intact
+5. Making each version native to its platform (not just shortened/lengthened)
+
+Return ONLY valid JSON in this format, with the adapted content and no explanations or meta-commentary:
+{{
+{output_format}
+}}
+"""
+
+    response = llm_gateway.chat(
+        messages=[
+            {
+                "role": "system",
+                "content": f"You are a social media expert for {company}. Adapt content to different platforms while maintaining brand voice. Return valid JSON only."
+            },
+            {
+                "role": "user",
+                "content": adaptation_prompt
             }
+        ],
+        response_format={"type": "json_object"},
+        temperature=0.75,
+        max_tokens=1500 * len(platforms),
+        api_key=openai_api_key,
+        label='adapt_master_to_platforms_single_call',
+        allow_cached=allow_cached,
+        cache_scope=','.join(platforms)
+    )
+
+    parsed = llm_gateway.parse_json_response(response.text)
+
+    adaptations = {}
+    errors = {}
+
+    for platform in platforms:
+        entry = parsed.get(platform)
+        content = entry.get('content') if isinstance(entry, dict) else entry
+
+        if not isinstance(content, str) or not content.strip():
+            errors[platform] = parsed.get('error') or "Missing from model response"
+            continue
+
+        spec = PLATFORM_SPECS[platform]
+        adapted_content = _clean_content(content, spec['max_length'])
+        adaptations[platform] = {
+            'content': adapted_content,
+            'length': len(adapted_content),
+            'max_length': spec['max_length'],
+            'latency': round(response.latency, 2),
+            'cached': response.cached
+        }
 
-            print(f"    ✓ {len(adapted_content)}/{spec['max_length']} characters")
+    return adaptations, errors
+
+
+def adapt_master_to_platforms(company, brand_voice, master_message, platforms=['twitter', 'reddit', 'mastodon'], openai_api_key=None, single_call=False, allow_cached=False):
+    """
+    Adapt a master message to different social media platforms
+
+    By default each platform is adapted by its own LLM call and the calls
+    run concurrently, so the total time is that of the slowest platform.
+    With single_call=True all platforms come back from one JSON-mode call,
+    which sends the brand voice and master message only once.
+
+    Args:
+        company: Company name
+        brand_voice: Brand voice profile dict
+        master_message: The master message to adapt
+        platforms: List of platforms to adapt for
+        openai_api_key: OpenAI API key
+        single_call: Adapt all platforms in one request instead of one each
+        allow_cached: Reuse a cached response to an identical request
+
+    Returns:
+        Dict with platform-specific adaptations, plus 'errors' for platforms
+        that failed while others succeeded
+    """
+    try:
+        print(f"\n{'='*50}")
+        print(f"PLATFORM ADAPTER: {company}")
+        print(f"{'='*50}\n")
+
+        openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
+
+        # Skip unknown platforms up front, keeping the requested order
+        targets = []
+        for platform in platforms:
+            if platform not in PLATFORM_SPECS:
+                print(f"  Skipping unknown platform: {platform}")
+                continue
+            targets.append(platform)
+
+        adaptations = {}
+        errors = {}
+
+        if single_call and targets:
+            print(f"  Adapting for {', '.join(targets)} in a single request...")
+            adaptations, errors = _adapt_platforms_single_call(
+                company, brand_voice, master_message, targets, openai_api_key, allow_cached
+            )
+
+            for platform in targets:
+                if platform in errors:
+                    print(f"    ✗ {platform}: {errors[platform]}")
+                else:
+                    adapted = adaptations[platform]
+                    print(f"    ✓ {platform}: {adapted['length']}/{adapted['max_length']} characters")
+        else:
+            print(f"  Adapting for {', '.join(targets)}...")
+
+            def adapt(platform):
+                return _adapt_platform(company, brand_voice, master_message, platform, openai_api_key, allow_cached)
+
+            # One request per platform, all in flight at once; results come back
+            # in the requested order so the dict and log read the same as before
+            for platform, adapted in fetch_ordered(adapt, targets, max_workers=max(len(targets), 1)):
+                spec = PLATFORM_SPECS[platform]
+
+                if isinstance(adapted, Exception):
+                    errors[platform] = str(adapted)
+                    print(f"    ✗ {platform}: {adapted}")
+                    continue
+
+                adaptations[platform] = adapted
+                print(f"    ✓ {platform}: {adapted['length']}/{spec['max_length']} characters "
+                      f"({adapted['latency']:.1f}s)")
+
+        if targets and not adaptations:
+            raise RuntimeError(next(iter(errors.values())))
 
         result = {
             'company': company,
             'master_message': master_message,
             'adaptations': adaptations,
             'platforms': list(adaptations.keys()),
+            'errors': errors,
+            'mode': 'single_call' if single_call else 'per_platform',
             'adapted_at': datetime.now().isoformat(),
             'success': True
         }
@@ -719,37 +851,10 @@ Return ONLY the adapted content, no explanations or meta-commentary.
         }
 
 
-def generate_content(company, brand_voice, prompt, platform='general', max_length=500, openai_api_key=None):
-    """
-    Generate content in the brand's voice
-
-    Args:
-        company: Company name
-        brand_voice: Brand voice profile dict
-        prompt: Content generation prompt
-        platform: Target platform (twitter, linkedin, general, etc.)
-        max_length: Maximum content length
-        openai_api_key: OpenAI API key
-
-    Returns:
-        Dict with company, platform, content, etc.
-    """
-    try:
-        print(f"\n{'='*50}")
-        print(f"CONTENT GENERATOR: {company} for {platform}")
-        print(f"{'='*50}\n")
-
-        if not openai_api_key:
-            openai_api_key = os.environ.get('OPENAI_API_KEY')
-
-        if not openai_api_key:
-            raise ValueError("Missing OPENAI_API_KEY")
-
-        # Create OpenAI client
-        client = OpenAI(api_key=openai_api_key)
-
-        # Create generation prompt
-        generation_prompt = f"""You are a content writer for {company}. Generate content that matches their brand voice EXACTLY.
+def _content_request(company, brand_voice, prompt, platform, max_length):
+    """Build the generate_content chat request (chat kwargs dict)"""
+    # Create generation prompt
+    generation_prompt = f"""You are a content writer for {company}. Generate content that matches their brand voice EXACTLY.
 
 BRAND VOICE PROFILE:
 {json.dumps(brand_voice, indent=2)}
@@ -770,47 +875,76 @@ REQUIREMENTS:
 Generate ONLY the content, no explanations or meta-commentary.
 """
 
-        # Call OpenAI API using client
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a content writer for {company}. Match their brand voice exactly. Return only the content, no explanations."
-                },
-                {
-                    "role": "user",
-                    "content": generation_prompt
-                }
-            ],
-            temperature=0.8,
-            max_tokens=2048
-        )
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a content writer for {company}. Match their brand voice exactly. Return only the content, no explanations."
+        },
+        {
+            "role": "user",
+            "content": generation_prompt
+        }
+    ]
 
-        generated_content = response.choices[0].message.content.strip()
+    return {
+        'messages': messages,
+        'temperature': 0.8,
+        'max_tokens': 2048,
+        'label': 'generate_content',
+        'cache_scope': platform
+    }
 
-        # Remove quotes if GPT wrapped the content
-        if generated_content.startswith('"') and generated_content.endswith('"'):
-            generated_content = generated_content[1:-1]
 
-        # Trim if too long
-        if len(generated_content) > max_length:
-            generated_content = generated_content[:max_length-3] + "..."
+def _content_result(company, platform, prompt, response_text, max_length, cached):
+    """Clean generated text into the generate_content result dict"""
+    generated_content = _clean_content(response_text, max_length)
 
-        print(f"\n✓ Generated {len(generated_content)} characters")
-        print(f"\n{generated_content}\n")
+    print(f"\n✓ Generated {len(generated_content)} characters")
+    print(f"\n{generated_content}\n")
 
-        result = {
-            'company': company,
-            'platform': platform,
-            'content': generated_content,
-            'length': len(generated_content),
-            'generated_at': datetime.now().isoformat(),
-            'prompt': prompt,
-            'success': True
-        }
+    return {
+        'company': company,
+        'platform': platform,
+        'content': generated_content,
+        'length': len(generated_content),
+        'generated_at': datetime.now().isoformat(),
+        'prompt': prompt,
+        'cached': cached,
+        'success': True
+    }
 
-        return result
+
+def generate_content(company, brand_voice, prompt, platform='general', max_length=500, openai_api_key=None, allow_cached=False):
+    """
+    Generate content in the brand's voice
+
+    Args:
+        company: Company name
+        brand_voice: Brand voice profile dict
+        prompt: Content generation prompt
+        platform: Target platform (twitter, linkedin, general, etc.)
+        max_length: Maximum content length
+        openai_api_key: OpenAI API key
+        allow_cached: Reuse a cached response to an identical request
+
+    Returns:
+        Dict with company, platform, content, etc.
+    """
+    try:
+        print(f"\n{'='*50}")
+        print(f"CONTENT GENERATOR: {company} for {platform}")
+        print(f"{'='*50}\n")
+
+        openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
+
+        # Call OpenAI API
+        response = llm_gateway.chat(
+            **_content_request(company, brand_voice, prompt, platform, max_length),
+            api_key=openai_api_key,
+            allow_cached=allow_cached
+        )
+
+        return _content_result(company, platform, prompt, response.text, max_length, response.cached)
 
     except Exception as e:
         print(f"✗ Error: {e}")
@@ -820,3 +954,48 @@ Generate ONLY the content, no explanations or meta-commentary.
             'error': str(e),
             'success': False
         }
+
+
+def generate_content_stream(company, brand_voice, prompt, platform='general', max_length=500, openai_api_key=None, allow_cached=False):
+    """
+    Streaming variant of generate_content
+
+    Same request as generate_content, but text is yielded as the model
+    writes it. The streamed text is raw: wrapping quotes and overruns of
+    max_length are only cleaned up in the final result.
+
+    Args:
+        company: Company name
+        brand_voice: Brand voice profile dict
+        prompt: Content generation prompt
+        platform: Target platform (twitter, linkedin, general, etc.)
+        max_length: Maximum content length
+        openai_api_key: OpenAI API key
+        allow_cached: Reuse a cached response to an identical request
+
+    Returns:
+        llm_gateway.LLMStream yielding text chunks; once consumed its
+        .result is the generate_content result dict, plus 'ttft' and
+        'latency' in seconds
+    """
+    print(f"\n{'='*50}")
+    print(f"CONTENT GENERATOR: {company} for {platform}")
+    print(f"{'='*50}\n")
+
+    openai_api_key = llm_gateway.resolve_api_key(openai_api_key)
+
+    def finish(text):
+        result = _content_result(company, platform, prompt, text, max_length, stream.cached)
+        result['ttft'] = stream.ttft
+        result['latency'] = stream.latency
+        if stream.ttft is not None:
+            print(f"  First token after {stream.ttft:.1f}s, complete after {stream.latency:.1f}s")
+        return result
+
+    stream = llm_gateway.chat_stream(
+        **_content_request(company, brand_voice, prompt, platform, max_length),
+        api_key=openai_api_key,
+        allow_cached=allow_cached,
+        on_complete=finish
+    )
+    return stream
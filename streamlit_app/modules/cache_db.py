@@ -0,0 +1,39 @@
+"""
+Cache Database Module
+Shared SQLite helpers for the on-disk caches under data/cache
+"""
+import os
+import sqlite3
+import threading
+
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache')
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(filename, schema):
+    """
+    Open (or reuse) a SQLite database in the cache directory
+
+    The connection is shared across threads; callers serialize access with
+    the lock returned alongside it.
+
+    Args:
+        filename: Database file name inside data/cache
+        schema: SQL script run once to create tables/indexes
+
+    Returns:
+        (connection, lock) tuple
+    """
+    with _connections_lock:
+        if filename not in _connections:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, filename)
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(schema)
+            conn.commit()
+            _connections[filename] = (conn, threading.Lock())
+        return _connections[filename]
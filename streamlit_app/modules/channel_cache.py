@@ -0,0 +1,74 @@
+"""
+Channel Cache
+Persistent cache of YouTube channel lookups keyed by company name
+"""
+import time
+
+from modules.cache_db import get_connection
+
+
+# Channel search costs 100 quota units per query, so both hits and misses
+# are remembered; misses expire sooner in case the channel gets created
+CHANNEL_TTL = 30 * 24 * 3600
+NEGATIVE_TTL = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    company TEXT PRIMARY KEY,
+    channel_id TEXT,
+    channel_name TEXT,
+    uploads_playlist_id TEXT,
+    resolved_at REAL NOT NULL
+);
+"""
+
+
+def _db():
+    return get_connection('youtube_channels.sqlite', _SCHEMA)
+
+
+def _key(company):
+    return ' '.join(company.lower().split())
+
+
+def get_channel(company):
+    """
+    Look up a cached channel resolution
+
+    Returns:
+        None if nothing fresh is cached, otherwise a dict with channel_id,
+        channel_name and uploads_playlist_id (channel_id None for a cached
+        "not found")
+    """
+    conn, lock = _db()
+    with lock:
+        row = conn.execute(
+            "SELECT channel_id, channel_name, uploads_playlist_id, resolved_at FROM channels WHERE company = ?",
+            (_key(company),)
+        ).fetchone()
+
+    if not row:
+        return None
+
+    channel_id, channel_name, uploads_playlist_id, resolved_at = row
+    ttl = CHANNEL_TTL if channel_id else NEGATIVE_TTL
+    if time.time() - resolved_at >= ttl:
+        return None
+
+    return {
+        'channel_id': channel_id,
+        'channel_name': channel_name,
+        'uploads_playlist_id': uploads_playlist_id
+    }
+
+
+def set_channel(company, channel_id, channel_name=None, uploads_playlist_id=None):
+    """Remember a channel resolution (channel_id None records "not found")"""
+    conn, lock = _db()
+    with lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO channels (company, channel_id, channel_name, uploads_playlist_id, resolved_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (_key(company), channel_id, channel_name, uploads_playlist_id, time.time())
+        )
+        conn.commit()
@@ -0,0 +1,252 @@
+"""
+Content Store Module
+Content-addressed on-disk store of scraped article HTML and extracted text
+"""
+import hashlib
+import time
+import zlib
+
+from modules.cache_db import get_connection
+
+
+# How long a URL is served from the store without downloading it again
+URL_TTL = 30 * 24 * 3600
+
+# Total size (compressed HTML + text) kept before least-recently-used pages
+# are evicted
+MAX_BYTES = 200 * 1024 * 1024
+
+# Pages are stored by content hash, so identical HTML served under several
+# URLs is kept (and parsed) once; urls maps each URL to its latest version.
+# store_size holds the running SUM(size) of blobs so inserts don't rescan
+# the table; it is seeded from blobs the first time it is created.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    html BLOB NOT NULL,
+    text TEXT,
+    extractor TEXT,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs (accessed_at);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_size (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_size (id, total) SELECT 1, COALESCE(SUM(size), 0) FROM blobs;
+"""
+
+
+_migrated = False
+
+
+def _db():
+    global _migrated
+    conn, lock = get_connection('content_store.sqlite', _SCHEMA)
+
+    if not _migrated:
+        # Stores created before extraction backends were recorded lack the column
+        with lock:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(blobs)")}
+            if 'extractor' not in columns:
+                conn.execute("ALTER TABLE blobs ADD COLUMN extractor TEXT")
+                conn.commit()
+            _migrated = True
+
+    return conn, lock
+
+
+def _total(conn):
+    return conn.execute("SELECT total FROM store_size WHERE id = 1").fetchone()[0]
+
+
+def _add_to_total(conn, delta):
+    if delta:
+        conn.execute("UPDATE store_size SET total = total + ? WHERE id = 1", (delta,))
+
+
+def _stored_size(conn, page_hash):
+    row = conn.execute("SELECT size FROM blobs WHERE content_hash = ?", (page_hash,)).fetchone()
+    return row[0] if row else 0
+
+
+def content_hash(html):
+    """Hash of raw page bytes used as the storage key"""
+    return hashlib.sha256(html).hexdigest()
+
+
+def get_by_url(url, max_age=URL_TTL):
+    """
+    Return the stored version of a URL if it was fetched recently
+
+    Returns:
+        Dict with content_hash, text and extractor, or None
+    """
+    conn, lock = _db()
+    with lock:
+        row = conn.execute(
+            "SELECT u.content_hash, b.text, u.fetched_at, b.extractor FROM urls u "
+            "JOIN blobs b ON b.content_hash = u.content_hash WHERE u.url = ?",
+            (url,)
+        ).fetchone()
+
+        if not row or time.time() - row[2] > max_age:
+            return None
+
+        conn.execute("UPDATE blobs SET accessed_at = ? WHERE content_hash = ?", (time.time(), row[0]))
+        conn.commit()
+
+    return {'content_hash': row[0], 'text': row[1], 'extractor': row[3]}
+
+
+def get_by_hash(page_hash):
+    """
+    Return a stored page by content hash
+
+    Returns:
+        Dict with html (bytes), text and extractor, or None
+    """
+    conn, lock = _db()
+    with lock:
+        row = conn.execute(
+            "SELECT html, text, extractor FROM blobs WHERE content_hash = ?",
+            (page_hash,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        conn.execute("UPDATE blobs SET accessed_at = ? WHERE content_hash = ?", (time.time(), page_hash))
+        conn.commit()
+
+    return {'html': zlib.decompress(row[0]), 'text': row[1], 'extractor': row[2]}
+
+
+def link_url(url, page_hash):
+    """Point a URL at an already stored page"""
+    conn, lock = _db()
+    with lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO urls (url, content_hash, fetched_at) VALUES (?, ?, ?)",
+            (url, page_hash, time.time())
+        )
+        conn.commit()
+
+
+def put(url, html, text, extractor=None):
+    """
+    Store a downloaded page and its extracted text
+
+    Args:
+        url: Page URL
+        html: Raw page bytes
+        text: Extracted article text (may be None)
+        extractor: Name of the extraction backend that produced text
+
+    Returns:
+        The page's content hash
+    """
+    page_hash = content_hash(html)
+    compressed = zlib.compress(html)
+    size = len(compressed) + len((text or '').encode('utf-8'))
+    now = time.time()
+
+    conn, lock = _db()
+    with lock:
+        previous_size = _stored_size(conn, page_hash)
+        conn.execute(
+            "INSERT OR REPLACE INTO blobs (content_hash, html, text, extractor, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (page_hash, compressed, text, extractor, size, now)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO urls (url, content_hash, fetched_at) VALUES (?, ?, ?)",
+            (url, page_hash, now)
+        )
+        _add_to_total(conn, size - previous_size)
+
+        if _total(conn) > MAX_BYTES:
+            _evict(conn, MAX_BYTES)
+        conn.commit()
+
+    return page_hash
+
+
+def update_text(page_hash, text, extractor):
+    """Replace the extracted text of a stored page (e.g. after a backend change)"""
+    conn, lock = _db()
+    with lock:
+        previous_size = _stored_size(conn, page_hash)
+        conn.execute(
+            "UPDATE blobs SET text = ?, extractor = ?, "
+            "size = LENGTH(html) + LENGTH(CAST(COALESCE(?, '') AS BLOB)) WHERE content_hash = ?",
+            (text, extractor, text, page_hash)
+        )
+        _add_to_total(conn, _stored_size(conn, page_hash) - previous_size)
+        conn.commit()
+
+
+def iter_pages(limit=None):
+    """Yield (url, html bytes) for stored pages, most recently fetched first"""
+    conn, lock = _db()
+    with lock:
+        rows = conn.execute(
+            "SELECT u.url, b.html FROM urls u JOIN blobs b ON b.content_hash = u.content_hash "
+            "ORDER BY u.fetched_at DESC LIMIT ?",
+            (limit if limit is not None else -1,)
+        ).fetchall()
+
+    for url, html in rows:
+        yield url, zlib.decompress(html)
+
+
+def _evict(conn, max_bytes):
+    # Caller holds the lock and commits
+    total = _total(conn)
+    if total <= max_bytes:
+        return 0
+
+    evicted = []
+    freed = 0
+    for page_hash, size in conn.execute("SELECT content_hash, size FROM blobs ORDER BY accessed_at"):
+        if total - freed <= max_bytes:
+            break
+        evicted.append((page_hash,))
+        freed += size
+
+    conn.executemany("DELETE FROM blobs WHERE content_hash = ?", evicted)
+    conn.execute("DELETE FROM urls WHERE content_hash NOT IN (SELECT content_hash FROM blobs)")
+    _add_to_total(conn, -freed)
+    return len(evicted)
+
+
+def evict(max_bytes=None):
+    """
+    Drop least-recently-used pages until the store fits in max_bytes
+
+    Returns:
+        Number of pages evicted
+    """
+    if max_bytes is None:
+        max_bytes = MAX_BYTES
+
+    conn, lock = _db()
+    with lock:
+        evicted = _evict(conn, max_bytes)
+        conn.commit()
+
+    return evicted
+
+
+def stats():
+    """Return page count and total stored bytes"""
+    conn, lock = _db()
+    with lock:
+        pages = conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+        total = _total(conn)
+    return {'pages': pages, 'bytes': total, 'max_bytes': MAX_BYTES}
@@ -4,9 +4,12 @@ Scrapes trending articles from Dev.to
 """
 
 import requests
-import re
 from datetime import datetime, timedelta
 
+from modules import http_client
+from modules.topic_matcher import TopicMatcher
+from modules.trend_scoring import score_trend, top_k
+
 def scrape_devto_trends(company, limit=20, credentials=None):
     """
     Scrape trending articles from Dev.to related to a company
@@ -25,8 +28,14 @@ def scrape_devto_trends(company, limit=20, credentials=None):
     print(f"Limit: {limit}")
 
     trends = []
+    seen_urls = set()
     api_base = "https://dev.to/api"
 
+    main_topics = []
+    if credentials and 'brand_voice' in credentials:
+        main_topics = credentials['brand_voice'].get('main_topics', [])
+    matcher = TopicMatcher(company, main_topics)
+
     try:
         # Strategy 1: Search for company name
         print(f"Searching Dev.to for articles about '{company}'...")
@@ -36,19 +45,16 @@ def scrape_devto_trends(company, limit=20, credentials=None):
 
         # Search parameters - get recent popular articles
         params = {
-            'per_page': 50,
+            'per_page': 100,  # Scan wide; results are ranked below
             'top': 7  # Articles from last week
         }
 
-        response = requests.get(search_url, params=params, timeout=10)
+        response = http_client.get(search_url, params=params)
 
         if response.status_code == 200:
             articles = response.json()
 
             # Filter for company mentions
-            company_lower = company.lower()
-            company_pattern = r'\b' + re.escape(company_lower) + r'\b'
-
             for article in articles:
                 title = article.get('title', '')
                 description = article.get('description', '')
@@ -56,9 +62,8 @@ def scrape_devto_trends(company, limit=20, credentials=None):
                 body_markdown = article.get('body_markdown', '')
 
                 # Check if company is mentioned in title, description, or tags
-                combined_text = f"{title} {description} {' '.join(tags)}".lower()
-
-                if re.search(company_pattern, combined_text):
+                if matcher.mentions_company(title, description, ' '.join(tags)):
+                    seen_urls.add(article.get('url', ''))
                     trends.append({
                         'title': title,
                         'description': description,
@@ -69,16 +74,14 @@ def scrape_devto_trends(company, limit=20, credentials=None):
                         'reading_time': article.get('reading_time_minutes', 0),
                         'tags': tags,
                         'author': article.get('user', {}).get('name', 'Unknown'),
-                        'source': 'devto'
+                        'source': 'devto',
+                        'matched_topics': matcher.matched_topics(title, description, ' '.join(tags))
                     })
 
             print(f"Found {len(trends)} articles directly mentioning '{company}'")
 
         # Strategy 2: Search by tags if we have brand voice data
         if len(trends) < 5 and credentials and 'brand_voice' in credentials:
-            brand_voice = credentials['brand_voice']
-            main_topics = brand_voice.get('main_topics', [])
-
             if main_topics:
                 print(f"Searching by brand topics: {main_topics[:3]}")
 
@@ -95,13 +98,14 @@ def scrape_devto_trends(company, limit=20, credentials=None):
                     }
 
                     try:
-                        tag_response = requests.get(tag_url, params=tag_params, timeout=10)
+                        tag_response = http_client.get(tag_url, params=tag_params)
                         if tag_response.status_code == 200:
                             tag_articles = tag_response.json()
 
                             for article in tag_articles[:3]:  # Top 3 per topic
                                 # Avoid duplicates
-                                if not any(t.get('url') == article.get('url') for t in trends):
+                                if article.get('url', '') not in seen_urls:
+                                    seen_urls.add(article.get('url', ''))
                                     trends.append({
                                         'title': article.get('title', ''),
                                         'description': article.get('description', ''),
@@ -138,12 +142,13 @@ def scrape_devto_trends(company, limit=20, credentials=None):
                         'top': 1  # Today's top
                     }
 
-                    tag_response = requests.get(tag_url, params=tag_params, timeout=10)
+                    tag_response = http_client.get(tag_url, params=tag_params)
                     if tag_response.status_code == 200:
                         tag_articles = tag_response.json()
 
                         for article in tag_articles[:2]:
-                            if not any(t.get('url') == article.get('url') for t in trends):
+                            if article.get('url', '') not in seen_urls:
+                                seen_urls.add(article.get('url', ''))
                                 trends.append({
                                     'title': article.get('title', ''),
                                     'description': article.get('description', ''),
@@ -162,8 +167,17 @@ def scrape_devto_trends(company, limit=20, credentials=None):
                     print(f"Error fetching tag '{tag}': {e}")
                     continue
 
-        # Limit results
-        trends = trends[:limit]
+        # Keep the best `limit` articles by relevance score
+        for trend in trends:
+            trend['relevance_score'] = round(score_trend(
+                text=f"{trend.get('title') or ''} {trend.get('description') or ''} {' '.join(trend.get('tags') or [])}",
+                source='devto',
+                engagement=trend.get('reactions', 0),
+                num_comments=trend.get('comments', 0),
+                date=trend.get('published_at'),
+                matcher=matcher
+            ), 3)
+        trends = top_k(trends, limit, key=lambda trend: trend['relevance_score'])
 
         print(f"\nTotal unique trends found: {len(trends)}")
 
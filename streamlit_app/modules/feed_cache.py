@@ -0,0 +1,263 @@
+"""
+Feed Cache Module
+Persistent cache of blog feed discovery results, feed validators and ingested entries
+"""
+import json
+import time
+import zlib
+
+from modules.cache_db import get_connection
+
+
+# How long a resolved company -> feed mapping is trusted before rediscovery
+DISCOVERY_TTL = 7 * 24 * 3600
+
+# How long a candidate URL that failed to produce a feed is skipped
+NEGATIVE_TTL = 24 * 3600
+
+# Ingested entries older than this are dropped and fetched again if the
+# feed still lists them
+ENTRY_TTL = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS discovery (
+    key TEXT PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    resolved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failed_candidates (
+    url TEXT PRIMARY KEY,
+    failed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    feed_url TEXT NOT NULL,
+    entry_key TEXT NOT NULL,
+    data BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (feed_url, entry_key)
+);
+CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored_at);
+"""
+
+
+def _db():
+    return get_connection('feeds.sqlite', _SCHEMA)
+
+
+def _discovery_key(company, blog_url):
+    return f"{company.strip().lower()}|{(blog_url or '').strip().rstrip('/').lower()}"
+
+
+def get_resolved_feed(company, blog_url=None):
+    """Return the cached feed URL for a company/blog URL, or None if unknown or expired"""
+    conn, lock = _db()
+    with lock:
+        row = conn.execute(
+            "SELECT feed_url, resolved_at FROM discovery WHERE key = ?",
+            (_discovery_key(company, blog_url),)
+        ).fetchone()
+
+    if row and time.time() - row[1] < DISCOVERY_TTL:
+        return row[0]
+    return None
+
+
+def set_resolved_feed(company, blog_url, feed_url):
+    """Remember which feed URL discovery settled on"""
+    conn, lock = _db()
+    with lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO discovery (key, feed_url, resolved_at) VALUES (?, ?, ?)",
+            (_discovery_key(company, blog_url), feed_url, time.time())
+        )
+        conn.commit()
+
+
+def forget_resolved_feed(company, blog_url=None):
+    """Drop a cached mapping whose feed no longer validates"""
+    conn, lock = _db()
+    with lock:
+        conn.execute("DELETE FROM discovery WHERE key = ?", (_discovery_key(company, blog_url),))
+        conn.commit()
+
+
+def get_failed_candidates(urls):
+    """Return the subset of urls that failed recently and should be skipped"""
+    urls = list(urls)
+    if not urls:
+        return set()
+
+    cutoff = time.time() - NEGATIVE_TTL
+    failed = set()
+
+    conn, lock = _db()
+    with lock:
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT url FROM failed_candidates WHERE failed_at > ? AND url IN ({placeholders})",
+                [cutoff] + chunk
+            ).fetchall()
+            failed.update(row[0] for row in rows)
+
+    return failed
+
+
+def mark_failed_candidates(urls):
+    """Record candidate URLs that were probed and did not return a feed"""
+    now = time.time()
+    rows = [(url, now) for url in urls]
+    if not rows:
+        return
+
+    conn, lock = _db()
+    with lock:
+        conn.executemany(
+            "INSERT OR REPLACE INTO failed_candidates (url, failed_at) VALUES (?, ?)",
+            rows
+        )
+        conn.commit()
+
+
+def get_feed_state(feed_url):
+    """
+    Return the stored validators and body for a feed
+
+    Returns:
+        Dict with etag, last_modified, body (bytes) and fetched_at, or None
+    """
+    conn, lock = _db()
+    with lock:
+        row = conn.execute(
+            "SELECT etag, last_modified, body, fetched_at FROM feeds WHERE url = ?",
+            (feed_url,)
+        ).fetchone()
+
+    if not row:
+        return None
+
+    etag, last_modified, body, fetched_at = row
+    return {
+        'etag': etag,
+        'last_modified': last_modified,
+        'body': zlib.decompress(body) if body else None,
+        'fetched_at': fetched_at
+    }
+
+
+def save_feed_state(feed_url, etag, last_modified, body):
+    """Store the validators and (compressed) body of a successfully fetched feed"""
+    conn, lock = _db()
+    with lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO feeds (url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (feed_url, etag, last_modified, zlib.compress(body) if body else None, time.time())
+        )
+        conn.commit()
+
+
+def touch_feed_state(feed_url):
+    """Mark a stored feed as confirmed current by a 304 response"""
+    conn, lock = _db()
+    with lock:
+        conn.execute("UPDATE feeds SET fetched_at = ? WHERE url = ?", (time.time(), feed_url))
+        conn.commit()
+
+
+def get_entries(feed_url, entry_keys):
+    """
+    Return stored entries of a feed
+
+    Args:
+        feed_url: Feed the entries belong to
+        entry_keys: Entry guids/links to look up
+
+    Returns:
+        Dict of entry_key -> stored entry dict
+    """
+    entry_keys = list(entry_keys)
+    if not entry_keys:
+        return {}
+
+    stored = {}
+    conn, lock = _db()
+    with lock:
+        for start in range(0, len(entry_keys), 500):
+            chunk = entry_keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT entry_key, data FROM entries WHERE feed_url = ? AND stored_at > ? "
+                f"AND entry_key IN ({placeholders})",
+                [feed_url, time.time() - ENTRY_TTL] + chunk
+            ).fetchall()
+            for entry_key, data in rows:
+                stored[entry_key] = json.loads(zlib.decompress(data))
+
+    return stored
+
+
+def save_entries(feed_url, entries):
+    """
+    Store processed feed entries
+
+    Args:
+        feed_url: Feed the entries belong to
+        entries: Iterable of (entry_key, entry dict) tuples
+    """
+    now = time.time()
+    rows = [
+        (feed_url, entry_key, zlib.compress(json.dumps(entry).encode('utf-8')), now)
+        for entry_key, entry in entries
+    ]
+    if not rows:
+        return
+
+    conn, lock = _db()
+    with lock:
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (feed_url, entry_key, data, stored_at) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+
+def prune_entries(feed_url, current_keys):
+    """
+    Drop stored entries that can no longer be reused
+
+    Entries are only looked up for items the feed currently lists, so
+    entries of this feed missing from `current_keys` are deleted, as are
+    entries of any feed older than ENTRY_TTL.
+
+    Args:
+        feed_url: Feed that was just read
+        current_keys: Entry keys listed in the latest feed body
+
+    Returns:
+        Number of entries deleted
+    """
+    current_keys = set(current_keys)
+
+    conn, lock = _db()
+    with lock:
+        expired = conn.execute(
+            "DELETE FROM entries WHERE stored_at <= ?", (time.time() - ENTRY_TTL,)
+        ).rowcount
+
+        stale = [
+            (feed_url, entry_key)
+            for (entry_key,) in conn.execute("SELECT entry_key FROM entries WHERE feed_url = ?", (feed_url,))
+            if entry_key not in current_keys
+        ]
+        conn.executemany("DELETE FROM entries WHERE feed_url = ? AND entry_key = ?", stale)
+        conn.commit()
+
+    return expired + len(stale)
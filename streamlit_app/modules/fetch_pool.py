@@ -0,0 +1,128 @@
+"""
+Fetch Pool Module
+Bounded-concurrency helpers shared by the scrapers
+"""
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import threading
+import time
+
+from modules.log_capture import propagate
+
+
+class HostRateLimiter:
+    """
+    Per-host politeness limiter
+
+    Spaces out request starts to the same host by at least `min_interval`
+    seconds and caps how many requests to one host may be in flight at once.
+    Safe to share between worker threads.
+    """
+
+    def __init__(self, min_interval=0.0, max_per_host=None):
+        self.min_interval = min_interval
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._semaphores = {}
+
+    def _host(self, url_or_host):
+        if '://' in url_or_host:
+            return urlparse(url_or_host).netloc.lower()
+        return url_or_host.lower()
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    def wait(self, url_or_host):
+        """Block until the host may receive another request"""
+        if not self.min_interval:
+            return
+
+        host = self._host(url_or_host)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    @contextmanager
+    def slot(self, url_or_host):
+        """Context manager that holds a per-host concurrency slot for one request"""
+        host = self._host(url_or_host)
+        semaphore = self._semaphore(host) if self.max_per_host else None
+
+        if semaphore:
+            semaphore.acquire()
+        try:
+            self.wait(host)
+            yield
+        finally:
+            if semaphore:
+                semaphore.release()
+
+
+def fetch_ordered(fetch, items, max_workers=8, prefetch=None):
+    """
+    Run `fetch(item)` over `items` in a thread pool and yield results in input order
+
+    At most `prefetch` calls (default 2 x max_workers) are queued ahead of the
+    consumer, so closing the generator early (e.g. `break` once enough matches
+    are found) stops the scan without fetching the rest of the items.
+
+    Args:
+        fetch: Callable taking one item; exceptions are yielded as the result
+        items: Iterable of inputs
+        max_workers: Number of worker threads
+        prefetch: Maximum number of in-flight calls
+
+    Yields:
+        (item, result) tuples in the same order as `items`
+    """
+    if prefetch is None:
+        prefetch = max_workers * 2
+    prefetch = max(prefetch, 1)
+
+    # Worker output goes to the same captured log as the caller's
+    fetch = propagate(fetch)
+
+    def _call(item):
+        try:
+            return fetch(item)
+        except Exception as e:
+            return e
+
+    iterator = iter(items)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=max(max_workers, 1))
+
+    try:
+        for item in iterator:
+            pending.append((item, executor.submit(_call, item)))
+            if len(pending) >= prefetch:
+                break
+
+        while pending:
+            item, future = pending.popleft()
+            result = future.result()
+
+            next_item = next(iterator, _EXHAUSTED)
+            if next_item is not _EXHAUSTED:
+                pending.append((next_item, executor.submit(_call, next_item)))
+
+            yield item, result
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_EXHAUSTED = object()
@@ -2,13 +2,30 @@
 Hacker News Scraper Module
 Scrapes trending topics from Hacker News using official API
 """
-import requests
 from datetime import datetime
-import time
 import json
 import glob
 import os
-import re
+
+from modules.fetch_pool import HostRateLimiter, fetch_ordered
+from modules import hn_cache, http_client
+from modules.topic_matcher import TopicMatcher
+from modules.trend_scoring import TopK, score_sample
+
+
+HN_API_HOST = "hacker-news.firebaseio.com"
+
+# Default concurrency for item fetching; the HN API is served from Firebase
+# and comfortably handles a few dozen parallel requests per client
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_REQUESTS_PER_SECOND = 50
+
+_rate_limiter = HostRateLimiter(min_interval=1.0 / DEFAULT_REQUESTS_PER_SECOND)
+
+
+def set_rate_limit(requests_per_second):
+    """Change the per-host request rate used for the Hacker News API"""
+    _rate_limiter.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
 
 
 def classify_topic(title, text):
@@ -30,7 +47,8 @@ def classify_topic(title, text):
 def get_hn_item(item_id):
     """Fetch a single item from Hacker News API"""
     try:
-        response = requests.get(f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json", timeout=10)
+        _rate_limiter.wait(HN_API_HOST)
+        response = http_client.get(f"https://{HN_API_HOST}/v0/item/{item_id}.json")
         if response.status_code == 200:
             return response.json()
         return None
@@ -51,8 +69,9 @@ def get_hn_stories(story_type='top', limit=100):
         List of story IDs
     """
     try:
-        url = f"https://hacker-news.firebaseio.com/v0/{story_type}stories.json"
-        response = requests.get(url, timeout=10)
+        url = f"https://{HN_API_HOST}/v0/{story_type}stories.json"
+        _rate_limiter.wait(HN_API_HOST)
+        response = http_client.get(url)
         if response.status_code == 200:
             story_ids = response.json()
             return story_ids[:limit]
@@ -62,6 +81,65 @@ def get_hn_stories(story_type='top', limit=100):
         return []
 
 
+def fetch_hn_items(item_ids, max_workers=DEFAULT_MAX_WORKERS, use_cache=True, refresh_if=None):
+    """
+    Fetch Hacker News items concurrently, preserving the order of item_ids
+
+    Items are fetched through a bounded thread pool. Only a small window of
+    requests runs ahead of the consumer, so stopping iteration early leaves
+    the remaining items unfetched.
+
+    With use_cache, items whose immutable fields are still fresh are served
+    from the on-disk cache. An item whose score/comment count has gone stale
+    is only refetched if refresh_if(item) returns True, so stories that are
+    not going to be shown never cost a request.
+
+    Args:
+        item_ids: Iterable of HN item IDs
+        max_workers: Number of concurrent requests
+        use_cache: Read from and write to the persistent item cache
+        refresh_if: Optional predicate deciding whether a cached item with
+            stale volatile fields should be refetched (default: always)
+
+    Yields:
+        (item_id, item, status) tuples; item is None if it could not be
+        fetched, status is 'hit', 'miss' or 'refresh'
+    """
+    item_ids = list(item_ids)
+    cached = hn_cache.get_items(item_ids) if use_cache else {}
+    fetched = []
+
+    def load(item_id):
+        entry = cached.get(item_id)
+        if hn_cache.is_immutable_fresh(entry):
+            if hn_cache.is_volatile_fresh(entry) or (refresh_if and not refresh_if(entry['item'])):
+                return entry['item'], 'hit'
+            status = 'refresh'
+        else:
+            status = 'miss'
+
+        item = get_hn_item(item_id)
+        if item:
+            # Record every fetch, including read-ahead the consumer never uses
+            fetched.append(item)
+        elif entry:
+            # Serve the stale copy rather than dropping the story
+            return entry['item'], status
+        return item, status
+
+    try:
+        for item_id, result in fetch_ordered(load, item_ids, max_workers=max_workers):
+            if isinstance(result, Exception):
+                yield item_id, None, 'miss'
+                continue
+
+            item, status = result
+            yield item_id, item, status
+    finally:
+        if use_cache and fetched:
+            hn_cache.put_items(fetched)
+
+
 def load_brand_voice_profile(company):
     """
     Load the most recent brand voice profile for a company
@@ -96,14 +174,15 @@ def load_brand_voice_profile(company):
         return None
 
 
-def scrape_hackernews_trends(company, limit=20, credentials=None):
+def scrape_hackernews_trends(company, limit=20, credentials=None, max_workers=DEFAULT_MAX_WORKERS):
     """
     Scrape trending topics about a company from Hacker News
 
     Args:
         company: Company name
-        limit: Number of trending topics to find
+        limit: Number of top-scoring trending topics to return
         credentials: Not used for HN (no auth needed), kept for API compatibility
+        max_workers: Number of concurrent item fetches
 
     Returns:
         Dict with trending topics
@@ -128,7 +207,6 @@ def scrape_hackernews_trends(company, limit=20, credentials=None):
         else:
             print("ℹ️ No brand voice profile found - using company name only\n")
 
-        trending_topics = []
         seen_urls = set()
 
         # Fetch stories from multiple sources for better coverage
@@ -143,7 +221,6 @@ def scrape_hackernews_trends(company, limit=20, credentials=None):
             print(f"Fetching {source_type} stories...")
             story_ids = get_hn_stories(source_type, fetch_limit)
             all_story_ids.extend(story_ids)
-            time.sleep(0.5)  # Be nice to the API
 
         # Remove duplicates while preserving order
         unique_story_ids = []
@@ -160,43 +237,44 @@ def scrape_hackernews_trends(company, limit=20, credentials=None):
                   (f" (+{len(main_topics)-5} more)" if len(main_topics) > 5 else ""))
         print()
 
+        # Company and all topics compiled once, shared by every story check
+        matcher = TopicMatcher(company, main_topics)
+
+        def is_relevant(item):
+            """Check if a story mentions the company or one of the brand topics"""
+            if item.get('type') != 'story':
+                return False
+
+            return (matcher.search(item.get('title', ''), item.get('text', '')) or
+                    matcher.mentions_company(item.get('url', '')))
+
+        # Scan every story and keep the best `limit` matches by score,
+        # rather than the first `limit` matches in listing order
+        best = TopK(limit)
+        matches = 0
         processed = 0
-        for story_id in unique_story_ids:
-            if len(trending_topics) >= limit:
-                break
+        cache_stats = {'hits': 0, 'misses': 0, 'refreshed': 0}
+        items = fetch_hn_items(unique_story_ids, max_workers=max_workers, refresh_if=is_relevant)
+        for story_id, item, status in items:
+            if status == 'hit':
+                cache_stats['hits'] += 1
+            elif status == 'refresh':
+                cache_stats['refreshed'] += 1
+            else:
+                cache_stats['misses'] += 1
 
-            # Fetch story details
-            item = get_hn_item(story_id)
             if not item or item.get('type') != 'story':
                 continue
 
             processed += 1
             if processed % 50 == 0:
-                print(f"  Processed {processed} stories, found {len(trending_topics)} matches...")
+                print(f"  Processed {processed} stories, found {matches} matches...")
 
             title = item.get('title', '')
             text = item.get('text', '')
             url = item.get('url', '')
 
-            # Check if story is relevant to the company
-            # Use word boundary matching to avoid matching substrings
-            pattern = r'\b' + re.escape(company) + r'\b'
-            title_match = re.search(pattern, title, re.IGNORECASE)
-            text_match = re.search(pattern, text, re.IGNORECASE) if text else False
-            url_match = re.search(pattern, url, re.IGNORECASE) if url else False
-
-            is_relevant = bool(title_match or text_match or url_match)
-
-            # If we have main topics from brand voice, also check if post mentions any of them
-            if not is_relevant and main_topics:
-                story_content = f"{title} {text}".lower()
-                for topic in main_topics:
-                    topic_pattern = r'\b' + re.escape(topic.lower()) + r'\b'
-                    if re.search(topic_pattern, story_content):
-                        is_relevant = True
-                        break
-
-            if is_relevant:
+            if is_relevant(item):
                 hn_url = f"https://news.ycombinator.com/item?id={story_id}"
 
                 # Skip if we've already seen this URL
@@ -213,7 +291,7 @@ def scrape_hackernews_trends(company, limit=20, credentials=None):
                 if text:
                     sample_text += f"\n\n{text[:300]}..." if len(text) > 300 else f"\n\n{text}"
 
-                trending_topics.append({
+                sample = {
                     'text': sample_text,
                     'source': 'hackernews_trends',
                     'date': datetime.fromtimestamp(item.get('time', 0)).isoformat(),
@@ -226,13 +304,22 @@ def scrape_hackernews_trends(company, limit=20, credentials=None):
                         'engagement': score,
                         'num_comments': num_comments,
                         'author': item.get('by', 'unknown'),
-                        'external_url': url if url else None
+                        'external_url': url if url else None,
+                        'matched_topics': matcher.matched_topics(title, text)
                     }
-                })
+                }
+                matches += 1
+
+                score = score_sample(sample, matcher)
+                sample['metadata']['relevance_score'] = round(score, 3)
+                best.push(score, sample)
 
-                time.sleep(0.1)  # Be nice to the API
+        items.close()
+        trending_topics = best.items()
 
-        print(f"\n✓ Found {len(trending_topics)} trending topics")
+        print(f"\n✓ Found {matches} matching stories, kept top {len(trending_topics)} by score")
+        print(f"  Item cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['refreshed']} refreshed")
         if main_topics:
             print(f"  (Using brand voice topics for enhanced matching)")
 
@@ -244,7 +331,9 @@ def scrape_hackernews_trends(company, limit=20, credentials=None):
             'samples': trending_topics,
             'success': len(trending_topics) > 0,
             'used_brand_voice': bool(main_topics),
-            'main_topics_used': main_topics if main_topics else []
+            'main_topics_used': main_topics if main_topics else [],
+            'total_matches': matches,
+            'cache_stats': cache_stats
         }
 
         print(f"{'='*50}\n")
@@ -0,0 +1,93 @@
+"""
+Hacker News Item Cache
+Persistent on-disk cache of HN item JSON keyed by item ID
+"""
+import json
+import time
+
+from modules.cache_db import get_connection
+
+
+# Title, url, author and timestamp never change once a story is posted;
+# score and comment count keep moving while the story is on the front page
+IMMUTABLE_TTL = 30 * 24 * 3600
+VOLATILE_TTL = 15 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def _db():
+    return get_connection('hn_items.sqlite', _SCHEMA)
+
+
+def get_items(item_ids):
+    """
+    Look up cached items
+
+    Args:
+        item_ids: Iterable of HN item IDs
+
+    Returns:
+        Dict of item_id -> {'item': dict, 'age': seconds since fetch}
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return {}
+
+    conn, lock = _db()
+    now = time.time()
+    cached = {}
+
+    with lock:
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT id, data, fetched_at FROM items WHERE id IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for item_id, data, fetched_at in rows:
+                cached[item_id] = {
+                    'item': json.loads(data),
+                    'age': now - fetched_at
+                }
+
+    return cached
+
+
+def put_items(items):
+    """
+    Store freshly fetched items
+
+    Args:
+        items: Iterable of HN item dicts (each must have an 'id')
+    """
+    now = time.time()
+    rows = [(item['id'], json.dumps(item), now) for item in items if item and 'id' in item]
+    if not rows:
+        return
+
+    conn, lock = _db()
+    with lock:
+        conn.executemany(
+            "INSERT OR REPLACE INTO items (id, data, fetched_at) VALUES (?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+
+def is_immutable_fresh(entry):
+    """True if the cached title/url/by/time fields can be trusted"""
+    return entry is not None and entry['age'] < IMMUTABLE_TTL
+
+
+def is_volatile_fresh(entry):
+    """True if the cached score/descendants fields can be trusted"""
+    return entry is not None and entry['age'] < VOLATILE_TTL
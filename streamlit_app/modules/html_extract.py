@@ -0,0 +1,160 @@
+"""
+HTML Extraction Module
+Pluggable article text extraction backends for scraped blog pages
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import ParserRejectedMarkup
+import re
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+
+DEFAULT_BACKEND = 'fast'
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ['script', 'style', 'nav', 'footer', 'header', 'aside']
+
+# Common article containers, tried in order by the selector backend
+CONTENT_SELECTORS = [
+    'article',
+    '.post-content',
+    '.entry-content',
+    '.article-content',
+    '.blog-post-content',
+    '.content',
+    'main',
+    '#content',
+    '.post-body'
+]
+
+MIN_CONTENT_LENGTH = 200
+
+# Paragraph text shorter than this is ignored when scoring containers
+MIN_PARAGRAPH_LENGTH = 25
+
+
+def _clean_text(content):
+    """Collapse runs of blank lines and spaces"""
+    if content:
+        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = re.sub(r' {2,}', ' ', content)
+    return content
+
+
+def _make_soup(html, parse_only=None):
+    """Parse with lxml when available, falling back to the stdlib parser"""
+    try:
+        return BeautifulSoup(html, PARSER, parse_only=parse_only)
+    except ParserRejectedMarkup:
+        return BeautifulSoup(html, 'html.parser', parse_only=parse_only)
+
+
+def extract_with_selectors(html):
+    """
+    Selector cascade backend
+
+    Strips boilerplate elements, then tries each of CONTENT_SELECTORS in turn
+    and finally falls back to joining all long paragraphs.
+    """
+    soup = _make_soup(html)
+
+    # Remove script, style, nav, footer elements
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    content = None
+    for selector in CONTENT_SELECTORS:
+        element = soup.select_one(selector)
+        if element:
+            content = element.get_text(separator='\n', strip=True)
+            if len(content) > MIN_CONTENT_LENGTH:
+                break
+
+    # Fallback: get all paragraphs
+    if not content or len(content) < MIN_CONTENT_LENGTH:
+        paragraphs = soup.find_all('p')
+        content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50])
+
+    return _clean_text(content)
+
+
+def extract_fast(html):
+    """
+    Single-pass scoring backend
+
+    Only the <body> subtree is built. One walk over its paragraphs credits
+    each paragraph's text length to its parent (and half to its grandparent);
+    the highest-scoring container is taken as the article. Pages where that
+    yields too little text fall back to the selector cascade.
+    """
+    soup = _make_soup(html, parse_only=SoupStrainer('body'))
+    if not soup.find('p'):
+        # No body element or no paragraphs under it (fragment or odd markup)
+        return extract_with_selectors(html)
+
+    boilerplate = set(BOILERPLATE_TAGS)
+    scores = {}
+    containers = {}
+
+    for paragraph in soup.find_all('p'):
+        parent = paragraph.parent
+        if parent is None:
+            continue
+
+        ancestors = []
+        skip = False
+        node = parent
+        while node is not None and node.name not in ('body', '[document]'):
+            if node.name in boilerplate:
+                skip = True
+                break
+            ancestors.append(node)
+            node = node.parent
+        if skip:
+            continue
+
+        length = len(paragraph.get_text(strip=True))
+        if length < MIN_PARAGRAPH_LENGTH:
+            continue
+
+        for weight, container in zip((1.0, 0.5), ancestors[:2] or [parent]):
+            key = id(container)
+            containers[key] = container
+            scores[key] = scores.get(key, 0) + length * weight
+
+    if not scores:
+        return extract_with_selectors(html)
+
+    best = containers[max(scores, key=scores.get)]
+    for element in best(BOILERPLATE_TAGS):
+        element.decompose()
+
+    content = best.get_text(separator='\n', strip=True)
+    if len(content) < MIN_CONTENT_LENGTH:
+        return extract_with_selectors(html)
+
+    return _clean_text(content)
+
+
+BACKENDS = {
+    'fast': extract_fast,
+    'selectors': extract_with_selectors
+}
+
+
+def extract_article_text(html, backend=None):
+    """
+    Extract the main article text from raw page HTML
+
+    Args:
+        html: Page bytes or string
+        backend: Name of a registered backend (default: DEFAULT_BACKEND)
+
+    Returns:
+        Extracted text, or None/empty if nothing usable was found
+    """
+    return BACKENDS[backend or DEFAULT_BACKEND](html)
@@ -0,0 +1,137 @@
+"""
+HTTP Client Module
+Shared pooled HTTP session used by all scrapers
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_TIMEOUT = 10
+USER_AGENT = 'Mozilla/5.0 (compatible; Paracket/1.0)'
+
+# Number of per-host pools kept alive, and keep-alive connections per host.
+# POOL_MAXSIZE should be at least the largest worker count used against a
+# single host (see fetch_pool) so threads don't open throwaway connections.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 32
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_retry():
+    """Retry idempotent requests on connection errors and throttling/5xx responses"""
+    return Retry(
+        total=3,
+        connect=1,
+        read=2,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def get_session():
+    """Return the process-wide requests.Session, creating it on first use"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': USER_AGENT,
+                    'Accept-Encoding': 'gzip, deflate'
+                })
+
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=_build_retry()
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+
+                _session = session
+
+    return _session
+
+
+def request(method, url, timeout=None, **kwargs):
+    """
+    Send a request through the shared session
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        timeout: Seconds (or (connect, read) tuple); defaults to DEFAULT_TIMEOUT
+        **kwargs: Passed through to requests (headers, params, json, ...)
+
+    Returns:
+        requests.Response
+    """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, **kwargs):
+    """GET through the shared session"""
+    return request('GET', url, **kwargs)
+
+
+def head(url, **kwargs):
+    """HEAD through the shared session"""
+    return request('HEAD', url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST through the shared session (not retried)"""
+    return request('POST', url, **kwargs)
+
+
+def pool_stats():
+    """
+    Report connection reuse for the live per-host pools
+
+    Returns:
+        Dict with totals and a per-host breakdown of requests sent, new
+        connections opened and requests served on a reused connection
+    """
+    hosts = {}
+
+    if _session is not None:
+        adapters = {id(a): a for a in _session.adapters.values()}.values()
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                num_requests = getattr(pool, 'num_requests', 0)
+                num_connections = getattr(pool, 'num_connections', 0)
+                hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    'requests': num_requests,
+                    'connections': num_connections,
+                    'reused': max(num_requests - num_connections, 0)
+                }
+
+    total_requests = sum(h['requests'] for h in hosts.values())
+    total_connections = sum(h['connections'] for h in hosts.values())
+    reused = sum(h['reused'] for h in hosts.values())
+
+    return {
+        'requests': total_requests,
+        'connections': total_connections,
+        'reused': reused,
+        'reuse_ratio': reused / total_requests if total_requests else 0.0,
+        'hosts': hosts
+    }
@@ -0,0 +1,274 @@
+"""
+LLM Cache Module
+Persistent cache of chat completion responses keyed by request hash
+"""
+from array import array
+import hashlib
+import json
+import math
+import os
+import time
+import zlib
+
+from modules.cache_db import get_connection
+
+
+# Cached answers are reused for a week; after that the prompt is re-run
+RESPONSE_TTL = 7 * 24 * 3600
+
+# Total stored size before least-recently-used responses are evicted
+MAX_BYTES = 50 * 1024 * 1024
+
+# Near-duplicate lookup: off unless enabled, since it costs one embedding
+# call per cache miss. Only prompts with the same model and parameters are
+# compared, and only the most recently used ones.
+SEMANTIC_CACHE = os.environ.get('LLM_SEMANTIC_CACHE', '').lower() in ('1', 'true', 'yes')
+EMBEDDING_MODEL = 'text-embedding-3-small'
+SIMILARITY_THRESHOLD = 0.98
+SEMANTIC_SCAN_LIMIT = 500
+# Characters of prompt text sent for embedding (well under the model's limit)
+EMBEDDING_MAX_CHARS = 24000
+
+# cache_size holds the running SUM(size) of responses so put() doesn't
+# rescan the table; it is seeded from responses when first created
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    request_hash TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    response BLOB NOT NULL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    embedding BLOB,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_scope ON responses (scope, accessed_at);
+CREATE TABLE IF NOT EXISTS cache_size (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_size (id, total) SELECT 1, COALESCE(SUM(size), 0) FROM responses;
+"""
+
+
+def _db():
+    return get_connection('llm_responses.sqlite', _SCHEMA)
+
+
+def _total(conn):
+    return conn.execute("SELECT total FROM cache_size WHERE id = 1").fetchone()[0]
+
+
+def _add_to_total(conn, delta):
+    if delta:
+        conn.execute("UPDATE cache_size SET total = total + ? WHERE id = 1", (delta,))
+
+
+def _hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def request_hash(model, messages, temperature, max_tokens, **params):
+    """Cache key for a chat request: hash of model, messages, temperature, max_tokens and extra params"""
+    return _hash([model, messages, temperature, max_tokens, params])
+
+
+def request_scope(model, temperature, max_tokens, **params):
+    """Key grouping requests that differ only in their messages"""
+    return _hash([model, temperature, max_tokens, params])
+
+
+def prompt_text(messages):
+    """Text of a message list as sent for embedding"""
+    text = '\n\n'.join(f"{m.get('role', '')}: {m.get('content', '')}" for m in messages)
+    return text[:EMBEDDING_MAX_CHARS]
+
+
+def _pack(embedding):
+    # Stored unit-length, so similarity is a plain dot product
+    norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+    return array('f', (x / norm for x in embedding)).tobytes()
+
+
+def _unpack(blob):
+    values = array('f')
+    values.frombytes(blob)
+    return values
+
+
+def _touch(conn, key, now):
+    conn.execute("UPDATE responses SET accessed_at = ? WHERE request_hash = ?", (now, key))
+    conn.commit()
+
+
+def get(key):
+    """
+    Look up a fresh cached response
+
+    Returns:
+        Dict with text, prompt_tokens and completion_tokens, or None
+    """
+    conn, lock = _db()
+    now = time.time()
+    with lock:
+        row = conn.execute(
+            "SELECT response, prompt_tokens, completion_tokens, created_at FROM responses WHERE request_hash = ?",
+            (key,)
+        ).fetchone()
+
+        if not row or now - row[3] >= RESPONSE_TTL:
+            return None
+
+        _touch(conn, key, now)
+
+    return {
+        'text': zlib.decompress(row[0]).decode('utf-8'),
+        'prompt_tokens': row[1] or 0,
+        'completion_tokens': row[2] or 0
+    }
+
+
+def find_similar(scope, embedding, threshold=SIMILARITY_THRESHOLD):
+    """
+    Find the cached response whose prompt embedding is closest to `embedding`
+
+    Args:
+        scope: request_scope() of the request (same model and parameters)
+        embedding: Prompt embedding (list of floats)
+        threshold: Minimum cosine similarity
+
+    Returns:
+        Dict like get() plus 'similarity', or None if nothing is close enough
+    """
+    query = _unpack(_pack(embedding))
+    conn, lock = _db()
+    now = time.time()
+
+    with lock:
+        rows = conn.execute(
+            "SELECT request_hash, embedding FROM responses "
+            "WHERE scope = ? AND embedding IS NOT NULL AND created_at > ? "
+            "ORDER BY accessed_at DESC LIMIT ?",
+            (scope, now - RESPONSE_TTL, SEMANTIC_SCAN_LIMIT)
+        ).fetchall()
+
+    best_hash, best_similarity = None, threshold
+    for candidate_hash, blob in rows:
+        candidate = _unpack(blob)
+        if len(candidate) != len(query):
+            continue
+        similarity = sum(a * b for a, b in zip(query, candidate))
+        if similarity >= best_similarity:
+            best_hash, best_similarity = candidate_hash, similarity
+
+    if best_hash is None:
+        return None
+
+    cached = get(best_hash)
+    if cached:
+        cached['similarity'] = best_similarity
+    return cached
+
+
+def put(key, scope, text, prompt_tokens=0, completion_tokens=0, embedding=None):
+    """
+    Store a response
+
+    Args:
+        key: request_hash() of the request
+        scope: request_scope() of the request
+        text: Response text
+        prompt_tokens: Prompt tokens the original call used
+        completion_tokens: Completion tokens the original call used
+        embedding: Optional prompt embedding for find_similar(); when omitted
+            an embedding already stored for `key` is kept
+    """
+    compressed = zlib.compress(text.encode('utf-8'))
+    packed = _pack(embedding) if embedding else None
+    now = time.time()
+
+    conn, lock = _db()
+    with lock:
+        previous = conn.execute(
+            "SELECT size, LENGTH(embedding) FROM responses WHERE request_hash = ?", (key,)
+        ).fetchone()
+        previous_size, kept_embedding = previous if previous else (0, None)
+        size = len(compressed) + len(packed if packed else b'') + (0 if packed else kept_embedding or 0)
+
+        conn.execute(
+            "INSERT INTO responses (request_hash, scope, response, prompt_tokens, completion_tokens, "
+            "embedding, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(request_hash) DO UPDATE SET scope = excluded.scope, response = excluded.response, "
+            "prompt_tokens = excluded.prompt_tokens, completion_tokens = excluded.completion_tokens, "
+            "embedding = COALESCE(excluded.embedding, embedding), size = excluded.size, "
+            "created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+            (key, scope, compressed, prompt_tokens, completion_tokens, packed, size, now, now)
+        )
+        _add_to_total(conn, size - previous_size)
+
+        if _total(conn) > MAX_BYTES:
+            _evict(conn, MAX_BYTES)
+        conn.commit()
+
+
+def _evict(conn, max_bytes):
+    # Caller holds the lock and commits
+    cutoff = time.time() - RESPONSE_TTL
+    expired_size, expired = conn.execute(
+        "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses WHERE created_at <= ?", (cutoff,)
+    ).fetchone()
+    if expired:
+        conn.execute("DELETE FROM responses WHERE created_at <= ?", (cutoff,))
+        _add_to_total(conn, -expired_size)
+
+    total = _total(conn)
+    evicted = []
+    if total > max_bytes:
+        freed = 0
+        for key, size in conn.execute("SELECT request_hash, size FROM responses ORDER BY accessed_at"):
+            if total - freed <= max_bytes:
+                break
+            evicted.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM responses WHERE request_hash = ?", evicted)
+        _add_to_total(conn, -freed)
+
+    return expired + len(evicted)
+
+
+def evict(max_bytes=None):
+    """
+    Drop expired responses, then least-recently-used ones until the cache fits in max_bytes
+
+    Returns:
+        Number of responses evicted
+    """
+    if max_bytes is None:
+        max_bytes = MAX_BYTES
+
+    conn, lock = _db()
+    with lock:
+        evicted = _evict(conn, max_bytes)
+        conn.commit()
+
+    return evicted
+
+
+def clear():
+    """Remove every cached response"""
+    conn, lock = _db()
+    with lock:
+        conn.execute("DELETE FROM responses")
+        conn.execute("UPDATE cache_size SET total = 0 WHERE id = 1")
+        conn.commit()
+
+
+def stats():
+    """Return response count and total stored bytes"""
+    conn, lock = _db()
+    with lock:
+        responses = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = _total(conn)
+    return {'responses': responses, 'bytes': total, 'max_bytes': MAX_BYTES}
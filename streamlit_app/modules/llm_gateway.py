@@ -0,0 +1,539 @@
+"""
+LLM Gateway Module
+Shared OpenAI clients, retries and call accounting for every LLM call
+"""
+from collections import deque
+from datetime import datetime
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+from openai import APIConnectionError, APIStatusError, OpenAI, RateLimitError
+
+from modules import llm_cache
+
+
+DEFAULT_MODEL = 'gpt-4o'
+
+# Retries after the first attempt for 429s, 5xx and dropped connections
+MAX_RETRIES = 4
+# Full-jitter exponential backoff: sleep uniform(0, min(cap, base * 2**attempt))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# Number of recent calls kept for call_stats()/recent_calls()
+CALL_HISTORY = 500
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def resolve_api_key(api_key=None):
+    """Return api_key, falling back to OPENAI_API_KEY; raises ValueError if neither is set"""
+    api_key = api_key or os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("Missing OPENAI_API_KEY")
+    return api_key
+
+
+def get_client(api_key=None):
+    """
+    Shared OpenAI client for an API key (one per key per process)
+
+    Reusing the client keeps its HTTP connection pool warm between calls.
+    The SDK's own retries are disabled; chat() handles retrying.
+    """
+    api_key = resolve_api_key(api_key)
+    key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = OpenAI(api_key=api_key, max_retries=0)
+        return _clients[key]
+
+
+class LLMResponse:
+    """Text and accounting for one completed chat call"""
+
+    __slots__ = ('text', 'model', 'latency', 'attempts',
+                 'prompt_tokens', 'completion_tokens', 'total_tokens', 'cached')
+
+    def __init__(self, text, model, latency, attempts,
+                 prompt_tokens=0, completion_tokens=0, total_tokens=0, cached=False):
+        self.text = text
+        self.model = model
+        self.latency = latency
+        self.attempts = attempts
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.total_tokens = total_tokens
+        # True when served from llm_cache; token counts are then 0 (nothing spent)
+        self.cached = cached
+
+
+_calls = deque(maxlen=CALL_HISTORY)
+_calls_lock = threading.Lock()
+
+
+def _record_call(label, model, latency, attempts, usage=None, error=None, cached=False, ttft=None):
+    record = {
+        'label': label,
+        'model': model,
+        'latency': latency,
+        'ttft': ttft,
+        'attempts': attempts,
+        'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+        'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+        'total_tokens': getattr(usage, 'total_tokens', 0) or 0,
+        'success': error is None,
+        'error': error,
+        'cached': cached,
+        'at': datetime.now().isoformat()
+    }
+    with _calls_lock:
+        _calls.append(record)
+    return record
+
+
+def recent_calls(n=None):
+    """The most recent call records, oldest first"""
+    with _calls_lock:
+        calls = list(_calls)
+    return calls[-n:] if n else calls
+
+
+def call_stats():
+    """
+    Totals over the recorded call history
+
+    Returns:
+        Dict with calls, cache_hits, failures, retries, token totals, total
+        and average latency, streamed calls with their average time to first
+        token, plus the same totals per label under 'by_label'
+    """
+    def empty():
+        return {'calls': 0, 'cache_hits': 0, 'failures': 0, 'retries': 0, 'prompt_tokens': 0,
+                'completion_tokens': 0, 'total_tokens': 0, 'latency': 0.0,
+                'streamed': 0, 'ttft': 0.0}
+
+    totals = empty()
+    by_label = {}
+
+    for call in recent_calls():
+        for stats in (totals, by_label.setdefault(call['label'], empty())):
+            stats['calls'] += 1
+            stats['cache_hits'] += 1 if call['cached'] else 0
+            stats['failures'] += 0 if call['success'] else 1
+            stats['retries'] += max(call['attempts'] - 1, 0)
+            stats['prompt_tokens'] += call['prompt_tokens']
+            stats['completion_tokens'] += call['completion_tokens']
+            stats['total_tokens'] += call['total_tokens']
+            stats['latency'] += call['latency']
+            if call['ttft'] is not None:
+                stats['streamed'] += 1
+                stats['ttft'] += call['ttft']
+
+    for stats in [totals] + list(by_label.values()):
+        stats['avg_latency'] = stats['latency'] / stats['calls'] if stats['calls'] else 0.0
+        stats['avg_ttft'] = stats['ttft'] / stats['streamed'] if stats['streamed'] else 0.0
+
+    totals['by_label'] = by_label
+    return totals
+
+
+def reset_stats():
+    """Forget the recorded call history"""
+    with _calls_lock:
+        _calls.clear()
+
+
+def _is_retryable(error):
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retry number `attempt` (0-based)"""
+    # Honour the server's hint on 429s when it gives one
+    response = getattr(error, 'response', None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get('retry-after'))
+            if 0 < retry_after <= BACKOFF_MAX:
+                return retry_after
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _describe(error):
+    status = getattr(error, 'status_code', None)
+    return f"{type(error).__name__} ({status})" if status else type(error).__name__
+
+
+def _embed(client, messages):
+    """Prompt embedding for the semantic cache, or None if the call fails"""
+    try:
+        response = client.embeddings.create(
+            model=llm_cache.EMBEDDING_MODEL,
+            input=llm_cache.prompt_text(messages)
+        )
+        return response.data[0].embedding
+    except Exception as e:
+        print(f"  ⚠ Could not embed prompt for cache lookup: {e}")
+        return None
+
+
+def _cached_response(client, messages, cache_key, scope, semantic):
+    """
+    Look up a cached answer by exact request hash, then (if semantic) by
+    prompt similarity
+
+    Returns:
+        (cached dict or None, prompt embedding or None)
+    """
+    try:
+        cached = llm_cache.get(cache_key)
+        if cached:
+            return cached, None
+
+        if not semantic:
+            return None, None
+
+        embedding = _embed(client, messages)
+        if embedding is None:
+            return None, None
+        return llm_cache.find_similar(scope, embedding), embedding
+    except Exception as e:
+        print(f"  ⚠ LLM cache lookup failed: {e}")
+        return None, None
+
+
+def _cache_keys(model, messages, temperature, max_tokens, label, cache_scope, params):
+    cache_key = llm_cache.request_hash(model, messages, temperature, max_tokens, **params)
+    scope = llm_cache.request_scope(model, temperature, max_tokens, cache_scope=cache_scope, label=label, **params)
+    return cache_key, scope
+
+
+def _report_cache_hit(cached):
+    match = f"similar prompt, {cached['similarity']:.3f}" if 'similarity' in cached else "exact match"
+    print(f"  ℹ️ Using cached response ({match})")
+
+
+def _store_response(cache_key, scope, text, record, embedding):
+    if not text:
+        return
+    try:
+        llm_cache.put(cache_key, scope, text, record['prompt_tokens'],
+                      record['completion_tokens'], embedding=embedding)
+    except Exception as e:
+        print(f"  ⚠ Could not cache LLM response: {e}")
+
+
+def _create_with_retry(client, label, start, max_retries, **create_kwargs):
+    """
+    Call chat.completions.create, retrying retryable errors with backoff
+
+    Returns:
+        (response, attempts)
+    """
+    attempt = 0
+
+    while True:
+        try:
+            return client.chat.completions.create(**create_kwargs), attempt + 1
+        except Exception as e:
+            if not _is_retryable(e) or attempt >= max_retries:
+                _record_call(label, create_kwargs['model'], time.time() - start, attempt + 1, error=str(e))
+                raise
+            delay = _retry_delay(e, attempt)
+            attempt += 1
+            print(f"  ⚠ OpenAI {_describe(e)}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{max_retries + 1})")
+            time.sleep(delay)
+
+
+def chat(messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=None,
+         api_key=None, label=None, max_retries=MAX_RETRIES,
+         allow_cached=False, semantic=None, cache_scope=None, **kwargs):
+    """
+    Run a chat completion through the shared client
+
+    Rate limits (429), server errors (5xx) and connection failures are
+    retried with jittered exponential backoff. Every call is recorded with
+    its latency and token usage (see call_stats()).
+
+    Every response is stored in llm_cache. With allow_cached=True a stored
+    answer to the identical request (same model, messages, temperature,
+    max_tokens and extra params) is returned instead of calling the API.
+    With semantic lookup on, a stored answer to a near-identical prompt is
+    accepted too.
+
+    Args:
+        messages: Chat messages list
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Completion token limit (None for the model default)
+        api_key: OpenAI API key (falls back to OPENAI_API_KEY)
+        label: Name the call is recorded under (e.g. the calling function)
+        max_retries: Retries after the first attempt
+        allow_cached: Serve a cached response if there is one
+        semantic: Also match near-identical prompts by embedding
+            (None: llm_cache.SEMANTIC_CACHE)
+        cache_scope: Extra key that near-identical prompts must share to
+            match (e.g. the target platform, when prompts differ only in it)
+        **kwargs: Passed through to chat.completions.create (e.g. response_format)
+
+    Returns:
+        LLMResponse
+
+    Raises:
+        The last OpenAI error once retries are exhausted, or any
+        non-retryable error straight away
+    """
+    client = get_client(api_key)
+    label = label or model
+
+    if semantic is None:
+        semantic = llm_cache.SEMANTIC_CACHE
+
+    cache_key, scope = _cache_keys(model, messages, temperature, max_tokens, label, cache_scope, kwargs)
+    embedding = None
+
+    start = time.time()
+
+    if allow_cached:
+        cached, embedding = _cached_response(client, messages, cache_key, scope, semantic)
+        if cached:
+            latency = time.time() - start
+            _record_call(label, model, latency, 0, cached=True)
+            _report_cache_hit(cached)
+            return LLMResponse(
+                text=cached['text'],
+                model=model,
+                latency=latency,
+                attempts=0,
+                cached=True
+            )
+
+    params = dict(kwargs)
+    if max_tokens is not None:
+        params['max_tokens'] = max_tokens
+
+    response, attempts = _create_with_retry(
+        client, label, start, max_retries,
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        **params
+    )
+
+    latency = time.time() - start
+    usage = getattr(response, 'usage', None)
+    record = _record_call(label, model, latency, attempts, usage=usage)
+    text = response.choices[0].message.content or ''
+
+    _store_response(cache_key, scope, text, record, embedding)
+
+    return LLMResponse(
+        text=text,
+        model=model,
+        latency=latency,
+        attempts=attempts,
+        prompt_tokens=record['prompt_tokens'],
+        completion_tokens=record['completion_tokens'],
+        total_tokens=record['total_tokens']
+    )
+
+
+# Error recorded for a stream whose consumer stopped reading it
+STREAM_ABORTED = 'Stream closed before the response finished'
+
+
+class LLMStream:
+    """
+    Text chunks of a streamed chat completion, as they arrive
+
+    Nothing is requested until the stream is iterated (e.g. by
+    st.write_stream). Once iteration ends, text, ttft (seconds to the first
+    token), latency and token counts are filled in, and result holds
+    on_complete(text), or {'error': ..., 'success': False} if the call
+    failed. Errors end the iteration instead of propagating, so a
+    half-rendered stream doesn't take the page down with it. Closing the
+    iteration early (e.g. a Streamlit rerun) closes the HTTP stream and
+    records the call as aborted.
+    """
+
+    def __init__(self, client, messages, model, temperature, max_tokens, label,
+                 max_retries, allow_cached, semantic, cache_scope, on_complete, params):
+        self._client = client
+        self._messages = messages
+        self._temperature = temperature
+        self._max_tokens = max_tokens
+        self._label = label
+        self._max_retries = max_retries
+        self._allow_cached = allow_cached
+        self._semantic = semantic
+        self._cache_scope = cache_scope
+        self._on_complete = on_complete
+        self._params = params
+
+        self.model = model
+        self.text = ''
+        self.ttft = None
+        self.latency = None
+        self.attempts = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.cached = False
+        self.error = None
+        self.result = None
+
+    def __iter__(self):
+        try:
+            yield from self._stream()
+        except Exception as e:
+            self.error = str(e)
+            print(f"✗ Error: {e}")
+            self.result = {'error': str(e), 'success': False}
+            return
+        except GeneratorExit:
+            self.error = STREAM_ABORTED
+            self.result = {'error': STREAM_ABORTED, 'success': False}
+            raise
+
+        self.result = self._on_complete(self.text) if self._on_complete else None
+
+    def _stream(self):
+        cache_key, scope = _cache_keys(self.model, self._messages, self._temperature, self._max_tokens,
+                                       self._label, self._cache_scope, self._params)
+        embedding = None
+        start = time.time()
+
+        if self._allow_cached:
+            cached, embedding = _cached_response(self._client, self._messages, cache_key, scope, self._semantic)
+            if cached:
+                self.text = cached['text']
+                self.cached = True
+                self.ttft = self.latency = time.time() - start
+                _record_call(self._label, self.model, self.latency, 0, cached=True, ttft=self.ttft)
+                _report_cache_hit(cached)
+                yield self.text
+                return
+
+        params = dict(self._params)
+        if self._max_tokens is not None:
+            params['max_tokens'] = self._max_tokens
+
+        # Retries only cover opening the stream; once tokens have been shown
+        # a failure ends the stream rather than starting the answer over
+        response, self.attempts = _create_with_retry(
+            self._client, self._label, start, self._max_retries,
+            model=self.model,
+            messages=self._messages,
+            temperature=self._temperature,
+            stream=True,
+            stream_options={'include_usage': True},
+            **params
+        )
+
+        chunks = []
+        usage = None
+        # Stays set unless the loop finishes; GeneratorExit bypasses except
+        error = STREAM_ABORTED
+        try:
+            for chunk in response:
+                # The final chunk carries usage and no choices
+                if getattr(chunk, 'usage', None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if self.ttft is None:
+                    self.ttft = time.time() - start
+                chunks.append(delta)
+                self.text = ''.join(chunks)
+                yield delta
+            error = None
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            response.close()
+            if error:
+                _record_call(self._label, self.model, time.time() - start, self.attempts,
+                             error=error, ttft=self.ttft)
+
+        self.latency = time.time() - start
+        record = _record_call(self._label, self.model, self.latency, self.attempts,
+                              usage=usage, ttft=self.ttft)
+        self.prompt_tokens = record['prompt_tokens']
+        self.completion_tokens = record['completion_tokens']
+        self.total_tokens = record['total_tokens']
+
+        _store_response(cache_key, scope, self.text, record, embedding)
+
+
+def chat_stream(messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=None,
+                api_key=None, label=None, max_retries=MAX_RETRIES,
+                allow_cached=False, semantic=None, cache_scope=None,
+                on_complete=None, **kwargs):
+    """
+    Streaming counterpart of chat()
+
+    Takes the same arguments as chat(), plus on_complete: a function of
+    the full response text whose return value is kept as the stream's
+    `result`. Time to first token and total latency are recorded with the
+    call (see call_stats()). A cache hit is yielded as a single chunk.
+
+    Returns:
+        LLMStream (iterate it to run the request)
+    """
+    client = get_client(api_key)
+    if semantic is None:
+        semantic = llm_cache.SEMANTIC_CACHE
+
+    return LLMStream(
+        client, messages, model, temperature, max_tokens, label or model,
+        max_retries, allow_cached, semantic, cache_scope, on_complete, dict(kwargs)
+    )
+
+
+def parse_json_response(response_text):
+    """
+    Extract a JSON object from a model response
+
+    Strips markdown code fences and any text around the outermost braces.
+
+    Returns:
+        The parsed dict, or {'raw_analysis': ..., 'error': ...} if no valid
+        JSON could be found
+    """
+    try:
+        # Remove markdown code blocks if present
+        if '```json' in response_text:
+            response_text = response_text.split('```json')[1].split('```')[0]
+        elif '```' in response_text:
+            response_text = response_text.split('```')[1].split('```')[0]
+
+        # Try to find JSON in the response
+        response_text = response_text.strip()
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+
+        if start_idx != -1 and end_idx > start_idx:
+            return json.loads(response_text[start_idx:end_idx])
+        raise ValueError("No JSON found in response")
+    except Exception as e:
+        print(f"Warning: Could not parse JSON: {e}")
+        return {
+            "raw_analysis": response_text,
+            "error": f"Could not parse structured JSON: {str(e)}"
+        }
@@ -0,0 +1,99 @@
+"""
+Log Capture Module
+Per-thread capture of print() output from scraper functions
+"""
+from contextlib import contextmanager
+import io
+import sys
+import threading
+
+
+class _ThreadRoutingStream(io.TextIOBase):
+    """
+    Stand-in for sys.stdout that routes writes by thread
+
+    Threads inside capture_output() write to their own buffer; every other
+    thread writes to the stream that was active when the router was
+    installed. This replaces the swap-sys.stdout-around-each-call pattern,
+    which breaks as soon as two scrapers run at the same time.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, 'buffer', None) or self.default
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+    def writable(self):
+        return True
+
+    @property
+    def encoding(self):
+        return getattr(self.default, 'encoding', 'utf-8')
+
+
+_install_lock = threading.Lock()
+
+
+def _router():
+    """Install the routing stream as sys.stdout if it is not already"""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadRoutingStream):
+            sys.stdout = _ThreadRoutingStream(sys.stdout)
+        return sys.stdout
+
+
+def current_buffer():
+    """Return the capture buffer of the calling thread, or None"""
+    stream = sys.stdout
+    if isinstance(stream, _ThreadRoutingStream):
+        return getattr(stream._local, 'buffer', None)
+    return None
+
+
+@contextmanager
+def capture_output(buffer=None):
+    """
+    Capture print() output of the current thread
+
+    Args:
+        buffer: Existing text buffer to append to (default: a new StringIO)
+
+    Yields:
+        The buffer receiving this thread's output
+    """
+    router = _router()
+    if buffer is None:
+        buffer = io.StringIO()
+
+    previous = getattr(router._local, 'buffer', None)
+    router._local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        router._local.buffer = previous
+
+
+def propagate(fn):
+    """
+    Wrap fn so it logs to the calling thread's capture buffer
+
+    Use when handing work to a thread pool, so output from worker threads
+    ends up in the same log as the code that submitted it.
+    """
+    buffer = current_buffer()
+    if buffer is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        with capture_output(buffer):
+            return fn(*args, **kwargs)
+
+    return wrapper
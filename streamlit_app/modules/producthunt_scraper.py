@@ -7,6 +7,10 @@ import requests
 import re
 from datetime import datetime, timedelta
 
+from modules import http_client
+from modules.topic_matcher import TopicMatcher
+from modules.trend_scoring import score_trend, top_k
+
 def scrape_producthunt_trends(company, limit=20, credentials=None):
     """
     Scrape trending topics about a company from Product Hunt
@@ -26,14 +30,18 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
 
     trends = []
 
+    main_topics = []
+    if credentials and 'brand_voice' in credentials:
+        main_topics = credentials['brand_voice'].get('main_topics', [])
+    matcher = TopicMatcher(company, main_topics)
+
     # Product Hunt GraphQL API endpoint
     api_url = "https://api.producthunt.com/v2/api/graphql"
 
     # Set up headers
     headers = {
         'Accept': 'application/json',
-        'Content-Type': 'application/json',
-        'User-Agent': 'paracket/1.0'
+        'Content-Type': 'application/json'
     }
 
     # Add auth token if provided
@@ -77,18 +85,17 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
                 "search_query": company
             }
 
-            response = requests.post(
+            response = http_client.post(
                 api_url,
                 json={'query': query, 'variables': variables},
-                headers=headers,
-                timeout=10
+                headers=headers
             )
 
             if response.status_code == 200:
                 data = response.json()
                 posts = data.get('data', {}).get('posts', {}).get('edges', [])
 
-                for post_edge in posts[:limit]:
+                for post_edge in posts:  # All 50; results are ranked below
                     post = post_edge.get('node', {})
 
                     topics_list = []
@@ -106,7 +113,10 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
                         'comments': post.get('commentsCount', 0),
                         'created_at': post.get('createdAt', ''),
                         'topics': topics_list,
-                        'source': 'producthunt'
+                        'source': 'producthunt',
+                        'matched_topics': matcher.matched_topics(
+                            post.get('name', ''), post.get('tagline', ''), ' '.join(topics_list)
+                        )
                     })
 
                 print(f"Found {len(trends)} matching posts via authenticated search")
@@ -119,11 +129,7 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
 
             print(f"Fetching public featured posts...")
 
-            response = requests.get(
-                public_url,
-                headers={'User-Agent': 'Mozilla/5.0 (compatible; paracket/1.0)'},
-                timeout=10
-            )
+            response = http_client.get(public_url)
 
             if response.status_code == 200:
                 # Use simple text parsing to extract product information
@@ -136,11 +142,8 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
                 products = re.findall(pattern, content)
 
                 # Check if any products are relevant to the company
-                company_lower = company.lower()
-                company_pattern = r'\b' + re.escape(company_lower) + r'\b'
-
                 for product_name in products[:30]:  # Check top 30 products
-                    if re.search(company_pattern, product_name.lower()):
+                    if matcher.mentions_company(product_name):
                         trends.append({
                             'title': product_name,
                             'description': 'Featured on Product Hunt',
@@ -154,9 +157,6 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
 
         # If we have brand voice data in credentials, try topic-based matching
         if len(trends) < 5 and credentials and 'brand_voice' in credentials:
-            brand_voice = credentials['brand_voice']
-            main_topics = brand_voice.get('main_topics', [])
-
             if main_topics:
                 print(f"Trying topic-based search with brand topics: {main_topics[:3]}")
 
@@ -182,11 +182,10 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
 
                         variables = {"search_query": topic}
 
-                        response = requests.post(
+                        response = http_client.post(
                             api_url,
                             json={'query': query, 'variables': variables},
-                            headers=headers,
-                            timeout=10
+                            headers=headers
                         )
 
                         if response.status_code == 200:
@@ -216,7 +215,17 @@ def scrape_producthunt_trends(company, limit=20, credentials=None):
                 seen_titles.add(title)
                 unique_trends.append(trend)
 
-        trends = unique_trends[:limit]
+        # Keep the best `limit` products by relevance score
+        for trend in unique_trends:
+            trend['relevance_score'] = round(score_trend(
+                text=f"{trend.get('title') or ''} {trend.get('description') or ''}",
+                source='producthunt',
+                engagement=trend.get('votes', 0),
+                num_comments=trend.get('comments', 0),
+                date=trend.get('created_at'),
+                matcher=matcher
+            ), 3)
+        trends = top_k(unique_trends, limit, key=lambda trend: trend['relevance_score'])
 
         print(f"\nTotal unique trends found: {len(trends)}")
 
@@ -0,0 +1,243 @@
+"""
+Rate Scheduler Module
+Token-bucket pacing for the Reddit and YouTube Data APIs
+"""
+from datetime import datetime, timedelta, timezone
+import hashlib
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, bursts up to `capacity`
+
+    acquire() blocks until enough tokens are available. The rate can be
+    changed at any time (e.g. from rate-limit response headers). Safe to
+    share between threads.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate, capacity=None):
+        """Change the refill rate (and optionally the burst size)"""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+                self._tokens = min(self._tokens, capacity)
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping until they are available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                if self.rate <= 0:
+                    delay = 1.0
+                else:
+                    delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+# Reddit OAuth clients get 100 requests/minute, counted in 10-minute windows
+REDDIT_WINDOW_SECONDS = 600
+REDDIT_DEFAULT_RATE = 100 / 60
+# Requests left unspent at the end of each window, as a safety margin
+REDDIT_RESERVE = 5
+
+
+class RedditRateScheduler:
+    """
+    Paces PRAW listing iteration to Reddit's X-Ratelimit budget
+
+    PRAW records the X-Ratelimit-Remaining/Used headers of each response in
+    `reddit.auth.limits`. Call step() once per item pulled from a listing:
+    when the 'used' counter shows that a new request went out, the bucket
+    rate is reset to the remaining budget spread over the rest of the
+    window and one token is taken. Items served from an already fetched
+    page cost nothing, so the scan runs as fast as the quota allows.
+    """
+
+    def __init__(self, reddit, reserve=REDDIT_RESERVE):
+        self.reddit = reddit
+        self.reserve = reserve
+        self.bucket = TokenBucket(REDDIT_DEFAULT_RATE, capacity=10)
+        self._last_used = None
+        self.requests = 0
+        self.waited = 0.0
+
+    def _limits(self):
+        try:
+            return self.reddit.auth.limits
+        except Exception:
+            return {}
+
+    def _seconds_to_reset(self, limits):
+        reset = limits.get('reset_timestamp')
+        now = time.time()
+        if reset:
+            return max(reset - now, 1.0)
+        # Windows are aligned to the clock
+        return max(REDDIT_WINDOW_SECONDS - now % REDDIT_WINDOW_SECONDS, 1.0)
+
+    def step(self):
+        """Call after taking each item from a PRAW listing"""
+        limits = self._limits()
+        used = limits.get('used')
+        remaining = limits.get('remaining')
+
+        if used is None or used == self._last_used:
+            return
+        self._last_used = used
+        self.requests += 1
+
+        if remaining is not None:
+            window = self._seconds_to_reset(limits)
+            budget = remaining - self.reserve
+            if budget <= 0:
+                print(f"  Reddit rate limit nearly spent, waiting {window:.0f}s for reset...")
+                time.sleep(window)
+                self.waited += window
+                return
+            self.bucket.set_rate(budget / window)
+
+        self.waited += self.bucket.acquire()
+
+    def iterate(self, listing):
+        """Yield items from a PRAW listing, pacing each underlying request"""
+        for item in listing:
+            yield item
+            self.step()
+
+
+# YouTube Data API v3 quota: units per call, 10,000 units per key per day
+YOUTUBE_QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+    'channels.list': 1,
+    'playlistItems.list': 1
+}
+YOUTUBE_DEFAULT_COST = 1
+YOUTUBE_DAILY_QUOTA = 10000
+# Short-term pacing so a burst of calls doesn't trip per-minute limits
+YOUTUBE_UNITS_PER_SECOND = 50
+
+
+class QuotaExceededError(Exception):
+    """Raised when a YouTube call would exceed the remaining daily quota"""
+
+
+def _youtube_quota_day():
+    """Quota days reset at midnight Pacific time (UTC-8, ignoring DST)"""
+    return (datetime.now(timezone.utc) - timedelta(hours=8)).date()
+
+
+class QuotaUsage:
+    """
+    Units charged to one scrape run
+
+    The YouTubeQuota for a key is shared by every run in the process, so
+    the difference in its `used` counter would include concurrent runs.
+    Pass a QuotaUsage to YouTubeQuota.execute() to count a run's own calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.units = 0
+        self.calls = {}
+
+    def add(self, call_type, cost):
+        with self._lock:
+            self.units += cost
+            self.calls[call_type] = self.calls.get(call_type, 0) + 1
+
+
+class YouTubeQuota:
+    """
+    Tracks YouTube Data API quota units for one API key
+
+    execute(request, call_type) charges the call's unit cost against the
+    daily quota and a per-second token bucket before running it. A call
+    that would overrun the day's quota raises QuotaExceededError up front
+    instead of failing mid-analysis with a 403.
+    """
+
+    def __init__(self, daily_quota=YOUTUBE_DAILY_QUOTA, units_per_second=YOUTUBE_UNITS_PER_SECOND):
+        self.daily_quota = daily_quota
+        self.bucket = TokenBucket(units_per_second, capacity=max(units_per_second, max(YOUTUBE_QUOTA_COSTS.values())))
+        self._lock = threading.Lock()
+        self._day = _youtube_quota_day()
+        self.used = 0
+        self.calls = {}
+
+    def remaining(self):
+        """Units left today (as far as this process has used them)"""
+        with self._lock:
+            self._roll_day()
+            return self.daily_quota - self.used
+
+    def _roll_day(self):
+        today = _youtube_quota_day()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+            self.calls = {}
+
+    def charge(self, call_type):
+        """Reserve quota for one call; raises QuotaExceededError if it doesn't fit"""
+        cost = YOUTUBE_QUOTA_COSTS.get(call_type, YOUTUBE_DEFAULT_COST)
+        with self._lock:
+            self._roll_day()
+            if self.used + cost > self.daily_quota:
+                raise QuotaExceededError(
+                    f"YouTube quota exhausted: {call_type} needs {cost} units, "
+                    f"{self.daily_quota - self.used} left today"
+                )
+            self.used += cost
+            self.calls[call_type] = self.calls.get(call_type, 0) + 1
+
+        self.bucket.acquire(cost)
+        return cost
+
+    def execute(self, request, call_type, usage=None):
+        """Charge quota for call_type (also to `usage` if given), then run request.execute()"""
+        cost = self.charge(call_type)
+        if usage is not None:
+            usage.add(call_type, cost)
+        try:
+            return request.execute()
+        except Exception as e:
+            # The API's own verdict wins over our estimate
+            if 'quotaExceeded' in str(e) or 'dailyLimitExceeded' in str(e):
+                with self._lock:
+                    self.used = self.daily_quota
+            raise
+
+
+_youtube_quotas = {}
+_youtube_quotas_lock = threading.Lock()
+
+
+def youtube_quota(api_key):
+    """Shared YouTubeQuota for an API key (one per key per process)"""
+    key = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()
+    with _youtube_quotas_lock:
+        if key not in _youtube_quotas:
+            _youtube_quotas[key] = YouTubeQuota()
+        return _youtube_quotas[key]
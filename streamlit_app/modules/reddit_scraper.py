@@ -4,16 +4,24 @@ Refactored from reddit_scraper_api.py for Streamlit integration
 """
 import praw
 from datetime import datetime
-import time
 import os
-import re
 import json
 import glob
 
+from modules.rate_scheduler import RedditRateScheduler
+from modules.sample_store import SampleStore
+from modules.topic_matcher import TopicMatcher
+from modules.trend_scoring import TopK, score_sample
 
-def scrape_official_user(reddit, username, limit):
+
+# Subreddits per combined 'a+b+c' listing in the trend scan
+MULTIREDDIT_BATCH_SIZE = 10
+
+
+def scrape_official_user(reddit, username, limit, scheduler=None):
     """Scrape from official user account"""
     samples = []
+    scheduler = scheduler or RedditRateScheduler(reddit)
 
     try:
         user = reddit.redditor(username)
@@ -23,7 +31,7 @@ def scrape_official_user(reddit, username, limit):
 
         # Get ALL submissions (posts)
         print(f"  Getting posts from u/{username}...")
-        for submission in user.submissions.new(limit=None):
+        for submission in scheduler.iterate(user.submissions.new(limit=None)):
             sample = {
                 'text': f"{submission.title}\n\n{submission.selftext}" if submission.selftext else submission.title,
                 'source': 'reddit',
@@ -44,14 +52,12 @@ def scrape_official_user(reddit, username, limit):
             if len(samples) >= limit:
                 break
 
-            time.sleep(0.05)
-
         print(f"  Got {len(samples)} posts")
 
         # Get ALL comments if still need more
         if len(samples) < limit:
             print(f"  Getting comments from u/{username}...")
-            for comment in user.comments.new(limit=None):
+            for comment in scheduler.iterate(user.comments.new(limit=None)):
                 if len(comment.body) >= 30:
                     sample = {
                         'text': comment.body,
@@ -72,8 +78,6 @@ def scrape_official_user(reddit, username, limit):
                     if len(samples) >= limit:
                         break
 
-                    time.sleep(0.05)
-
             print(f"  Got {len(samples)} total (posts + comments)")
 
         return samples
@@ -83,9 +87,10 @@ def scrape_official_user(reddit, username, limit):
         return []
 
 
-def scrape_official_subreddit(reddit, subreddit_name, limit):
+def scrape_official_subreddit(reddit, subreddit_name, limit, scheduler=None):
     """Scrape from official subreddit"""
-    samples = []
+    samples = SampleStore()
+    scheduler = scheduler or RedditRateScheduler(reddit)
 
     try:
         subreddit = reddit.subreddit(subreddit_name)
@@ -106,7 +111,7 @@ def scrape_official_subreddit(reddit, subreddit_name, limit):
             else:
                 posts = subreddit.top(time_filter='all', limit=200)
 
-            for submission in posts:
+            for submission in scheduler.iterate(posts):
                 if submission.stickied:
                     continue
 
@@ -115,14 +120,15 @@ def scrape_official_subreddit(reddit, subreddit_name, limit):
                 if len(text) < 30:
                     continue
 
-                if any(s['url'] == f"https://reddit.com{submission.permalink}" for s in samples):
+                url = f"https://reddit.com{submission.permalink}"
+                if url in samples:
                     continue
 
                 sample = {
                     'text': text,
                     'source': 'reddit',
                     'date': datetime.fromtimestamp(submission.created_utc).isoformat(),
-                    'url': f"https://reddit.com{submission.permalink}",
+                    'url': url,
                     'metadata': {
                         'platform_type': 'social',
                         'author': str(submission.author) if submission.author else '[deleted]',
@@ -133,30 +139,30 @@ def scrape_official_subreddit(reddit, subreddit_name, limit):
                         'source_type': 'official_subreddit'
                     }
                 }
-                samples.append(sample)
+                samples.add(sample)
 
                 if len(samples) >= limit:
                     break
 
-                time.sleep(0.05)
-
         print(f"  Got {len(samples)} posts from r/{subreddit_name}")
-        return samples
+        return samples.samples()
 
     except Exception as e:
         print(f"Could not scrape r/{subreddit_name}: {e}")
         return []
 
 
-def scrape_fallback(reddit, company, limit):
+def scrape_fallback(reddit, company, limit, scheduler=None):
     """Aggressive fallback to get samples"""
-    samples = []
+    samples = SampleStore()
+    scheduler = scheduler or RedditRateScheduler(reddit)
 
     print(f"⚠️ Using fallback mode (mentions)")
 
-    for submission in reddit.subreddit('all').search(company, limit=300, sort='relevance', time_filter='all'):
+    listing = reddit.subreddit('all').search(company, limit=300, sort='relevance', time_filter='all')
+    for submission in scheduler.iterate(listing):
         url = f"https://reddit.com{submission.permalink}"
-        if any(s['url'] == url for s in samples):
+        if url in samples:
             continue
 
         text = f"{submission.title}\n\n{submission.selftext}" if submission.selftext else submission.title
@@ -179,14 +185,12 @@ def scrape_fallback(reddit, company, limit):
                 'source_type': 'fallback'
             }
         }
-        samples.append(sample)
+        samples.add(sample)
 
         if len(samples) >= limit:
             break
 
-        time.sleep(0.05)
-
-    return samples
+    return samples.samples()
 
 
 def scrape_reddit(company, limit=150, credentials=None):
@@ -225,14 +229,19 @@ def scrape_reddit(company, limit=150, credentials=None):
             user_agent=user_agent
         )
 
-        all_samples = []
+        # Paces every listing below to the rate-limit budget Reddit reports
+        scheduler = RedditRateScheduler(reddit)
+
+        # Keyed by permalink; a sample found by several strategies keeps the
+        # copy from the most official source
+        all_samples = SampleStore()
         sources_used = []
 
         # Try official USER
         possible_usernames = [company, company.lower(), company.replace(' ', ''), f"{company}Official"]
 
         for username in possible_usernames:
-            user_samples = scrape_official_user(reddit, username, limit)
+            user_samples = scrape_official_user(reddit, username, limit, scheduler)
             if user_samples:
                 all_samples.extend(user_samples)
                 sources_used.append(f"u/{username}")
@@ -245,11 +254,9 @@ def scrape_reddit(company, limit=150, credentials=None):
             possible_subreddits = [company, company.lower(), company.replace(' ', '')]
 
             for sub in possible_subreddits:
-                sub_samples = scrape_official_subreddit(reddit, sub, limit - len(all_samples))
+                sub_samples = scrape_official_subreddit(reddit, sub, limit - len(all_samples), scheduler)
                 if sub_samples:
-                    for sample in sub_samples:
-                        if not any(s['url'] == sample['url'] for s in all_samples):
-                            all_samples.append(sample)
+                    all_samples.extend(sub_samples)
 
                     sources_used.append(f"r/{sub}")
                     print(f"✓ Total so far: {len(all_samples)}")
@@ -258,18 +265,15 @@ def scrape_reddit(company, limit=150, credentials=None):
         # Fallback
         if len(all_samples) < limit:
             print(f"\nStill need {limit - len(all_samples)} more, using fallback...")
-            fallback_samples = scrape_fallback(reddit, company, limit - len(all_samples))
+            fallback_samples = scrape_fallback(reddit, company, limit - len(all_samples), scheduler)
 
-            for sample in fallback_samples:
-                if not any(s['url'] == sample['url'] for s in all_samples):
-                    all_samples.append(sample)
+            all_samples.extend(fallback_samples)
 
             sources_used.append("fallback")
             print(f"✓ Total so far: {len(all_samples)}")
 
         # Sort by date
-        all_samples.sort(key=lambda x: x['date'], reverse=True)
-        final_samples = all_samples[:limit]
+        final_samples = sorted(all_samples, key=lambda x: x['date'], reverse=True)[:limit]
 
         result = {
             'source': 'reddit',
@@ -278,6 +282,8 @@ def scrape_reddit(company, limit=150, credentials=None):
             'total_samples': len(final_samples),
             'samples': final_samples,
             'sources_used': sources_used,
+            'api_requests': scheduler.requests,
+            'rate_limit_wait': round(scheduler.waited, 1),
             'target': limit,
             'success': len(final_samples) >= limit
         }
@@ -350,13 +356,77 @@ def classify_topic(title, text):
         return 'discussion'
 
 
+def iter_hot_posts(reddit, subreddit_names, per_subreddit=30, batch_size=MULTIREDDIT_BATCH_SIZE, scheduler=None):
+    """
+    Yield hot posts from many subreddits using combined multireddit listings
+
+    Subreddits are fetched `batch_size` at a time as one 'a+b+c' listing, so
+    a batch costs about per_subreddit x batch_size / 100 requests instead of
+    one request per subreddit. Posts are dispatched back to their subreddit
+    locally and capped at per_subreddit each. A combined listing ranks all
+    of its subreddits together, so quiet subreddits can contribute fewer
+    posts than they would on their own.
+
+    If a combined listing fails (e.g. one subreddit is private or banned),
+    that batch falls back to one listing per subreddit so the others are
+    still scanned.
+
+    Args:
+        reddit: praw.Reddit instance
+        subreddit_names: Subreddit names, in priority order
+        per_subreddit: Maximum posts to yield per subreddit
+        batch_size: Subreddits per combined listing
+        scheduler: RedditRateScheduler pacing the listings
+
+    Yields:
+        (subreddit name as given, submission) tuples
+    """
+    scheduler = scheduler or RedditRateScheduler(reddit)
+
+    # Dedupe case-insensitively, keeping the first spelling
+    names = {}
+    for name in subreddit_names:
+        names.setdefault(name.lower(), name)
+    names = list(names.values())
+
+    for i in range(0, len(names), batch_size):
+        batch = names[i:i + batch_size]
+        by_key = {name.lower(): name for name in batch}
+        counts = dict.fromkeys(by_key, 0)
+
+        try:
+            print(f"Checking r/{'+'.join(batch)}...")
+            listing = reddit.subreddit('+'.join(batch)).hot(limit=per_subreddit * len(batch))
+
+            posts = []
+            for post in scheduler.iterate(listing):
+                key = str(post.subreddit).lower()
+                if key in counts and counts[key] < per_subreddit:
+                    counts[key] += 1
+                    posts.append((by_key[key], post))
+        except Exception as e:
+            print(f"  Combined listing failed ({e}), checking subreddits one by one")
+            posts = None
+
+        if posts is not None:
+            yield from posts
+            continue
+
+        for name in batch:
+            try:
+                for post in scheduler.iterate(reddit.subreddit(name).hot(limit=per_subreddit)):
+                    yield name, post
+            except Exception as e:
+                print(f"  Skipping r/{name}: {e}")
+
+
 def scrape_reddit_trends(company, limit=20, credentials=None):
     """
     Scrape trending topics about a company from Reddit
 
     Args:
         company: Company name
-        limit: Number of trending topics to find
+        limit: Number of top-scoring trending topics to return
         credentials: Dict with reddit_client_id, reddit_client_secret, reddit_user_agent
 
     Returns:
@@ -401,7 +471,12 @@ def scrape_reddit_trends(company, limit=20, credentials=None):
             user_agent=user_agent
         )
 
-        trending_topics = []
+        # Company and all topics compiled once, shared by every post check
+        matcher = TopicMatcher(company, main_topics)
+
+        # Every hot post is scanned; only the best `limit` matches by score are kept
+        best = TopK(limit)
+        matches = 0
         subreddits_to_check = ['technology', 'tech', 'gadgets', 'business', 'news']
 
         # Add company-specific subreddit if it's a well-known company
@@ -436,63 +511,38 @@ def scrape_reddit_trends(company, limit=20, credentials=None):
         print(f"Searching in: {', '.join(subreddits_to_check[:10])}" +
               (f" (+{len(subreddits_to_check)-10} more)" if len(subreddits_to_check) > 10 else "") + "\n")
 
-        for subreddit_name in subreddits_to_check:
-            if len(trending_topics) >= limit:
-                break
+        for subreddit_name, post in iter_hot_posts(reddit, subreddits_to_check, per_subreddit=30):
+            # Whole-word matching, so "Unity" does not match "community" or "opportunity"
+            is_relevant = matcher.search(post.title, post.selftext)
 
-            try:
-                subreddit = reddit.subreddit(subreddit_name)
-                print(f"Checking r/{subreddit_name}...")
+            if is_relevant:
+                topic_type = classify_topic(post.title, post.selftext)
 
-                for post in subreddit.hot(limit=30):
-                    if len(trending_topics) >= limit:
-                        break
+                sample = {
+                    'text': f"{post.title}\n\n{post.selftext[:300]}..." if post.selftext else post.title,
+                    'source': 'reddit_trends',
+                    'date': datetime.fromtimestamp(post.created_utc).isoformat(),
+                    'url': f"https://reddit.com{post.permalink}",
+                    'metadata': {
+                        'platform_type': 'social',
+                        'source_type': 'community_discussion',
+                        'subreddit': subreddit_name,
+                        'trend_type': 'hot',
+                        'topic_type': topic_type,
+                        'engagement': post.score,
+                        'num_comments': post.num_comments,
+                        'matched_topics': matcher.matched_topics(post.title, post.selftext)
+                    }
+                }
+                matches += 1
 
-                    # Use word boundary matching to avoid matching substrings
-                    # e.g., "Unity" should not match "community" or "opportunity"
-                    pattern = r'\b' + re.escape(company) + r'\b'
-                    title_match = re.search(pattern, post.title, re.IGNORECASE)
-                    text_match = re.search(pattern, post.selftext if post.selftext else "", re.IGNORECASE)
-
-                    is_relevant = bool(title_match or text_match)
-
-                    # If we have main topics from brand voice, also check if post mentions any of them
-                    # This helps find relevant discussions even if company name isn't mentioned
-                    if not is_relevant and main_topics:
-                        post_content = f"{post.title} {post.selftext if post.selftext else ''}".lower()
-                        for topic in main_topics:
-                            # Check if topic appears in the post
-                            topic_pattern = r'\b' + re.escape(topic.lower()) + r'\b'
-                            if re.search(topic_pattern, post_content):
-                                is_relevant = True
-                                break
-
-                    if is_relevant:
-                        topic_type = classify_topic(post.title, post.selftext)
-
-                        trending_topics.append({
-                            'text': f"{post.title}\n\n{post.selftext[:300]}..." if post.selftext else post.title,
-                            'source': 'reddit_trends',
-                            'date': datetime.fromtimestamp(post.created_utc).isoformat(),
-                            'url': f"https://reddit.com{post.permalink}",
-                            'metadata': {
-                                'platform_type': 'social',
-                                'source_type': 'community_discussion',
-                                'subreddit': subreddit_name,
-                                'trend_type': 'hot',
-                                'topic_type': topic_type,
-                                'engagement': post.score,
-                                'num_comments': post.num_comments
-                            }
-                        })
-
-                        time.sleep(0.1)
+                score = score_sample(sample, matcher)
+                sample['metadata']['relevance_score'] = round(score, 3)
+                best.push(score, sample)
 
-            except Exception as e:
-                print(f"  Skipping r/{subreddit_name}: {e}")
-                continue
+        trending_topics = best.items()
 
-        print(f"\n✓ Found {len(trending_topics)} trending topics")
+        print(f"\n✓ Found {matches} matching posts, kept top {len(trending_topics)} by score")
         if main_topics:
             print(f"  (Using brand voice topics for enhanced matching)")
 
@@ -504,7 +554,8 @@ def scrape_reddit_trends(company, limit=20, credentials=None):
             'samples': trending_topics,
             'success': len(trending_topics) > 0,
             'used_brand_voice': bool(main_topics),
-            'main_topics_used': main_topics if main_topics else []
+            'main_topics_used': main_topics if main_topics else [],
+            'total_matches': matches
         }
 
         print(f"{'='*50}\n")
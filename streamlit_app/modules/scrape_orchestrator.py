@@ -0,0 +1,187 @@
+"""
+Scrape Orchestrator Module
+Runs the Brand Analysis data sources concurrently and streams their progress
+"""
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import time
+
+from modules import ai_blog_finder, blog_scraper, reddit_scraper, youtube_scraper
+from modules.log_capture import capture_output
+
+
+def reddit_job(company, limit, credentials):
+    """Build the Reddit collection job"""
+    def run(progress):
+        progress("Scraping Reddit...")
+        return reddit_scraper.scrape_reddit(
+            company=company,
+            limit=limit,
+            credentials=credentials
+        )
+    return run
+
+
+def youtube_job(company, limit, youtube_api_key, channel_id=None):
+    """Build the YouTube collection job (finds the channel first if needed)"""
+    def run(progress):
+        nonlocal channel_id
+
+        # Find channel if not provided
+        if not channel_id:
+            progress("Finding YouTube channel...")
+            find_result = youtube_scraper.find_youtube_channel(
+                company=company,
+                youtube_api_key=youtube_api_key
+            )
+
+            if find_result.get('found'):
+                channel_id = find_result['channel_id']
+                progress(f"Found channel: {find_result['channel_name']}", level='info')
+            else:
+                return {
+                    'error': 'Could not auto-detect YouTube channel. Please provide Channel ID manually.',
+                    'source': 'youtube',
+                    'total_samples': 0,
+                    'samples': [],
+                    'success': False
+                }
+
+        progress("Scraping YouTube...")
+        return youtube_scraper.scrape_youtube(
+            company=company,
+            channel_id=channel_id,
+            limit=limit,
+            youtube_api_key=youtube_api_key
+        )
+    return run
+
+
+def blog_job(company, limit, blog_url=None, openai_api_key=None, use_ai_blog_finder=False):
+    """Build the blog collection job (optionally asking the AI blog finder for the URL)"""
+    def run(progress):
+        blog_url_to_use = blog_url  # Default to manual input
+        ai_result = None
+
+        # Use AI to find blog if enabled
+        if use_ai_blog_finder:
+            progress("🤖 Using AI to find company blog and RSS feed...")
+            ai_result = ai_blog_finder.find_blog_url_with_ai(
+                company=company,
+                openai_api_key=openai_api_key
+            )
+
+            if ai_result.get('success'):
+                best_feed = ai_result.get('best_feed_url')
+                best_blog = ai_result.get('best_blog_url')
+                all_feeds = ai_result.get('all_working_feeds', [])
+                all_blogs = ai_result.get('all_working_blogs', [])
+
+                progress(f"🤖 AI Reasoning: {ai_result.get('ai_reasoning', 'N/A')}", level='info')
+
+                if best_feed:
+                    progress(f"✓ Found RSS feed: {best_feed}", level='success')
+                    blog_url_to_use = best_feed
+                elif best_blog:
+                    progress(f"✓ Found blog URL: {best_blog} (will search for RSS feed)", level='info')
+                    blog_url_to_use = best_blog
+                elif all_feeds:
+                    progress(f"Found {len(all_feeds)} potential RSS feeds, trying first one", level='info')
+                    blog_url_to_use = all_feeds[0]
+                elif all_blogs:
+                    progress(f"Found {len(all_blogs)} potential blog URLs, trying first one", level='info')
+                    blog_url_to_use = all_blogs[0]
+                else:
+                    progress("AI could not find working blog or RSS feed URLs", level='warning')
+                    blog_url_to_use = None
+            else:
+                progress(f"AI blog finder failed: {ai_result.get('error', 'Unknown error')}", level='warning')
+                blog_url_to_use = None
+
+        if not blog_url_to_use:
+            return {
+                'error': 'No blog URL available for scraping. Skipping blog collection.',
+                'source': 'blog',
+                'total_samples': 0,
+                'samples': [],
+                'success': False
+            }
+
+        progress(f"Scraping blog from: {blog_url_to_use}...")
+        result = blog_scraper.scrape_blog(
+            company=company,
+            limit=limit,
+            blog_url=blog_url_to_use
+        )
+
+        # If we have alternative URLs from AI, suggest them
+        if not result.get('success') and ai_result and ai_result.get('success'):
+            all_suggestions = ai_result.get('all_working_feeds', []) + ai_result.get('all_working_blogs', [])
+            if len(all_suggestions) > 1:
+                alternatives = ', '.join(all_suggestions[1:4])  # Show up to 3 alternatives
+                progress(f"AI found these alternative URLs you could try: {alternatives}", level='info')
+
+        return result
+    return run
+
+
+def run_sources(jobs):
+    """
+    Run scraping jobs concurrently and stream their progress
+
+    Each job is a callable taking a progress(message, level='status')
+    callback and returning a scraper result dict. Jobs run in their own
+    threads with their print() output captured separately.
+
+    Streamlit calls must stay on the script thread, so this is a generator:
+    the page iterates over it and renders each event as it arrives.
+
+    Args:
+        jobs: Dict of source name -> job callable
+
+    Yields:
+        Event dicts with 'source' and 'type':
+        - 'progress': plus 'message' and 'level' ('status', 'info', 'success', 'warning')
+        - 'done': plus 'result', 'log' and 'elapsed' (seconds)
+    """
+    if not jobs:
+        return
+
+    events = queue.Queue()
+
+    def run_job(source, job):
+        def progress(message, level='status'):
+            events.put({'source': source, 'type': 'progress', 'message': message, 'level': level})
+
+        start = time.time()
+        with capture_output() as log:
+            try:
+                result = job(progress)
+            except Exception as e:
+                print(f"✗ Error: {e}")
+                result = {
+                    'error': str(e),
+                    'source': source,
+                    'total_samples': 0,
+                    'samples': [],
+                    'success': False
+                }
+
+        events.put({
+            'source': source,
+            'type': 'done',
+            'result': result,
+            'log': log.getvalue(),
+            'elapsed': time.time() - start
+        })
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        for source, job in jobs.items():
+            executor.submit(run_job, source, job)
+
+        remaining = len(jobs)
+        while remaining:
+            event = events.get()
+            if event['type'] == 'done':
+                remaining -= 1
+            yield event
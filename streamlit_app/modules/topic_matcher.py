@@ -0,0 +1,77 @@
+"""
+Topic Matcher Module
+Relevance matching of posts against a company name and brand voice topics
+"""
+import re
+
+
+def _term_pattern(term):
+    """Regex for one term; any run of whitespace in the term matches any whitespace"""
+    return r'\s+'.join(re.escape(word) for word in term.split())
+
+
+def _normalize(text):
+    return ' '.join(text.lower().split())
+
+
+def _compile(terms):
+    # Longest first so "machine learning" wins over "machine" at the same position.
+    # Lookarounds instead of \b so terms like "C++" or ".NET" still match whole words
+    alternation = '|'.join(_term_pattern(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(r'(?<!\w)(?:' + alternation + r')(?!\w)', re.IGNORECASE)
+
+
+class TopicMatcher:
+    """
+    Whole-word, case-insensitive matcher for a company and its topics
+
+    All terms are compiled once into a single alternation regex, so checking
+    a post is one scan of its text no matter how many topics there are.
+    Build one matcher per scrape and reuse it for every post.
+    """
+
+    def __init__(self, company, topics=None):
+        self.company = company.strip()
+        self._terms = {}
+
+        for term in [self.company] + list(topics or []):
+            if term and term.strip():
+                self._terms.setdefault(_normalize(term), term.strip())
+
+        self.topics = [term for key, term in self._terms.items() if key != _normalize(self.company)]
+        self._company_regex = _compile([self.company]) if self.company else None
+        self._regex = _compile(self._terms.values()) if self._terms else None
+
+    def search(self, *texts):
+        """True if any text mentions the company or one of the topics"""
+        if not self._regex:
+            return False
+        return any(text and self._regex.search(text) for text in texts)
+
+    def mentions_company(self, *texts):
+        """True if any text mentions the company name"""
+        if not self._company_regex:
+            return False
+        return any(text and self._company_regex.search(text) for text in texts)
+
+    def matched_terms(self, *texts):
+        """
+        Terms found in the texts, in order of first appearance
+
+        Overlapping terms are matched longest-first, so a shorter topic
+        contained in a longer one is only reported where it appears alone.
+        """
+        found = {}
+        if self._regex:
+            for text in texts:
+                if not text:
+                    continue
+                for match in self._regex.finditer(text):
+                    key = _normalize(match.group(0))
+                    found.setdefault(key, self._terms.get(key, match.group(0)))
+        return list(found.values())
+
+    def matched_topics(self, *texts):
+        """Brand voice topics found in the texts (the company name excluded)"""
+        company_key = _normalize(self.company)
+        return [term for term in self.matched_terms(*texts) if _normalize(term) != company_key]
@@ -0,0 +1,82 @@
+"""
+Transcript Cache
+Persistent on-disk cache of YouTube transcripts keyed by video ID
+"""
+import time
+import zlib
+
+from modules.cache_db import get_connection
+
+
+# Transcripts of published videos practically never change. "No transcript"
+# is rechecked sooner, since auto-generated captions often appear a few
+# days after upload
+TRANSCRIPT_TTL = 180 * 24 * 3600
+NEGATIVE_TTL = 3 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT PRIMARY KEY,
+    text BLOB,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def _db():
+    return get_connection('transcripts.sqlite', _SCHEMA)
+
+
+def get_transcripts(video_ids):
+    """
+    Look up fresh cached transcripts
+
+    Args:
+        video_ids: Iterable of YouTube video IDs
+
+    Returns:
+        Dict of video_id -> transcript text, or None for a cached
+        "no transcript". Missing and expired IDs are left out.
+    """
+    video_ids = list(video_ids)
+    if not video_ids:
+        return {}
+
+    conn, lock = _db()
+    now = time.time()
+    cached = {}
+
+    with lock:
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(video_ids), 500):
+            chunk = video_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT video_id, text, fetched_at FROM transcripts WHERE video_id IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for video_id, text, fetched_at in rows:
+                ttl = TRANSCRIPT_TTL if text is not None else NEGATIVE_TTL
+                if now - fetched_at < ttl:
+                    cached[video_id] = zlib.decompress(text).decode('utf-8') if text is not None else None
+
+    return cached
+
+
+def put_transcript(video_id, text):
+    """
+    Store a transcript, or None to record that the video has none
+
+    Args:
+        video_id: YouTube video ID
+        text: Transcript text or None
+    """
+    blob = zlib.compress(text.encode('utf-8')) if text is not None else None
+
+    conn, lock = _db()
+    with lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO transcripts (video_id, text, fetched_at) VALUES (?, ?, ?)",
+            (video_id, blob, time.time())
+        )
+        conn.commit()
@@ -0,0 +1,157 @@
+"""
+Trend Aggregator Module
+Runs all trend sources concurrently and combines their results
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+import io
+import time
+
+from modules import devto_scraper, hackernews_scraper, producthunt_scraper
+from modules.log_capture import capture_output
+from modules.topic_matcher import TopicMatcher
+from modules.trend_items import TrendItem, dedupe_trends
+from modules.trend_scoring import TopK, score_trend
+
+
+# Seconds each source gets before its results are left out
+DEFAULT_TIMEOUT = 60
+
+
+def _hackernews_items(result):
+    """Normalize a scrape_hackernews_trends result"""
+    if result.get('success'):
+        return [TrendItem.from_hackernews(sample) for sample in result.get('samples', [])]
+    return []
+
+
+def _producthunt_items(result):
+    """Normalize a scrape_producthunt_trends result"""
+    if result.get('success'):
+        return [TrendItem.from_producthunt(trend) for trend in result.get('trends', [])]
+    return []
+
+
+def _devto_items(result):
+    """Normalize a scrape_devto_trends result"""
+    if result.get('success'):
+        return [TrendItem.from_devto(trend) for trend in result.get('trends', [])]
+    return []
+
+
+# (label, scraper, converter to TrendItems)
+TREND_SOURCES = [
+    ('Hacker News', hackernews_scraper.scrape_hackernews_trends, _hackernews_items),
+    ('Product Hunt', producthunt_scraper.scrape_producthunt_trends, _producthunt_items),
+    ('Dev.to', devto_scraper.scrape_devto_trends, _devto_items)
+]
+
+
+def find_trends(company, limit=15, brand_voice=None, timeout=DEFAULT_TIMEOUT, sources=None):
+    """
+    Search all trend sources concurrently and combine their results
+
+    Every source runs in its own thread with its print() output captured
+    separately. Sources still running after `timeout` seconds are reported
+    as timed out and the results of the others are returned. All results
+    are normalized to TrendItems, deduplicated across sources and ranked
+    by relevance score (see trend_scoring).
+
+    Args:
+        company: Company name
+        limit: Number of trends to find per source
+        brand_voice: Brand voice profile dict passed to the scrapers
+        timeout: Seconds to wait for the slowest source
+        sources: Optional list of (label, scraper, converter); defaults to TREND_SOURCES
+
+    Returns:
+        Dict in the hackernews_scraper sample format, plus per-source
+        'sources' counts (after dedup), 'logs', 'errors', 'timed_out'
+        and 'duplicates_removed'
+    """
+    sources = sources or TREND_SOURCES
+    credentials = {'brand_voice': brand_voice or {}}
+
+    logs = {label: io.StringIO() for label, _, _ in sources}
+
+    def run_source(label, scraper):
+        with capture_output(logs[label]):
+            return scraper(company=company, limit=limit, credentials=credentials)
+
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    futures = {
+        label: executor.submit(run_source, label, scraper)
+        for label, scraper, _ in sources
+    }
+
+    start = time.time()
+    wait(futures.values(), timeout=timeout)
+    # Don't block on sources that overran; their threads finish in the background
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    all_items = []
+    errors = {}
+    timed_out = []
+
+    for label, _, convert in sources:
+        future = futures[label]
+
+        if not future.done():
+            timed_out.append(label)
+            errors[label] = f"Timed out after {timeout}s"
+            continue
+
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+
+        items = convert(result)
+        all_items.extend((label, item) for item in items)
+
+        if not items and result.get('error'):
+            errors[label] = result['error']
+
+    # Drop the same story reported by several sources (first source wins)
+    unique, dedup = dedupe_trends(item for _, item in all_items)
+    kept = set(map(id, unique))
+
+    source_counts = {label: 0 for label, _, _ in sources}
+    for label, item in all_items:
+        if id(item) in kept:
+            source_counts[label] += 1
+
+    if dedup.url_duplicates or dedup.title_duplicates:
+        print(f"Removed {dedup.url_duplicates} duplicate URLs and "
+              f"{dedup.title_duplicates} near-duplicate titles across sources")
+
+    # Rank everything that survived dedup on one scale, best first
+    matcher = TopicMatcher(company, (brand_voice or {}).get('main_topics', []))
+    ranked = TopK(len(unique))
+    for item in unique:
+        score = score_trend(
+            text=item.text,
+            source=item.source,
+            engagement=item.engagement,
+            num_comments=item.num_comments,
+            date=item.date,
+            matcher=matcher
+        )
+        item.metadata['relevance_score'] = round(score, 3)
+        ranked.push(score, item)
+
+    all_trends = [item.to_sample() for item in ranked.items()]
+
+    return {
+        'success': len(all_trends) > 0,
+        'samples': all_trends,
+        'total_samples': len(all_trends),
+        'company': company,
+        'sources': source_counts,
+        'scraped_at': datetime.now().isoformat(),
+        'logs': {label: buffer.getvalue() for label, buffer in logs.items()},
+        'errors': errors,
+        'timed_out': timed_out,
+        'duplicates_removed': dedup.url_duplicates + dedup.title_duplicates,
+        'elapsed': time.time() - start
+    }
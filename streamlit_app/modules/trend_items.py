@@ -0,0 +1,272 @@
+"""
+Trend Items Module
+Common record type for trend sources, plus URL and near-duplicate title dedup
+"""
+from hashlib import blake2b
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import re
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'ref', 'ref_src', 'source', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+# Titles whose 64-bit SimHashes differ in at most this many bits count as duplicates
+SIMHASH_BITS = 64
+SIMHASH_MAX_DISTANCE = 3
+
+# Bands for the SimHash index. With more bands than SIMHASH_MAX_DISTANCE, any
+# two hashes within the distance share at least one band exactly
+SIMHASH_BANDS = 4
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def canonical_url(url):
+    """
+    Normalize a URL for duplicate detection
+
+    Lowercases scheme and host, drops 'www.', default ports, fragments,
+    trailing slashes and tracking parameters (utm_* and friends), and sorts
+    the remaining query parameters.
+    """
+    if not url:
+        return ''
+
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+
+    scheme = (parts.scheme or 'https').lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or ''
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def _token_hash(token):
+    return int.from_bytes(blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text):
+    """
+    64-bit SimHash of a title over word unigrams and bigrams
+
+    Similar titles get hashes that differ in only a few bits.
+    """
+    words = _WORD_RE.findall(text.lower())
+    tokens = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not tokens:
+        return 0
+
+    weights = [0] * SIMHASH_BITS
+    for token in tokens:
+        h = _token_hash(token)
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def _bands(value):
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(band, value >> (band * width) & mask) for band in range(SIMHASH_BANDS)]
+
+
+class TrendItem:
+    """
+    One trending topic, whatever source it came from
+
+    The structured fields are what dedup and ranking look at; `metadata`
+    keeps everything the source reported so to_sample() can rebuild the
+    sample dict the rest of the app uses.
+    """
+
+    __slots__ = ('title', 'text', 'url', 'external_url', 'source', 'date',
+                 'author', 'engagement', 'num_comments', 'topic_type', 'metadata')
+
+    def __init__(self, title, text, url, source, external_url=None, date=None,
+                 author=None, engagement=0, num_comments=0, topic_type=None, metadata=None):
+        self.title = title
+        self.text = text
+        self.url = url
+        self.source = source
+        self.external_url = external_url
+        self.date = date
+        self.author = author
+        self.engagement = engagement or 0
+        self.num_comments = num_comments or 0
+        self.topic_type = topic_type
+        self.metadata = metadata or {}
+
+    def __repr__(self):
+        return f"TrendItem({self.source!r}, {self.title!r})"
+
+    @classmethod
+    def from_hackernews(cls, sample):
+        """Build from a scrape_hackernews_trends sample"""
+        metadata = sample.get('metadata', {})
+        text = sample.get('text', '')
+        return cls(
+            title=text.split('\n', 1)[0],
+            text=text,
+            url=sample.get('url', ''),
+            source=sample.get('source', 'hackernews_trends'),
+            external_url=metadata.get('external_url'),
+            date=sample.get('date'),
+            author=metadata.get('author'),
+            engagement=metadata.get('engagement', 0),
+            num_comments=metadata.get('num_comments', 0),
+            topic_type=metadata.get('topic_type'),
+            metadata=metadata
+        )
+
+    @classmethod
+    def from_producthunt(cls, trend):
+        """Build from a scrape_producthunt_trends trend"""
+        title = trend.get('title', '')
+        return cls(
+            title=title,
+            text=f"{title}: {trend.get('description', '')}",
+            url=trend.get('url', ''),
+            source='producthunt',
+            external_url=trend.get('url', ''),
+            date=trend.get('created_at') or None,
+            author='Product Hunt',
+            engagement=trend.get('votes', 0),
+            num_comments=trend.get('comments', 0),
+            topic_type='product',
+            metadata={
+                'author': 'Product Hunt',
+                'engagement': trend.get('votes', 0),
+                'num_comments': trend.get('comments', 0),
+                'topic_type': 'product',
+                'external_url': trend.get('url', ''),
+                'topics': trend.get('topics', []),
+                'matched_topics': trend.get('matched_topics', [])
+            }
+        )
+
+    @classmethod
+    def from_devto(cls, trend):
+        """Build from a scrape_devto_trends trend"""
+        title = trend.get('title', '')
+        return cls(
+            title=title,
+            text=f"{title}: {trend.get('description', '')}",
+            url=trend.get('url', ''),
+            source='devto',
+            external_url=trend.get('url', ''),
+            date=trend.get('published_at') or None,
+            author=trend.get('author', 'Dev.to'),
+            engagement=trend.get('reactions', 0),
+            num_comments=trend.get('comments', 0),
+            topic_type='article',
+            metadata={
+                'author': trend.get('author', 'Dev.to'),
+                'engagement': trend.get('reactions', 0),
+                'num_comments': trend.get('comments', 0),
+                'topic_type': 'article',
+                'external_url': trend.get('url', ''),
+                'tags': trend.get('tags', []),
+                'reading_time': trend.get('reading_time', 0),
+                'matched_topics': trend.get('matched_topics', [])
+            }
+        )
+
+    def url_keys(self):
+        """Canonical URLs identifying this item (discussion page and linked page)"""
+        keys = {canonical_url(self.url), canonical_url(self.external_url)}
+        keys.discard('')
+        return keys
+
+    def to_sample(self):
+        """Convert to the sample dict format shared with the Reddit and HN scrapers"""
+        sample = {
+            'text': self.text,
+            'url': self.url,
+            'source': self.source,
+            'metadata': self.metadata
+        }
+        if self.date:
+            sample['date'] = self.date
+        return sample
+
+
+class TrendDeduplicator:
+    """
+    Streaming dedup of TrendItems across sources
+
+    An item is dropped if it shares a canonical URL with an earlier item, or
+    if its title SimHash is within SIMHASH_MAX_DISTANCE bits of an earlier
+    title. Titles are indexed by SimHash band, so each check only compares
+    against the few items that share a band instead of everything seen so far.
+    """
+
+    def __init__(self, max_distance=SIMHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.seen_urls = set()
+        self._bands = {}
+        self.url_duplicates = 0
+        self.title_duplicates = 0
+
+    def _similar_title(self, value):
+        for key in _bands(value):
+            for other in self._bands.get(key, ()):
+                if bin(value ^ other).count('1') <= self.max_distance:
+                    return True
+        return False
+
+    def add(self, item):
+        """Record item; returns False if it duplicates one already added"""
+        keys = item.url_keys()
+        if keys & self.seen_urls:
+            self.url_duplicates += 1
+            return False
+
+        value = simhash(item.title) if item.title else None
+        if value and self._similar_title(value):
+            self.title_duplicates += 1
+            return False
+
+        self.seen_urls |= keys
+        if value:
+            for key in _bands(value):
+                self._bands.setdefault(key, []).append(value)
+        return True
+
+
+def dedupe_trends(items, max_distance=SIMHASH_MAX_DISTANCE):
+    """
+    Drop duplicate TrendItems, keeping the first of each group
+
+    Args:
+        items: Iterable of TrendItem, in priority order
+        max_distance: Maximum SimHash bit distance for near-duplicate titles
+
+    Returns:
+        (unique items list, TrendDeduplicator with duplicate counts)
+    """
+    dedup = TrendDeduplicator(max_distance)
+    unique = [item for item in items if dedup.add(item)]
+    return unique, dedup
@@ -0,0 +1,167 @@
+"""
+Trend Scoring Module
+Ranks trend candidates by relevance, engagement, recency and source
+"""
+from datetime import datetime
+import heapq
+import itertools
+import math
+import time
+
+
+# Relative trust in each source's items, keyed by sample/trend 'source'
+SOURCE_WEIGHTS = {
+    'hackernews_trends': 1.0,
+    'reddit_trends': 1.0,
+    'producthunt': 0.9,
+    'devto': 0.8
+}
+DEFAULT_SOURCE_WEIGHT = 0.8
+
+# Topic-match strength: a company mention counts more than a brand topic
+COMPANY_MATCH_WEIGHT = 2.0
+TOPIC_MATCH_WEIGHT = 0.5
+MAX_TOPIC_MATCHES = 4
+
+# Comments count half as much as votes/reactions (both log-scaled)
+COMMENT_WEIGHT = 0.5
+
+# Recency halves every RECENCY_HALF_LIFE_HOURS but never drops below RECENCY_FLOOR
+RECENCY_HALF_LIFE_HOURS = 48
+RECENCY_FLOOR = 0.25
+UNKNOWN_DATE_RECENCY = 0.5
+
+
+def _timestamp(date):
+    """Convert an ISO string, datetime or epoch number to epoch seconds (None if unknown)"""
+    if not date:
+        return None
+    if isinstance(date, (int, float)):
+        return float(date)
+    if isinstance(date, datetime):
+        return date.timestamp()
+    try:
+        return datetime.fromisoformat(str(date).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def recency_factor(date, now=None):
+    """Exponential decay by age, between RECENCY_FLOOR and 1.0"""
+    ts = _timestamp(date)
+    if ts is None:
+        return UNKNOWN_DATE_RECENCY
+
+    age_hours = max(0.0, ((now or time.time()) - ts) / 3600)
+    decay = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    return RECENCY_FLOOR + (1 - RECENCY_FLOOR) * decay
+
+
+def topic_strength(text, matcher=None, matched_topics=None):
+    """
+    How strongly a candidate matches the brand
+
+    Uses the TopicMatcher on `text` when given; otherwise falls back to a
+    precomputed matched_topics list (company mentions unknown).
+    """
+    if matcher:
+        company = COMPANY_MATCH_WEIGHT if matcher.mentions_company(text) else 0.0
+        topics = len(matcher.matched_topics(text))
+    else:
+        company = 0.0
+        topics = len(matched_topics or [])
+    return company + TOPIC_MATCH_WEIGHT * min(topics, MAX_TOPIC_MATCHES)
+
+
+def score_trend(text, source, engagement=0, num_comments=0, date=None,
+                matcher=None, matched_topics=None, now=None):
+    """
+    Relevance score of one trend candidate (higher is better)
+
+    score = source weight x (1 + topic strength)
+                          x (1 + log1p(engagement) + 0.5 x log1p(comments))
+                          x recency factor
+
+    Args:
+        text: Title and body text used for topic matching
+        source: Source key (see SOURCE_WEIGHTS)
+        engagement: Votes/score/reactions
+        num_comments: Comment count
+        date: Publish time (ISO string, datetime or epoch seconds)
+        matcher: Optional TopicMatcher for the company and brand topics
+        matched_topics: Precomputed topic matches, used when no matcher is given
+        now: Reference epoch time (default: now)
+
+    Returns:
+        Float score
+    """
+    popularity = math.log1p(max(engagement or 0, 0)) + COMMENT_WEIGHT * math.log1p(max(num_comments or 0, 0))
+    return (SOURCE_WEIGHTS.get(source, DEFAULT_SOURCE_WEIGHT)
+            * (1 + topic_strength(text, matcher, matched_topics))
+            * (1 + popularity)
+            * recency_factor(date, now))
+
+
+def score_sample(sample, matcher=None, now=None):
+    """Score a sample dict in the shared Reddit/HN format"""
+    metadata = sample.get('metadata', {})
+    return score_trend(
+        text=sample.get('text', ''),
+        source=sample.get('source'),
+        engagement=metadata.get('engagement', 0),
+        num_comments=metadata.get('num_comments', 0),
+        date=sample.get('date'),
+        matcher=matcher,
+        matched_topics=metadata.get('matched_topics'),
+        now=now
+    )
+
+
+class TopK:
+    """
+    Keeps the k highest-scoring items seen so far
+
+    Backed by a min-heap of size k, so scanning n candidates costs
+    O(n log k) time and O(k) memory however wide the scan is.
+    """
+
+    def __init__(self, k):
+        self.k = max(int(k), 0)
+        self._heap = []
+        self._counter = itertools.count()
+        self.seen = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, score, item):
+        """Offer an item; returns True if it is currently in the top k"""
+        self.seen += 1
+        if not self.k:
+            return False
+
+        # The counter breaks score ties in favour of earlier items
+        entry = (score, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def items(self):
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+    def scored_items(self):
+        """Kept (score, item) pairs, best first"""
+        return [(score, item) for score, _, item in sorted(self._heap, reverse=True)]
+
+
+def top_k(items, k, key):
+    """Return the k items with the highest key(item), best first"""
+    best = TopK(k)
+    for item in items:
+        best.push(key(item), item)
+    return best.items()
@@ -3,16 +3,80 @@ YouTube Scraper Module
 Refactored from youtube_scraper_api.py for Streamlit integration
 """
 from googleapiclient.discovery import build
-from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled, VideoUnavailable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
-import time
 
+from modules import channel_cache, transcript_cache
+from modules.fetch_pool import HostRateLimiter, fetch_ordered
+from modules.log_capture import propagate
+from modules.rate_scheduler import QuotaExceededError, QuotaUsage, youtube_quota
 
-def find_official_channel(company, youtube_api_key):
-    """Try to find the company's official YouTube channel"""
+
+# Transcripts come from youtube.com pages, not the Data API, so they are
+# paced per host rather than charged against the API quota
+TRANSCRIPT_HOST = 'www.youtube.com'
+TRANSCRIPT_MIN_INTERVAL = 0.2
+TRANSCRIPT_WORKERS = 6
+
+_transcript_limiter = HostRateLimiter(min_interval=TRANSCRIPT_MIN_INTERVAL, max_per_host=TRANSCRIPT_WORKERS)
+
+
+def _candidate_handles(company):
+    """Likely @handles for a company's channel"""
+    base = ''.join(ch for ch in company if ch.isalnum())
+    if not base:
+        return []
+    return [f"@{base}", f"@{base}official"]
+
+
+def find_official_channel(company, youtube_api_key, use_cache=True, usage=None):
+    """
+    Try to find the company's official YouTube channel
+
+    Cheap lookups come first: the channel cache, then channels().list by
+    @handle (1 quota unit each). The search queries (100 units each) only
+    run if those fail. Results, including "not found", are cached by company.
+    Units spent are added to `usage` (a QuotaUsage) when given.
+
+    Returns:
+        (channel_id, channel_title), or (None, None) if not found
+    """
+    if use_cache:
+        cached = channel_cache.get_channel(company)
+        if cached:
+            if cached['channel_id']:
+                print(f"✓ Using cached channel: {cached['channel_name']} ({cached['channel_id']})")
+            else:
+                print(f"ℹ️ Cached result: no channel found for {company} recently")
+            return cached['channel_id'], cached['channel_name']
 
     youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+    quota = youtube_quota(youtube_api_key)
+    had_errors = False
+
+    for handle in _candidate_handles(company):
+        try:
+            channel_response = quota.execute(youtube.channels().list(
+                part='snippet,contentDetails',
+                forHandle=handle
+            ), 'channels.list', usage)
+
+            for item in channel_response.get('items', []):
+                channel_title = item['snippet']['title']
+                if company.lower() in channel_title.lower():
+                    print(f"✓ Found official channel by handle {handle}: {channel_title} ({item['id']})")
+                    if use_cache:
+                        channel_cache.set_channel(
+                            company, item['id'], channel_title,
+                            item['contentDetails']['relatedPlaylists']['uploads']
+                        )
+                    return item['id'], channel_title
+
+        except Exception as e:
+            print(f"Error looking up handle {handle}: {e}")
+            had_errors = True
 
     search_queries = [
         f"{company} official",
@@ -22,12 +86,12 @@ def find_official_channel(company, youtube_api_key):
 
     for query in search_queries:
         try:
-            search_response = youtube.search().list(
+            search_response = quota.execute(youtube.search().list(
                 q=query,
                 part='snippet',
                 type='channel',
                 maxResults=5
-            ).execute()
+            ), 'search.list', usage)
 
             for item in search_response.get('items', []):
                 channel_id = item['id']['channelId']
@@ -35,131 +99,223 @@ def find_official_channel(company, youtube_api_key):
 
                 if company.lower() in channel_title.lower():
                     print(f"✓ Found potential official channel: {channel_title} ({channel_id})")
+                    if use_cache:
+                        channel_cache.set_channel(company, channel_id, channel_title)
                     return channel_id, channel_title
 
+        except QuotaExceededError as e:
+            print(f"✗ {e}")
+            had_errors = True
+            break
         except Exception as e:
             print(f"Error searching for {query}: {e}")
+            had_errors = True
             continue
 
+    # Only remember "not found" when every lookup actually ran
+    if use_cache and not had_errors:
+        channel_cache.set_channel(company, None)
+
     return None, None
 
 
-def get_video_transcript(video_id):
-    """Get video transcript - returns None if not available"""
+def _fetch_transcript(video_id, use_cache=True):
+    """
+    Download a transcript; returns the text or None (safe to call from worker threads)
+
+    With use_cache, the result is stored in the transcript cache. "No
+    transcript" is cached only when YouTube says so, not on network errors.
+    """
     try:
-        api = YouTubeTranscriptApi()
-        transcript_data = api.fetch(video_id)
+        with _transcript_limiter.slot(TRANSCRIPT_HOST):
+            api = YouTubeTranscriptApi()
+            transcript_data = api.fetch(video_id)
         text = ' '.join([snippet.text for snippet in transcript_data])
+    except (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable):
+        text = None
+    except Exception:
+        return None
+
+    if use_cache:
+        transcript_cache.put_transcript(video_id, text)
+    return text
+
+
+def get_video_transcript(video_id, use_cache=True):
+    """Get video transcript - returns None if not available"""
+    cached = transcript_cache.get_transcripts([video_id]) if use_cache else {}
+    if video_id in cached:
+        text = cached[video_id]
+    else:
+        text = _fetch_transcript(video_id, use_cache)
+    if text is not None:
         print(f"    ✓ Got transcript ({len(text)} chars)")
-        return text
-    except Exception as e:
+    else:
         print(f"    ⚠ No transcript (will use title+description)")
-        return None
+    return text
+
+
+def _list_uploads_page(youtube, quota, playlist_id, page_token=None, usage=None):
+    """Fetch one page (up to 50 videos) of an uploads playlist"""
+    request_params = {
+        'part': 'snippet',
+        'playlistId': playlist_id,
+        'maxResults': 50
+    }
+
+    if page_token:
+        request_params['pageToken'] = page_token
+
+    return quota.execute(youtube.playlistItems().list(**request_params), 'playlistItems.list', usage)
 
 
-def scrape_youtube_channel(channel_id, channel_name, limit, youtube_api_key):
-    """Scrape videos from a YouTube channel"""
+def scrape_youtube_channel(channel_id, channel_name, limit, youtube_api_key, max_workers=TRANSCRIPT_WORKERS,
+                           use_cache=True, uploads_playlist_id=None, usage=None):
+    """
+    Scrape videos from a YouTube channel
+
+    Each playlist page is listed first, then its transcripts are downloaded
+    through a bounded thread pool. While they download, the next page is
+    prefetched on a dedicated thread with its own API service object, since
+    googleapiclient service objects are not thread-safe.
+
+    With use_cache, transcripts (and "no transcript" results) come from the
+    on-disk transcript cache when fresh, so re-analysing a channel only
+    downloads transcripts of new uploads.
+
+    Pass uploads_playlist_id when it is already known (scrape_youtube gets
+    it with the channel snippet) to skip the channels().list call. API
+    units spent are added to `usage` (a QuotaUsage) when given.
+    """
     samples = []
-    next_page_token = None
     videos_checked = 0
+    cache_hits = 0
 
     youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+    quota = youtube_quota(youtube_api_key)
+
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    prefetch_youtube = None
 
     try:
         print(f"Scraping videos from: {channel_name}")
 
         # Get the channel's "uploads" playlist ID
-        channel_response = youtube.channels().list(
-            part='contentDetails',
-            id=channel_id
-        ).execute()
+        if not uploads_playlist_id:
+            channel_response = quota.execute(youtube.channels().list(
+                part='contentDetails',
+                id=channel_id
+            ), 'channels.list', usage)
 
-        if not channel_response.get('items'):
-            print(f"Error: Channel {channel_id} not found")
-            return []
+            if not channel_response.get('items'):
+                print(f"Error: Channel {channel_id} not found")
+                return []
 
-        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+            uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
         print(f"Found uploads playlist: {uploads_playlist_id}")
 
-        while len(samples) < limit:
-            request_params = {
-                'part': 'snippet',
-                'playlistId': uploads_playlist_id,
-                'maxResults': 50
-            }
-
-            if next_page_token:
-                request_params['pageToken'] = next_page_token
-
-            response = youtube.playlistItems().list(**request_params).execute()
+        response = _list_uploads_page(youtube, quota, uploads_playlist_id, usage=usage)
 
+        while len(samples) < limit:
             videos = response.get('items', [])
 
             if not videos:
                 print("  No more videos found")
                 break
 
-            print(f"  Processing batch of {len(videos)} videos...")
-
-            for video in videos:
-                if len(samples) >= limit:
-                    break
-
-                videos_checked += 1
-
-                video_id = video['snippet']['resourceId']['videoId']
-                title = video['snippet']['title']
-                description = video['snippet']['description']
-                published_at = video['snippet']['publishedAt']
-
-                print(f"  [{videos_checked}] {title[:60]}...")
-
-                # Try to get transcript
-                transcript = get_video_transcript(video_id)
-
-                # Build sample text
-                text_parts = [f"Title: {title}"]
-
-                if description:
-                    text_parts.append(f"Description: {description}")
-
-                if transcript:
-                    text_parts.append(f"Transcript: {transcript}")
+            next_page_token = response.get('nextPageToken')
 
-                full_text = "\n\n".join(text_parts)
+            # Start listing the next page now if this one can't fill the limit
+            next_page = None
+            if next_page_token and len(samples) + len(videos) < limit:
+                if prefetch_youtube is None:
+                    prefetch_youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+                next_page = prefetcher.submit(
+                    propagate(_list_uploads_page), prefetch_youtube, quota, uploads_playlist_id, next_page_token,
+                    usage
+                )
 
-                if len(full_text) < 30:
-                    print(f"      Skipped (no content)")
-                    continue
+            print(f"  Processing batch of {len(videos)} videos...")
 
-                sample = {
-                    'text': full_text,
-                    'source': 'youtube',
-                    'date': published_at,
-                    'url': f"https://www.youtube.com/watch?v={video_id}",
-                    'metadata': {
-                        'platform_type': 'video',
-                        'channel_name': channel_name,
-                        'video_id': video_id,
-                        'title': title,
-                        'has_transcript': transcript is not None,
-                        'transcript_length': len(transcript) if transcript else 0,
-                        'source_type': 'official_channel'
+            # Transcripts download concurrently; results come back in playlist order.
+            # Only as many as are still needed are fetched at a time, and the rest
+            # of the page is kept in case some videos are skipped.
+            pending = videos
+            while pending and len(samples) < limit:
+                batch = pending[:limit - len(samples)]
+                pending = pending[len(batch):]
+                video_ids = [video['snippet']['resourceId']['videoId'] for video in batch]
+                cached = transcript_cache.get_transcripts(video_ids) if use_cache else {}
+                cache_hits += len(cached)
+
+                def load_transcript(video_id):
+                    if video_id in cached:
+                        return cached[video_id]
+                    return _fetch_transcript(video_id, use_cache)
+
+                transcripts = fetch_ordered(load_transcript, video_ids, max_workers=max_workers)
+
+                for video, (video_id, transcript) in zip(batch, transcripts):
+                    if isinstance(transcript, Exception):
+                        transcript = None
+
+                    videos_checked += 1
+
+                    title = video['snippet']['title']
+                    description = video['snippet']['description']
+                    published_at = video['snippet']['publishedAt']
+
+                    print(f"  [{videos_checked}] {title[:60]}...")
+                    if transcript is not None:
+                        print(f"    ✓ Got transcript ({len(transcript)} chars)")
+                    else:
+                        print(f"    ⚠ No transcript (will use title+description)")
+
+                    # Build sample text
+                    text_parts = [f"Title: {title}"]
+
+                    if description:
+                        text_parts.append(f"Description: {description}")
+
+                    if transcript:
+                        text_parts.append(f"Transcript: {transcript}")
+
+                    full_text = "\n\n".join(text_parts)
+
+                    if len(full_text) < 30:
+                        print(f"      Skipped (no content)")
+                        continue
+
+                    sample = {
+                        'text': full_text,
+                        'source': 'youtube',
+                        'date': published_at,
+                        'url': f"https://www.youtube.com/watch?v={video_id}",
+                        'metadata': {
+                            'platform_type': 'video',
+                            'channel_name': channel_name,
+                            'video_id': video_id,
+                            'title': title,
+                            'has_transcript': transcript is not None,
+                            'transcript_length': len(transcript) if transcript else 0,
+                            'source_type': 'official_channel'
+                        }
                     }
-                }
 
-                samples.append(sample)
-                print(f"      ✓ Added ({len(samples)}/{limit})")
+                    samples.append(sample)
+                    print(f"      ✓ Added ({len(samples)}/{limit})")
 
-                time.sleep(0.2)
-
-            # Get next page token
-            next_page_token = response.get('nextPageToken')
+            if len(samples) >= limit:
+                break
 
             if not next_page_token:
                 print("  No more pages available")
                 break
 
+            response = next_page.result() if next_page else _list_uploads_page(
+                youtube, quota, uploads_playlist_id, next_page_token, usage
+            )
+
         # Count stats
         with_transcripts = sum(1 for s in samples if s['metadata']['has_transcript'])
         without_transcripts = len(samples) - with_transcripts
@@ -168,6 +324,8 @@ def scrape_youtube_channel(channel_id, channel_name, limit, youtube_api_key):
         print(f"  Collected {len(samples)} total samples:")
         print(f"    - {with_transcripts} with transcripts")
         print(f"    - {without_transcripts} without transcripts (title+description only)")
+        if use_cache:
+            print(f"  Transcript cache: {cache_hits} hits, {videos_checked - cache_hits} downloaded")
 
         return samples
 
@@ -177,6 +335,9 @@ def scrape_youtube_channel(channel_id, channel_name, limit, youtube_api_key):
         traceback.print_exc()
         return samples
 
+    finally:
+        prefetcher.shutdown(wait=False, cancel_futures=True)
+
 
 def find_youtube_channel(company, youtube_api_key=None):
     """
@@ -187,7 +348,7 @@ def find_youtube_channel(company, youtube_api_key=None):
         youtube_api_key: YouTube API key
 
     Returns:
-        Dict with found, channel_id, channel_name, company
+        Dict with found, channel_id, channel_name, company, quota_units
     """
     try:
         print(f"\n{'='*50}")
@@ -200,15 +361,18 @@ def find_youtube_channel(company, youtube_api_key=None):
         if not youtube_api_key:
             raise ValueError("Missing YouTube API key")
 
+        usage = QuotaUsage()
+
         # Try to find channel
-        channel_id, channel_name = find_official_channel(company, youtube_api_key)
+        channel_id, channel_name = find_official_channel(company, youtube_api_key, usage=usage)
 
         if channel_id:
             result = {
                 'found': True,
                 'channel_id': channel_id,
                 'channel_name': channel_name,
-                'company': company
+                'company': company,
+                'quota_units': usage.units
             }
             print(f"✓ Found: {channel_name} ({channel_id})\n")
         else:
@@ -217,6 +381,7 @@ def find_youtube_channel(company, youtube_api_key=None):
                 'channel_id': None,
                 'channel_name': None,
                 'company': company,
+                'quota_units': usage.units,
                 'message': f'Could not find YouTube channel for {company}'
             }
             print(f"✗ Not found\n")
@@ -242,7 +407,8 @@ def scrape_youtube(company, channel_id, limit=150, youtube_api_key=None):
         youtube_api_key: YouTube API key
 
     Returns:
-        Dict with source, company, samples, etc.
+        Dict with source, company, samples, etc.; 'quota_units' is the
+        Data API quota spent by this run
     """
     try:
         print(f"\n{'='*50}")
@@ -263,13 +429,15 @@ def scrape_youtube(company, channel_id, limit=150, youtube_api_key=None):
             }
 
         youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+        quota = youtube_quota(youtube_api_key)
+        usage = QuotaUsage()
 
-        # Get channel name from ID
+        # Channel name and uploads playlist in one call
         try:
-            channel_response = youtube.channels().list(
-                part='snippet',
+            channel_response = quota.execute(youtube.channels().list(
+                part='snippet,contentDetails',
                 id=channel_id
-            ).execute()
+            ), 'channels.list', usage)
 
             if not channel_response.get('items'):
                 return {
@@ -278,7 +446,9 @@ def scrape_youtube(company, channel_id, limit=150, youtube_api_key=None):
                     'success': False
                 }
 
-            channel_name = channel_response['items'][0]['snippet']['title']
+            channel = channel_response['items'][0]
+            channel_name = channel['snippet']['title']
+            uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
         except Exception as e:
             return {
                 'error': f'Could not verify channel_id: {str(e)}',
@@ -289,7 +459,11 @@ def scrape_youtube(company, channel_id, limit=150, youtube_api_key=None):
         print(f"Using channel: {channel_name} ({channel_id})\n")
 
         # Scrape videos
-        samples = scrape_youtube_channel(channel_id, channel_name, limit, youtube_api_key)
+        samples = scrape_youtube_channel(
+            channel_id, channel_name, limit, youtube_api_key,
+            uploads_playlist_id=uploads_playlist_id, usage=usage
+        )
+        quota_units = usage.units
 
         result = {
             'source': 'youtube',
@@ -301,11 +475,14 @@ def scrape_youtube(company, channel_id, limit=150, youtube_api_key=None):
             'samples': samples,
             'target': limit,
             'success': len(samples) >= limit,
+            'quota_units': quota_units,
+            'quota_remaining': quota.remaining(),
             'note': 'Includes videos with and without transcripts'
         }
 
         print(f"\n{'='*50}")
         print(f"✓ COMPLETE: {len(samples)}/{limit} samples")
+        print(f"YouTube API quota used: {quota_units} units ({quota.remaining()} left today)")
         print(f"{'='*50}\n")
 
         return result
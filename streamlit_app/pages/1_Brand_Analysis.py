@@ -7,12 +7,12 @@ import streamlit as st
 import sys
 import os
 import json
-from io import StringIO
 
 # Add modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from modules import reddit_scraper, youtube_scraper, blog_scraper, brand_voice_analyzer, ai_blog_finder
+from modules import brand_voice_analyzer, http_client, scrape_orchestrator
+from modules.log_capture import capture_output
 
 st.set_page_config(
     page_title="Brand Analysis - Paracket",
@@ -191,173 +191,88 @@ with tab1:
         # Initialize results
         results = {}
 
-        # Create progress tracking
-        total_tasks = sum([scrape_reddit, scrape_youtube, scrape_blog])
-        current_task = 0
-
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-        # Scrape Reddit
+        # Build one job per selected source; they run concurrently, so total
+        # time is that of the slowest source rather than the sum of all three
+        jobs = {}
         if scrape_reddit:
-            current_task += 1
-            status_text.text(f"Scraping Reddit... ({current_task}/{total_tasks})")
-            progress_bar.progress(current_task / total_tasks)
-
-            with st.spinner("Scraping Reddit..."):
-                output_capture = StringIO()
-                sys.stdout = output_capture
-
-                reddit_result = reddit_scraper.scrape_reddit(
-                    company=company_name,
-                    limit=reddit_limit,
-                    credentials={
-                        'reddit_client_id': reddit_client_id,
-                        'reddit_client_secret': reddit_client_secret,
-                        'reddit_user_agent': reddit_user_agent
-                    }
-                )
-
-                sys.stdout = sys.__stdout__
-
-                if reddit_result.get('success'):
-                    results['reddit'] = reddit_result
-                    st.success(f"Reddit: Collected {reddit_result.get('total_samples', 0)} samples")
-                    with st.expander("View Reddit scraping log"):
-                        st.text(output_capture.getvalue())
-                else:
-                    st.error(f"Reddit scraping failed: {reddit_result.get('error')}")
+            jobs['reddit'] = scrape_orchestrator.reddit_job(
+                company=company_name,
+                limit=reddit_limit,
+                credentials={
+                    'reddit_client_id': reddit_client_id,
+                    'reddit_client_secret': reddit_client_secret,
+                    'reddit_user_agent': reddit_user_agent
+                }
+            )
 
-        # Scrape YouTube
         if scrape_youtube:
-            current_task += 1
-            status_text.text(f"Scraping YouTube... ({current_task}/{total_tasks})")
-            progress_bar.progress(current_task / total_tasks)
-
-            # Find channel if not provided
-            if not youtube_channel_id:
-                with st.spinner("Finding YouTube channel..."):
-                    output_capture = StringIO()
-                    sys.stdout = output_capture
-
-                    find_result = youtube_scraper.find_youtube_channel(
-                        company=company_name,
-                        youtube_api_key=youtube_api_key
-                    )
-
-                    sys.stdout = sys.__stdout__
-
-                    if find_result.get('found'):
-                        youtube_channel_id = find_result['channel_id']
-                        st.info(f"Found channel: {find_result['channel_name']}")
-                    else:
-                        st.warning("Could not auto-detect YouTube channel. Please provide Channel ID manually.")
-
-            if youtube_channel_id:
-                with st.spinner("Scraping YouTube..."):
-                    output_capture = StringIO()
-                    sys.stdout = output_capture
-
-                    youtube_result = youtube_scraper.scrape_youtube(
-                        company=company_name,
-                        channel_id=youtube_channel_id,
-                        limit=youtube_limit,
-                        youtube_api_key=youtube_api_key
-                    )
-
-                    sys.stdout = sys.__stdout__
-
-                    if youtube_result.get('success'):
-                        results['youtube'] = youtube_result
-                        st.success(f"YouTube: Collected {youtube_result.get('total_samples', 0)} samples")
-                        with st.expander("View YouTube scraping log"):
-                            st.text(output_capture.getvalue())
-                    else:
-                        st.error(f"YouTube scraping failed: {youtube_result.get('error')}")
+            jobs['youtube'] = scrape_orchestrator.youtube_job(
+                company=company_name,
+                limit=youtube_limit,
+                youtube_api_key=youtube_api_key,
+                channel_id=youtube_channel_id
+            )
 
-        # Scrape Blog with optional AI-powered feed discovery
         if scrape_blog:
-            current_task += 1
-            status_text.text(f"Scraping Blog... ({current_task}/{total_tasks})")
-            progress_bar.progress(current_task / total_tasks)
-
-            blog_url_to_use = blog_url  # Default to manual input
+            jobs['blog'] = scrape_orchestrator.blog_job(
+                company=company_name,
+                limit=blog_limit,
+                blog_url=blog_url,
+                openai_api_key=openai_api_key,
+                use_ai_blog_finder=use_ai_blog_finder
+            )
 
-            # Use AI to find blog if enabled
-            if use_ai_blog_finder:
-                with st.spinner("🤖 Using AI to find company blog and RSS feed..."):
-                    output_capture = StringIO()
-                    sys.stdout = output_capture
+        source_labels = {'reddit': 'Reddit', 'youtube': 'YouTube', 'blog': 'Blog'}
 
-                    ai_result = ai_blog_finder.find_blog_url_with_ai(
-                        company=company_name,
-                        openai_api_key=openai_api_key
-                    )
+        # Create progress tracking
+        total_tasks = len(jobs)
+        completed_tasks = 0
 
-                    sys.stdout = sys.__stdout__
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        status_text.text(f"Collecting from {', '.join(source_labels[s] for s in jobs)}... (0/{total_tasks})")
+
+        source_status = {source: st.empty() for source in jobs}
+        for source in jobs:
+            source_status[source].caption(f"{source_labels[source]}: queued")
+
+        for event in scrape_orchestrator.run_sources(jobs):
+            source = event['source']
+            label = source_labels[source]
+
+            if event['type'] == 'progress':
+                level = event['level']
+                if level == 'status':
+                    source_status[source].caption(f"{label}: {event['message']}")
+                elif level == 'success':
+                    st.success(event['message'])
+                elif level == 'warning':
+                    st.warning(event['message'])
+                else:
+                    st.info(event['message'])
+                continue
 
-                    # Show AI output
-                    with st.expander("View AI Blog Finder log"):
-                        st.text(output_capture.getvalue())
+            completed_tasks += 1
+            progress_bar.progress(completed_tasks / total_tasks)
+            status_text.text(f"Collecting... ({completed_tasks}/{total_tasks} sources done)")
 
-                    if ai_result.get('success'):
-                        best_feed = ai_result.get('best_feed_url')
-                        best_blog = ai_result.get('best_blog_url')
-                        all_feeds = ai_result.get('all_working_feeds', [])
-                        all_blogs = ai_result.get('all_working_blogs', [])
-                        
-                        st.info(f"🤖 AI Reasoning: {ai_result.get('ai_reasoning', 'N/A')}")
-                        
-                        if best_feed:
-                            st.success(f"✓ Found RSS feed: {best_feed}")
-                            blog_url_to_use = best_feed
-                        elif best_blog:
-                            st.info(f"✓ Found blog URL: {best_blog} (will search for RSS feed)")
-                            blog_url_to_use = best_blog
-                        elif all_feeds:
-                            st.info(f"Found {len(all_feeds)} potential RSS feeds, trying first one")
-                            blog_url_to_use = all_feeds[0]
-                        elif all_blogs:
-                            st.info(f"Found {len(all_blogs)} potential blog URLs, trying first one")
-                            blog_url_to_use = all_blogs[0]
-                        else:
-                            st.warning("AI could not find working blog or RSS feed URLs")
-                            blog_url_to_use = None
-                    else:
-                        st.warning(f"AI blog finder failed: {ai_result.get('error', 'Unknown error')}")
-                        blog_url_to_use = None
-
-            # Proceed with scraping if we have a URL
-            if blog_url_to_use:
-                with st.spinner(f"Scraping blog from: {blog_url_to_use}..."):
-                    output_capture = StringIO()
-                    sys.stdout = output_capture
-
-                    blog_result = blog_scraper.scrape_blog(
-                        company=company_name,
-                        limit=blog_limit,
-                        blog_url=blog_url_to_use
-                    )
+            result = event['result']
+            source_status[source].caption(f"{label}: finished in {event['elapsed']:.0f}s")
 
-                    sys.stdout = sys.__stdout__
-
-                    if blog_result.get('success'):
-                        results['blog'] = blog_result
-                        st.success(f"Blog: Collected {blog_result.get('total_samples', 0)} samples")
-                        with st.expander("View blog scraping log"):
-                            st.text(output_capture.getvalue())
-                    else:
-                        st.warning(f"Blog scraping: {blog_result.get('error', 'No blog found')}")
-                        
-                        # If we have alternative URLs from AI, suggest them
-                        if use_ai_blog_finder and ai_result.get('success'):
-                            all_suggestions = ai_result.get('all_working_feeds', []) + ai_result.get('all_working_blogs', [])
-                            if len(all_suggestions) > 1:
-                                st.info("AI found these alternative URLs you could try:")
-                                for i, url in enumerate(all_suggestions[1:4], 1):  # Show up to 3 alternatives
-                                    st.caption(f"{i}. {url}")
+            if result.get('success'):
+                results[source] = result
+                st.success(f"{label}: Collected {result.get('total_samples', 0)} samples")
+                with st.expander(f"View {label} scraping log"):
+                    st.text(event['log'])
             else:
-                st.warning("No blog URL available for scraping. Skipping blog collection.")
+                if source == 'reddit':
+                    st.error(f"Reddit scraping failed: {result.get('error')}")
+                elif source == 'youtube':
+                    st.error(f"YouTube scraping failed: {result.get('error')}")
+                else:
+                    st.warning(f"Blog scraping: {result.get('error', 'No blog found')}")
+                with st.expander(f"View {label} scraping log"):
+                    st.text(event['log'])
 
         # Save to session state
         st.session_state.scraped_data = results
@@ -365,6 +280,14 @@ with tab1:
         progress_bar.progress(1.0)
         status_text.text("Data collection complete!")
 
+        # Connection reuse across the shared HTTP session (cumulative for this server process)
+        pool = http_client.pool_stats()
+        if pool['requests']:
+            st.caption(
+                f"HTTP: {pool['requests']} requests over {pool['connections']} connections "
+                f"({pool['reuse_ratio']:.0%} reused) across {len(pool['hosts'])} hosts"
+            )
+
         # Summary
         st.markdown("---")
         st.subheader("Collection Summary")
@@ -444,16 +367,12 @@ with tab2:
                 for source, data in results.items():
                     training_data.append(data)
 
-                output_capture = StringIO()
-                sys.stdout = output_capture
-
-                analysis_result = brand_voice_analyzer.analyze_brand_voice_endpoint(
-                    company=company_name,
-                    training_data=training_data,
-                    openai_api_key=openai_api_key
-                )
-
-                sys.stdout = sys.__stdout__
+                with capture_output() as output_capture:
+                    analysis_result = brand_voice_analyzer.analyze_brand_voice_endpoint(
+                        company=company_name,
+                        training_data=training_data,
+                        openai_api_key=openai_api_key
+                    )
 
                 if analysis_result.get('success'):
                     st.session_state.brand_voice = analysis_result
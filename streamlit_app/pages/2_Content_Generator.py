@@ -5,13 +5,14 @@ Generate social media posts based on brand voice and trending topics
 import streamlit as st
 import sys
 import os
-from io import StringIO
 import datetime
+import time
 
 # Add modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from modules import hackernews_scraper, producthunt_scraper, devto_scraper, brand_voice_analyzer
+from modules import brand_voice_analyzer, trend_aggregator
+from modules.log_capture import capture_output
 
 st.set_page_config(
     page_title="Content Generator - Paracket",
@@ -53,113 +54,37 @@ with tab1:
 
     if st.button("Find Trending Topics", type="primary", use_container_width=True):
 
-        all_trends = []
-        source_counts = {}
-
-        # Search Hacker News
-        with st.spinner("Searching Hacker News..."):
-            output_capture_hn = StringIO()
-            sys.stdout = output_capture_hn
-
-            hn_result = hackernews_scraper.scrape_hackernews_trends(
-                company=company_name,
-                limit=trends_limit,
-                credentials={'brand_voice': brand_voice}
-            )
-
-            sys.stdout = sys.__stdout__
-
-            if hn_result.get('success') and hn_result.get('samples'):
-                all_trends.extend(hn_result.get('samples', []))
-                source_counts['Hacker News'] = len(hn_result.get('samples', []))
-                st.success(f"Hacker News: Found {source_counts['Hacker News']} trends")
-            else:
-                source_counts['Hacker News'] = 0
-                st.warning("Hacker News: No trends found")
-
-        # Search Product Hunt
-        with st.spinner("Searching Product Hunt..."):
-            output_capture_ph = StringIO()
-            sys.stdout = output_capture_ph
-
-            ph_result = producthunt_scraper.scrape_producthunt_trends(
+        # Search all sources at once; slow sources are dropped after the timeout
+        with st.spinner("Searching Hacker News, Product Hunt and Dev.to..."):
+            trend_result = trend_aggregator.find_trends(
                 company=company_name,
                 limit=trends_limit,
-                credentials={'brand_voice': brand_voice}
+                brand_voice=brand_voice
             )
 
-            sys.stdout = sys.__stdout__
-
-            if ph_result.get('success') and ph_result.get('trends'):
-                # Convert Product Hunt format to match Hacker News format
-                for trend in ph_result.get('trends', []):
-                    all_trends.append({
-                        'text': f"{trend.get('title', '')}: {trend.get('description', '')}",
-                        'url': trend.get('url', ''),
-                        'source': 'producthunt',
-                        'metadata': {
-                            'author': 'Product Hunt',
-                            'engagement': trend.get('votes', 0),
-                            'num_comments': trend.get('comments', 0),
-                            'topic_type': 'product',
-                            'external_url': trend.get('url', ''),
-                            'topics': trend.get('topics', [])
-                        }
-                    })
-                source_counts['Product Hunt'] = len(ph_result.get('trends', []))
-                st.success(f"Product Hunt: Found {source_counts['Product Hunt']} trends")
-            else:
-                source_counts['Product Hunt'] = 0
-                st.warning("Product Hunt: No trends found")
-
-        # Search Dev.to
-        with st.spinner("Searching Dev.to..."):
-            output_capture_devto = StringIO()
-            sys.stdout = output_capture_devto
-
-            devto_result = devto_scraper.scrape_devto_trends(
-                company=company_name,
-                limit=trends_limit,
-                credentials={'brand_voice': brand_voice}
-            )
+        all_trends = trend_result.get('samples', [])
+        source_counts = trend_result.get('sources', {})
 
-            sys.stdout = sys.__stdout__
-
-            if devto_result.get('success') and devto_result.get('trends'):
-                # Convert Dev.to format to match Hacker News format
-                for trend in devto_result.get('trends', []):
-                    all_trends.append({
-                        'text': f"{trend.get('title', '')}: {trend.get('description', '')}",
-                        'url': trend.get('url', ''),
-                        'source': 'devto',
-                        'metadata': {
-                            'author': trend.get('author', 'Dev.to'),
-                            'engagement': trend.get('reactions', 0),
-                            'num_comments': trend.get('comments', 0),
-                            'topic_type': 'article',
-                            'external_url': trend.get('url', ''),
-                            'tags': trend.get('tags', []),
-                            'reading_time': trend.get('reading_time', 0)
-                        }
-                    })
-                source_counts['Dev.to'] = len(devto_result.get('trends', []))
-                st.success(f"Dev.to: Found {source_counts['Dev.to']} trends")
+        for source, count in source_counts.items():
+            if source in trend_result.get('timed_out', []):
+                st.warning(f"{source}: Timed out, skipped")
+            elif count:
+                st.success(f"{source}: Found {count} trends")
             else:
-                source_counts['Dev.to'] = 0
-                st.warning("Dev.to: No trends found")
+                st.warning(f"{source}: No trends found")
 
         # Combine results
-        total_found = len(all_trends)
+        total_found = trend_result.get('total_samples', 0)
 
         if total_found >= min_trends:
-            # Create combined result in same format as hackernews_scraper
+            # Keep the combined result in the same format as hackernews_scraper
             combined_result = {
                 'success': True,
                 'samples': all_trends,
                 'total_samples': total_found,
                 'company': company_name,
                 'sources': source_counts,
-                'scraped_at': datetime.datetime.now().isoformat()
+                'scraped_at': trend_result.get('scraped_at')
             }
 
             st.session_state.trending_topics = combined_result
@@ -172,12 +97,9 @@ with tab1:
 
             # Show logs
             with st.expander("View search logs"):
-                st.markdown("**Hacker News Log:**")
-                st.text(output_capture_hn.getvalue())
-                st.markdown("**Product Hunt Log:**")
-                st.text(output_capture_ph.getvalue())
-                st.markdown("**Dev.to Log:**")
-                st.text(output_capture_devto.getvalue())
+                for source, log in trend_result.get('logs', {}).items():
+                    st.markdown(f"**{source} Log:**")
+                    st.text(log)
         else:
             st.error(f"Only found {total_found} trends (minimum {min_trends} required). Try:")
             st.markdown("- Increasing the trends limit")
@@ -257,6 +179,13 @@ with tab2:
         openai_api_key = st.text_input("OpenAI API Key", type="password",
                                        value=st.secrets.get("OPENAI_API_KEY", "") if hasattr(st, 'secrets') else "")
 
+    allow_cached = st.checkbox(
+        "Reuse cached AI responses",
+        value=True,
+        key="allow_cached_llm",
+        help="Requests identical to earlier ones (same brand voice, topics and message) return the saved answer instantly at no API cost. Regenerate buttons always ask for a fresh answer."
+    )
+
     # Check if we have trending topics
     if not st.session_state.get('trending_topics'):
         st.warning("Please find trending topics first in the **Trending Topics** tab")
@@ -281,33 +210,54 @@ with tab2:
         num_ideas = st.slider("Number of post ideas to generate", min_value=3, max_value=7, value=3)
     with col2:
         st.markdown("<br>", unsafe_allow_html=True)  # Spacing
-        if st.button("Generate Post Ideas", type="primary", use_container_width=True):
-            if not openai_api_key:
-                st.error("OpenAI API key is required. Please expand the OpenAI API Key section above.")
-                st.stop()
-
-            with st.spinner(f"Analyzing {len(samples)} trending topics and generating {num_ideas} post ideas..."):
-                output_capture = StringIO()
-                sys.stdout = output_capture
+        generate_ideas = st.button("Generate Post Ideas", type="primary", use_container_width=True)
 
-                post_ideas_result = brand_voice_analyzer.generate_post_ideas(
-                    company=company_name,
-                    brand_voice=brand_voice,
-                    trending_topics=samples,
-                    num_ideas=num_ideas,
-                    openai_api_key=openai_api_key
-                )
+    if generate_ideas:
+        if not openai_api_key:
+            st.error("OpenAI API key is required. Please expand the OpenAI API Key section above.")
+            st.stop()
 
-                sys.stdout = sys.__stdout__
+        # Stream the drafts as the model writes them instead of a long spinner
+        status = st.empty()
+        preview = st.empty()
+        status.caption(f"Analyzing {len(samples)} trending topics and generating {num_ideas} post ideas...")
 
-                if post_ideas_result.get('success'):
-                    st.session_state.post_ideas = post_ideas_result
-                    st.success(f"Generated {len(post_ideas_result.get('post_ideas', {}).get('post_ideas', []))} post ideas!")
+        with capture_output() as output_capture:
+            stream = brand_voice_analyzer.generate_post_ideas_stream(
+                company=company_name,
+                brand_voice=brand_voice,
+                trending_topics=samples,
+                num_ideas=num_ideas,
+                openai_api_key=openai_api_key,
+                allow_cached=allow_cached
+            )
 
-                    with st.expander("View generation log"):
-                        st.text(output_capture.getvalue())
-                else:
-                    st.error(f"Failed to generate post ideas: {post_ideas_result.get('error')}")
+            # Redraw the preview at most every 100ms; each redraw resends the whole text
+            streamed_text = ""
+            last_render = 0.0
+            for chunk in stream:
+                streamed_text += chunk
+                now = time.monotonic()
+                if now - last_render >= 0.1:
+                    preview.code(streamed_text, language="json")
+                    last_render = now
+
+        preview.empty()
+        post_ideas_result = stream.result or {'error': stream.error, 'success': False}
+
+        if post_ideas_result.get('success'):
+            st.session_state.post_ideas = post_ideas_result
+            status.success(f"Generated {len(post_ideas_result.get('post_ideas', {}).get('post_ideas', []))} post ideas!")
+
+            if post_ideas_result.get('cached'):
+                st.info("Reused a cached answer for this request. Uncheck \"Reuse cached AI responses\" for new ideas.")
+            elif post_ideas_result.get('ttft') is not None:
+                st.caption(f"First words after {post_ideas_result['ttft']:.1f}s, finished in {post_ideas_result['latency']:.1f}s")
+
+            with st.expander("View generation log"):
+                st.text(output_capture.getvalue())
+        else:
+            status.error(f"Failed to generate post ideas: {post_ideas_result.get('error')}")
 
     # Display generated post ideas
     if st.session_state.get('post_ideas'):
@@ -375,6 +325,13 @@ with tab2:
         with col3:
             adapt_reddit = st.checkbox("Reddit", value=True, key="adapt_reddit")
 
+        single_request = st.checkbox(
+            "Adapt all platforms in one request",
+            value=False,
+            key="adapt_single_request",
+            help="Sends the brand voice and master message once and gets every platform back in a single JSON response. Uses fewer tokens; separate requests run in parallel and are usually faster."
+        )
+
         if st.button("Adapt to Selected Platforms", type="primary", use_container_width=True):
             if not openai_api_key:
                 st.error("OpenAI API key is required")
@@ -393,22 +350,23 @@ with tab2:
                 platforms.append('reddit')
 
             with st.spinner(f"Adapting master message to {len(platforms)} platform(s)..."):
-                output_capture = StringIO()
-                sys.stdout = output_capture
-
-                adaptation_result = brand_voice_analyzer.adapt_master_to_platforms(
-                    company=company_name,
-                    brand_voice=brand_voice,
-                    master_message=master_message,
-                    platforms=platforms,
-                    openai_api_key=openai_api_key
-                )
-
-                sys.stdout = sys.__stdout__
+                with capture_output() as output_capture:
+                    adaptation_result = brand_voice_analyzer.adapt_master_to_platforms(
+                        company=company_name,
+                        brand_voice=brand_voice,
+                        master_message=master_message,
+                        platforms=platforms,
+                        openai_api_key=openai_api_key,
+                        single_call=single_request,
+                        allow_cached=allow_cached
+                    )
 
                 if adaptation_result.get('success'):
                     st.session_state.platform_adaptations = adaptation_result
-                    st.success(f"Adapted to {len(platforms)} platform(s)!")
+                    st.success(f"Adapted to {len(adaptation_result['adaptations'])} platform(s)!")
+
+                    for platform, error in adaptation_result.get('errors', {}).items():
+                        st.warning(f"{platform.capitalize()} adaptation failed: {error}")
 
                     with st.expander("View adaptation log"):
                         st.text(output_capture.getvalue())
@@ -470,18 +428,14 @@ with tab2:
                         st.error("OpenAI API key required")
                     else:
                         with st.spinner("Regenerating Twitter post..."):
-                            output_capture = StringIO()
-                            sys.stdout = output_capture
-
-                            regen_result = brand_voice_analyzer.adapt_master_to_platforms(
-                                company=company_name,
-                                brand_voice=brand_voice,
-                                master_message=st.session_state.master_message,
-                                platforms=['twitter'],
-                                openai_api_key=openai_api_key
-                            )
-
-                            sys.stdout = sys.__stdout__
+                            with capture_output() as output_capture:
+                                regen_result = brand_voice_analyzer.adapt_master_to_platforms(
+                                    company=company_name,
+                                    brand_voice=brand_voice,
+                                    master_message=st.session_state.master_message,
+                                    platforms=['twitter'],
+                                    openai_api_key=openai_api_key
+                                )
 
                             if regen_result.get('success'):
                                 new_content = regen_result['adaptations']['twitter']['content']
@@ -531,18 +485,14 @@ with tab2:
                         st.error("OpenAI API key required")
                     else:
                         with st.spinner("Regenerating Mastodon post..."):
-                            output_capture = StringIO()
-                            sys.stdout = output_capture
-
-                            regen_result = brand_voice_analyzer.adapt_master_to_platforms(
-                                company=company_name,
-                                brand_voice=brand_voice,
-                                master_message=st.session_state.master_message,
-                                platforms=['mastodon'],
-                                openai_api_key=openai_api_key
-                            )
-
-                            sys.stdout = sys.__stdout__
+                            with capture_output() as output_capture:
+                                regen_result = brand_voice_analyzer.adapt_master_to_platforms(
+                                    company=company_name,
+                                    brand_voice=brand_voice,
+                                    master_message=st.session_state.master_message,
+                                    platforms=['mastodon'],
+                                    openai_api_key=openai_api_key
+                                )
 
                             if regen_result.get('success'):
                                 new_content = regen_result['adaptations']['mastodon']['content']
@@ -592,18 +542,14 @@ with tab2:
                         st.error("OpenAI API key required")
                     else:
                         with st.spinner("Regenerating Reddit post..."):
-                            output_capture = StringIO()
-                            sys.stdout = output_capture
-
-                            regen_result = brand_voice_analyzer.adapt_master_to_platforms(
-                                company=company_name,
-                                brand_voice=brand_voice,
-                                master_message=st.session_state.master_message,
-                                platforms=['reddit'],
-                                openai_api_key=openai_api_key
-                            )
-
-                            sys.stdout = sys.__stdout__
+                            with capture_output() as output_capture:
+                                regen_result = brand_voice_analyzer.adapt_master_to_platforms(
+                                    company=company_name,
+                                    brand_voice=brand_voice,
+                                    master_message=st.session_state.master_message,
+                                    platforms=['reddit'],
+                                    openai_api_key=openai_api_key
+                                )
 
                             if regen_result.get('success'):
                                 new_content = regen_result['adaptations']['reddit']['content']